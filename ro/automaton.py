@@ -0,0 +1,646 @@
+"""
+Table driven recognizer for the read query language.
+
+The grammar in ``grammar`` is compiled offline into plain Python data in
+``automaton_tables``. At run time a query is lexed with one regular
+expression and run through the tables. Every step is a tuple index, and
+pyparsing is never called:
+
+    accepts("MATCH (n:Person) RETURN n")     # True
+    first_error("MATCH (n) DELETE n")        # 10, the offset of DELETE
+
+Most of the language is regular at the token level. The compiler turns it
+into deterministic automata with the usual constructions: Thompson NFAs for
+the grammar elements, subsets, then Moore minimization. Whitespace is a token
+of its own, since the grammar keeps it, and a keyword is also accepted
+wherever an identifier is. What is not flat becomes a call to another
+automaton:
+
+* Clause sequencing. The ``TRANSITIONS`` state machine is the top automaton,
+and each of its edges calls the automaton of a whole statement. A ``CALL``
+subquery calls the top automaton again.
+
+* The ``Forward`` patterns, each compiled once however many places use it.
+Lists such as ``keyval_csv_pattern``, ``X = P (Q X)*``, generate the same
+language as ``P (Q P)*`` and are compiled to that loop. Only
+``comparison_pattern``, whose optional parentheses nest, calls itself.
+
+A call pushes the state to return to on a small stack, and a configuration is
+a state with its stack. Nesting beyond ``MAX_DEPTH`` calls is rejected, which
+is deeper than pyparsing itself can recurse with the default recursion limit.
+
+The tables accept the context free reading of the grammar, where an
+alternative may always be backtracked into. Pyparsing's ordered choice
+commits to the first alternative that matches, so a handful of queries it
+rejects are accepted here, for example a pattern after a boolean operator in
+WHERE, ``WHERE a.p = 1 AND (m:L)<--(x)``. Nothing pyparsing accepts is
+rejected, so the tables can screen queries out but do not replace the parse.
+The same goes for procedures: the tables take any dotted name, and only the
+parse checks it against the catalogue.
+
+Symbols that every state treats alike share a class, and the rows of the
+transition table are packed into one comb vector, ``BASE``, ``CHECK`` and
+``NEXT``, a few thousand entries in all.
+
+Regenerate the tables after changing the grammar, ``automaton_tests``
+checks that they are current:
+
+    python -m ro.automaton --emit
+    python -m ro.automaton --bench 2000
+"""
+import argparse
+import os
+import re
+import sys
+import textwrap
+import threading
+
+from pyparsing import (And, CaselessKeyword, Empty, Forward, Keyword,
+    Literal, MatchFirst, OneOrMore, Optional, Or, ParseElementEnhance,
+    Regex, StringEnd, White, ZeroOrMore)
+
+from . import fuzz, grammar, spans
+
+
+MAX_DEPTH = 100
+
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "automaton_tables.py")
+
+# Symbols every table has, in this order. Keywords and punctuation follow.
+SPACE, STRING, INTEGER, NUMBER, IDENTIFIER, ERROR = range(6)
+BASE_SYMBOLS = ("SPACE", "STRING", "INTEGER", "NUMBER", "IDENTIFIER",
+                "ERROR")
+
+# Lexer groups, tried in order. Keywords are identifiers, picked out by
+# their text afterwards. Only the ORDER BY keyword spans a space. A number
+# running into a word is an error, the grammar has no place for a keyword
+# or identifier right after one.
+LEXER = (r"([ \t\r\n]+)|(%s)|(%s)(?![\w$])|((?i:ORDER BY)(?![\w$]))|"
+         r"([^\W\d]\w*)|(%s)|"
+         r"(%%s)|(.)" % (grammar.STRING, grammar.NUMBER,
+                        grammar.QUOTED_IDENTIFIER))
+(_SPACE_GROUP, _STRING_GROUP, _NUMBER_GROUP, _ORDER_BY_GROUP, _WORD_GROUP,
+ _QUOTED_GROUP, _PUNCTUATION_GROUP, _ERROR_GROUP) = range(1, 9)
+
+
+#############################################################################
+############### Compiler ####################################################
+
+def _sequence(element, kind=And):
+    # The elements of nested Ands, or other kind, flattened. Parsing
+    # streamlines some of them in place, this flattens them all.
+    if type(element) is kind:
+        items = []
+        for expr in element.exprs:
+            items.extend(_sequence(expr, kind))
+        return items
+    return [element]
+
+
+def _list_form(forward):
+    # (P, Q) if forward is P + ZeroOrMore(Q + forward), otherwise None.
+    items = _sequence(forward.expr)
+    if len(items) < 2 or type(items[-1]) is not ZeroOrMore:
+        return None
+    body = _sequence(items[-1].expr)
+    if body[-1] is not forward or any(e is forward for e in items[:-1]) or \
+            any(e is forward for e in body[:-1]):
+        return None
+    return items[:-1], body[:-1]
+
+
+class _NFA(object):
+    """Thompson NFA states, shared by all machines."""
+
+    def __init__(self):
+        self.edges = []     # state -> [(symbol, target)]
+        self.epsilon = []   # state -> [target]
+        self.calls = []     # state -> [(machine, target)]
+
+    def state(self):
+        self.edges.append([])
+        self.epsilon.append([])
+        self.calls.append([])
+        return len(self.edges) - 1
+
+
+class Compiler(object):
+    """
+    Compiles ``grammar.query`` into tables, see the module docstring.
+    ``tables()`` returns them as a dict of plain data.
+    """
+
+    def __init__(self):
+        self.keywords = {}
+        self.punctuation = {}
+        self._collect(grammar.query, set())
+        self.symbols = list(BASE_SYMBOLS)
+        for text in sorted(self.keywords):
+            self.keywords[text] = len(self.symbols)
+            self.symbols.append(text)
+        for text in sorted(self.punctuation, key=lambda t: (-len(t), t)):
+            self.punctuation[text] = len(self.symbols)
+            self.symbols.append(text)
+        self.nfa = _NFA()
+        self.machines = []      # (start, final)
+        self._machine_of = {}   # id(element) -> machine index
+        self._top_machine = None
+
+    def _collect(self, element, seen):
+        if id(element) in seen:
+            return
+        seen.add(id(element))
+        if isinstance(element, (CaselessKeyword, Keyword)):
+            self.keywords[element.match.upper()] = None
+        elif isinstance(element, Literal):
+            self.punctuation[element.match] = None
+        elif isinstance(element, grammar.ClauseSequence):
+            for statement in grammar.CLAUSES.values():
+                self._collect(statement, seen)
+        for expr in getattr(element, "exprs", ()):
+            self._collect(expr, seen)
+        if isinstance(element, ParseElementEnhance):
+            self._collect(element.expr, seen)
+
+    def _symbols(self, element):
+        # Symbols a Regex terminal matches.
+        pattern = element.pattern
+        if pattern == grammar.IDENTIFIER:
+            # A keyword is an identifier too, but ORDER BY is two words.
+            return [IDENTIFIER] + sorted(symbol for text, symbol
+                                         in self.keywords.items()
+                                         if text != "ORDER BY")
+        if pattern == r"\d+":
+            return [INTEGER]
+        if pattern == grammar.NUMBER:
+            return [INTEGER, NUMBER]
+        if pattern == grammar.STRING:
+            return [STRING]
+        raise NotImplementedError("no symbols for the pattern %r" % pattern)
+
+    def _terminal(self, symbols):
+        # Optional leading whitespace, then one of symbols.
+        nfa = self.nfa
+        start, middle, end = nfa.state(), nfa.state(), nfa.state()
+        nfa.epsilon[start].append(middle)
+        nfa.edges[start].append((SPACE, middle))
+        for symbol in symbols:
+            nfa.edges[middle].append((symbol, end))
+        return start, end
+
+    def _procedure(self):
+        # Identifiers joined by dots, with no space in between.
+        nfa = self.nfa
+        start, end = self._terminal(self._symbols(grammar.var))
+        dot = nfa.state()
+        nfa.edges[end].append((self.punctuation["."], dot))
+        for symbol in self._symbols(grammar.var):
+            nfa.edges[dot].append((symbol, end))
+        return start, end
+
+    def _chain(self, elements):
+        nfa = self.nfa
+        start = end = nfa.state()
+        for element in elements:
+            first, last = self._fragment(element)
+            nfa.epsilon[end].append(first)
+            end = last
+        return start, end
+
+    def _fragment(self, element):
+        # (start, end) NFA states of element.
+        nfa = self.nfa
+        if isinstance(element, Forward):
+            start, end = nfa.state(), nfa.state()
+            nfa.calls[start].append((self._machine(element), end))
+            return start, end
+        if isinstance(element, And):
+            return self._chain(_sequence(element))
+        if isinstance(element, (MatchFirst, Or)):
+            start, end = nfa.state(), nfa.state()
+            for expr in _sequence(element, type(element)):
+                first, last = self._fragment(expr)
+                nfa.epsilon[start].append(first)
+                nfa.epsilon[last].append(end)
+            return start, end
+        if isinstance(element, (Optional, ZeroOrMore, OneOrMore)):
+            start, end = nfa.state(), nfa.state()
+            first, last = self._fragment(element.expr)
+            nfa.epsilon[start].append(first)
+            nfa.epsilon[last].append(end)
+            if not isinstance(element, OneOrMore):
+                nfa.epsilon[start].append(end)
+            if not isinstance(element, Optional):
+                nfa.epsilon[last].append(first)
+            return start, end
+        if isinstance(element, ParseElementEnhance):
+            return self._fragment(element.expr)
+        if isinstance(element, White):
+            start, end = nfa.state(), nfa.state()
+            nfa.edges[start].append((SPACE, end))
+            return start, end
+        if isinstance(element, (CaselessKeyword, Keyword)):
+            return self._terminal([self.keywords[element.match.upper()]])
+        if isinstance(element, Literal):
+            return self._terminal([self.punctuation[element.match]])
+        if isinstance(element, grammar.Procedure):
+            return self._procedure()
+        if isinstance(element, grammar.Subquery):
+            start, end = nfa.state(), nfa.state()
+            nfa.calls[start].append((self._top(), end))
+            return start, end
+        if isinstance(element, Regex):
+            return self._terminal(self._symbols(element))
+        if isinstance(element, (Empty, StringEnd)):
+            start = nfa.state()
+            return start, start
+        raise NotImplementedError("cannot compile %r" % element)
+
+    def _body(self, element):
+        # (start, end) NFA states of the machine for element.
+        if not isinstance(element, Forward):
+            return self._fragment(element)
+        form = _list_form(element)
+        if form is None:
+            return self._fragment(element.expr)
+        # X = P (Q X)* is the loop P (Q P)*.
+        prefix, body = form
+        start, end = self._chain(prefix)
+        first, last = self._chain(body)
+        self.nfa.epsilon[end].append(first)
+        self.nfa.epsilon[last].append(start)
+        return start, end
+
+    def _machine(self, element):
+        # Index of the machine for element, compiled on first use.
+        index = self._machine_of.get(id(element))
+        if index is None:
+            index = self._machine_of[id(element)] = len(self.machines)
+            self.machines.append(None)
+            self.machines[index] = self._body(element)
+        return index
+
+    def _top(self):
+        # Index of the clause sequencing machine, a statement call per
+        # transition. Subqueries call it too.
+        if self._top_machine is not None:
+            return self._top_machine
+        index = self._top_machine = len(self.machines)
+        self.machines.append(None)
+        nfa = self.nfa
+        states = dict((state, nfa.state()) for state in grammar.TRANSITIONS)
+        end = nfa.state()
+        for state, moves in sorted(grammar.TRANSITIONS.items()):
+            for kind, target in sorted(moves.items()):
+                machine = self._machine(grammar.CLAUSES[kind])
+                nfa.calls[states[state]].append((machine, states[target]))
+        for state in grammar.ACCEPTING:
+            nfa.epsilon[states[state]].append(end)
+            nfa.edges[states[state]].append((SPACE, end))
+        self.machines[index] = (states["start"], end)
+        return index
+
+    def _closure(self, states):
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            for target in self.nfa.epsilon[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+    def _subsets(self):
+        # Subset construction per machine, call edges labelled by the
+        # machine they call. Returns (machine, moves, calls, final) per DFA
+        # state, numbered across machines, and the start state of each
+        # machine.
+        nfa = self.nfa
+        numbers = {}
+        subsets = []
+
+        def number(machine, targets):
+            key = (machine, self._closure(targets))
+            if key not in numbers:
+                numbers[key] = len(subsets)
+                subsets.append(key)
+            return numbers[key]
+
+        starts = [number(machine, [start])
+                  for machine, (start, final) in enumerate(self.machines)]
+        states = []
+        for machine, subset in subsets:
+            moves = {}
+            called = {}
+            for state in subset:
+                for symbol, target in nfa.edges[state]:
+                    moves.setdefault(symbol, set()).add(target)
+                for callee, target in nfa.calls[state]:
+                    called.setdefault(callee, set()).add(target)
+            states.append((machine,
+                dict((symbol, number(machine, targets))
+                     for symbol, targets in moves.items()),
+                dict((callee, number(machine, targets))
+                     for callee, targets in called.items()),
+                self.machines[machine][1] in subset))
+        return states, starts
+
+    def tables(self):
+        """The compiled tables as a dict of plain data."""
+        top = self._top()
+        states, starts = self._subsets()
+        width = len(self.symbols)
+        # Moore minimization: split blocks of states until states in a block
+        # move to the same blocks on every symbol and call.
+        block = [(machine, final, tuple(sorted(calls)))
+                 for machine, moves, calls, final in states]
+        count = 0
+        while True:
+            signatures = [(block[i],
+                           tuple(block[moves[symbol]] if symbol in moves
+                                 else None for symbol in range(width)),
+                           tuple((callee, block[target]) for callee, target
+                                 in sorted(calls.items())))
+                          for i, (machine, moves, calls, final)
+                          in enumerate(states)]
+            numbers = {}
+            block = [numbers.setdefault(signature, len(numbers))
+                     for signature in signatures]
+            if len(numbers) == count:
+                break
+            count = len(numbers)
+        # Symbols with the same column in every state share a class.
+        rows = [None] * count
+        for i, (machine, moves, calls, final) in enumerate(states):
+            rows[block[i]] = (moves, calls, final)
+        columns = {}
+        classes = [columns.setdefault(tuple(
+            block[moves[symbol]] if symbol in moves else -1
+            for moves, calls, final in rows), len(columns))
+            for symbol in range(width)]
+        # Rows are packed into one comb vector, densest first: the move of
+        # state on class is NEXT[BASE[state] + class] if CHECK there is state.
+        base = [0] * count
+        check = []
+        following = []
+        for state in sorted(range(count), key=lambda n: (-len(rows[n][0]),
+                                                          n)):
+            cells = sorted(set((classes[symbol], block[target]) for
+                               symbol, target in rows[state][0].items()))
+            offset = 0
+            while any(offset + c < len(check) and check[offset + c] != -1
+                      for c, target in cells):
+                offset += 1
+            base[state] = offset
+            for c, target in cells:
+                while len(check) <= offset + c:
+                    check.append(-1)
+                    following.append(-1)
+                check[offset + c] = state
+                following[offset + c] = target
+        # Lookups past the end fall into the padding.
+        padding = len(columns) - (len(check) - max(base))
+        check.extend([-1] * max(padding, 0))
+        following.extend([-1] * max(padding, 0))
+        punctuation = sorted(self.punctuation, key=lambda t: (-len(t), t))
+        return {
+            "LEXER": LEXER % "|".join(re.escape(text) for text in
+                                      punctuation),
+            "CLASSES": tuple(classes[:len(BASE_SYMBOLS)]),
+            "KEYWORDS": dict((text, classes[symbol]) for text, symbol
+                             in self.keywords.items()),
+            "PUNCTUATION": dict((text, classes[symbol]) for text, symbol
+                                in self.punctuation.items()),
+            "START": block[starts[top]],
+            "BASE": tuple(base),
+            "CHECK": tuple(check),
+            "NEXT": tuple(following),
+            "CALLS": dict((state, tuple(sorted(
+                (block[starts[callee]], block[target])
+                for callee, target in rows[state][1].items())))
+                for state in range(count) if rows[state][1]),
+            "FINAL": tuple(state for state in range(count)
+                           if rows[state][2]),
+        }
+
+
+def emit(tables, path=TABLES_PATH):
+    """Write ``tables`` to ``path`` as a Python module."""
+    lines = ['"""',
+             "Tables of ``automaton``, generated from ``grammar`` by",
+             "``python -m ro.automaton --emit``. Do not edit.",
+             '"""']
+    for name in ("LEXER", "CLASSES", "KEYWORDS", "PUNCTUATION", "START",
+                 "BASE", "CHECK", "NEXT", "CALLS", "FINAL"):
+        value = tables[name]
+        if isinstance(value, str):
+            chunks = [""]
+            for c in value:
+                if len(repr(chunks[-1] + c)) > 75:
+                    chunks.append("")
+                chunks[-1] += c
+            lines.append("%s = (\n%s\n)" % (name, "\n".join(
+                "    %r" % chunk for chunk in chunks)))
+        elif isinstance(value, dict):
+            lines.append("%s = {\n%s}" % (name, "".join(
+                "    %r: %r,\n" % item for item in sorted(value.items()))))
+        elif isinstance(value, tuple) and len(value) > 16:
+            text = textwrap.fill(", ".join(map(str, value)), 75,
+                                 initial_indent="    ",
+                                 subsequent_indent="    ")
+            lines.append("%s = (\n%s,\n)" % (name, text))
+        else:
+            lines.append("%s = %r" % (name, value))
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+#############################################################################
+############### Recognizer ##################################################
+
+class Recognizer(object):
+    """
+    Runs queries through compiled tables. ``tables`` is a dict as returned
+    by ``Compiler.tables``, or a module holding them.
+    """
+
+    def __init__(self, tables, max_depth=MAX_DEPTH):
+        if not isinstance(tables, dict):
+            tables = vars(tables)
+        self.lexer = re.compile(tables["LEXER"], re.S)
+        self.classes = tables["CLASSES"]
+        self.keywords = tables["KEYWORDS"]
+        self.punctuation = tables["PUNCTUATION"]
+        self.start = tables["START"]
+        self.base = tables["BASE"]
+        self.check = tables["CHECK"]
+        self.next = tables["NEXT"]
+        self.calls = tables["CALLS"]
+        self.final = frozenset(tables["FINAL"])
+        self.max_depth = max_depth
+        # States a configuration may leave without reading a token.
+        self._moving = self.final | frozenset(self.calls)
+        # The classes each state can read, itself or through its calls, so
+        # that calls which cannot read the next token are not made.
+        width = max(list(self.classes) + list(self.keywords.values()) +
+                    list(self.punctuation.values())) + 1
+        reads = [set(c for c in range(width)
+                     if self.check[self.base[state] + c] == state)
+                 for state in range(len(self.base))]
+        changed = True
+        while changed:
+            changed = False
+            for state, called in self.calls.items():
+                for start, target in called:
+                    more = reads[start] | (reads[target] if start in
+                                           self.final else set())
+                    if not more <= reads[state]:
+                        reads[state] |= more
+                        changed = True
+        self._reads = [frozenset(classes) for classes in reads]
+
+    def _closure(self, configurations, symbol=None):
+        # Configurations reachable by calls and returns, keeping calls only
+        # if they can read symbol or return at once. A stack is None or
+        # (return state, rest of the stack, depth).
+        calls = self.calls
+        final = self.final
+        reads = self._reads
+        result = set()
+        todo = list(configurations)
+        while todo:
+            configuration = todo.pop()
+            if configuration in result:
+                continue
+            result.add(configuration)
+            state, stack = configuration
+            if stack is not None and state in final:
+                todo.append((stack[0], stack[1]))
+            depth = stack[2] + 1 if stack is not None else 1
+            if depth <= self.max_depth:
+                for start, target in calls.get(state, ()):
+                    if symbol is None or symbol in reads[start] or \
+                            start in final:
+                        todo.append((start, (target, stack, depth)))
+        return result
+
+    def symbols(self, q):
+        """``(class, start)`` for every token of ``q``."""
+        classes = self.classes
+        keywords = self.keywords
+        punctuation = self.punctuation
+        for found in self.lexer.finditer(q):
+            group = found.lastindex
+            if group == _WORD_GROUP:
+                yield keywords.get(found.group().upper(),
+                                   classes[IDENTIFIER]), found.start()
+            elif group == _PUNCTUATION_GROUP:
+                yield punctuation[found.group()], found.start()
+            elif group == _NUMBER_GROUP:
+                yield classes[INTEGER if found.group().isdigit()
+                              else NUMBER], found.start()
+            elif group == _ORDER_BY_GROUP:
+                yield keywords["ORDER BY"], found.start()
+            else:
+                yield classes[_KINDS[group]], found.start()
+
+    def first_error(self, q):
+        """Offset of the first token of ``q`` that cannot be read, ``len(q)``
+        if the query stops short, or None if it is accepted."""
+        base = self.base
+        check = self.check
+        following = self.next
+        moving = self._moving
+        configurations = [(self.start, None)]
+        for symbol, start in self.symbols(q):
+            if len(configurations) > 1 or configurations[0][0] in moving:
+                configurations = self._closure(configurations, symbol)
+            moved = []
+            for state, stack in configurations:
+                i = base[state] + symbol
+                if check[i] == state:
+                    moved.append((following[i], stack))
+            if not moved:
+                return start
+            configurations = moved
+        for state, stack in self._closure(configurations, -1):
+            if stack is None and state in self.final:
+                return None
+        return len(q)
+
+    def accepts(self, q):
+        return self.first_error(q) is None
+
+
+_KINDS = {_SPACE_GROUP: SPACE, _STRING_GROUP: STRING,
+          _QUOTED_GROUP: IDENTIFIER, _ERROR_GROUP: ERROR}
+
+_default = []
+_default_lock = threading.Lock()
+
+
+def recognizer():
+    """The ``Recognizer`` for the emitted tables."""
+    if not _default:
+        with _default_lock:
+            if not _default:
+                from . import automaton_tables
+                _default.append(Recognizer(automaton_tables))
+    return _default[0]
+
+
+def accepts(q):
+    """Whether the emitted tables accept ``q``."""
+    return recognizer().first_error(q) is None
+
+
+def first_error(q):
+    """See ``Recognizer.first_error``."""
+    return recognizer().first_error(q)
+
+
+def benchmark(count=1000, seed=0):
+    """
+    ``fuzz.benchmark`` statistics of the pyparsing grammar, the recognizer and
+    the ``spans`` lexer over ``count`` generated queries, a fifth of them
+    invalid.
+    """
+    corpus = list(fuzz.QueryGenerator(seed).corpus(count, invalid=0.2))
+    queries = [q for q, expected in corpus]
+    tables = recognizer()
+    return {
+        "pyparsing": fuzz.benchmark(fuzz.parses(grammar.query), queries),
+        "automaton": fuzz.benchmark(tables.first_error, queries),
+        "lexer": fuzz.benchmark(spans.scan, queries),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ro.automaton",
+        description="Compile the grammar to recognizer tables.")
+    parser.add_argument("--emit", action="store_true",
+        help="write the tables to %s" % os.path.basename(TABLES_PATH))
+    parser.add_argument("--bench", type=int, metavar="QUERIES",
+        help="compare the recognizer with the pyparsing grammar")
+    parser.add_argument("queries", nargs="*",
+        help="print the first error offset of each, -1 if accepted")
+    args = parser.parse_args(argv)
+    if args.emit:
+        emit(Compiler().tables())
+    if args.bench:
+        report = benchmark(args.bench)
+        print("%-10s %10s %10s %10s" % ("parser", "queries/s", "p50_us",
+                                        "p99_us"))
+        for name in ("pyparsing", "automaton", "lexer"):
+            stats = report[name]
+            print("%-10s %10.0f %10.1f %10.1f" % (name,
+                stats["queries_per_second"], stats["p50_us"],
+                stats["p99_us"]))
+    for q in args.queries:
+        error = first_error(q)
+        sys.stdout.write("%d\t%s\n" % (-1 if error is None else error, q))
+
+
+if __name__ == "__main__":
+    main()
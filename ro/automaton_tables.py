@@ -0,0 +1,632 @@
+"""
+Tables of ``automaton``, generated from ``grammar`` by
+``python -m ro.automaton --emit``. Do not edit.
+"""
+LEXER = (
+    '([ \\t\\r\\n]+)|(\'(?:[^\'\\\\]|\\\\.|\'\')*\'|"(?:[^"\\\\]|\\\\.|"")*")|'
+    '(-?(?:\\d+(?:\\.\\d+)?|\\.\\d+)(?:[eE][-+]?\\d+)?)(?![\\w$])|((?i:ORDER B'
+    'Y)(?![\\w$]))|([^\\W\\d]\\w*)|(`(?:[^`]|``)+`)|(\\.\\.|<=|<>|=\\~|>=|\\(|'
+    '\\)|\\*|,|\\-|\\.|:|<|=|>|\\[|\\]|\\{|\\})|(.)'
+)
+CLASSES = (0, 1, 2, 3, 4, 5)
+KEYWORDS = {
+    'ALL': 6,
+    'AND': 7,
+    'AS': 8,
+    'ASC': 9,
+    'CALL': 10,
+    'COUNT': 11,
+    'DESC': 9,
+    'DISTINCT': 12,
+    'HAS': 13,
+    'IN': 14,
+    'IS': 15,
+    'LIMIT': 16,
+    'MATCH': 17,
+    'NOT': 18,
+    'NULL': 19,
+    'OPTIONAL': 20,
+    'OR': 7,
+    'ORDER BY': 21,
+    'PERCENTILEDISC': 22,
+    'RETURN': 23,
+    'SKIP': 24,
+    'STDEV': 25,
+    'SUM': 25,
+    'TYPE': 26,
+    'UNION': 27,
+    'WHERE': 28,
+    'WITH': 29,
+    'XOR': 7,
+    'YIELD': 30,
+}
+PUNCTUATION = {
+    '(': 34,
+    ')': 35,
+    '*': 36,
+    ',': 37,
+    '-': 38,
+    '.': 39,
+    '..': 31,
+    ':': 40,
+    '<': 41,
+    '<=': 32,
+    '<>': 32,
+    '=': 42,
+    '=~': 33,
+    '>': 43,
+    '>=': 32,
+    '[': 44,
+    ']': 45,
+    '{': 46,
+    '}': 47,
+}
+START = 0
+BASE = (
+    0, 226, 1742, 0, 1, 1078, 117, 252, 3, 872, 81, 5, 1109, 304, 3376,
+    1140, 362, 493, 2, 0, 183, 0, 903, 228, 754, 243, 284, 248, 327, 283,
+    2339, 286, 394, 463, 647, 160, 167, 203, 809, 114, 210, 491, 545, 31,
+    1167, 3387, 3392, 3408, 3305, 1198, 579, 668, 669, 728, 2366, 288, 156,
+    321, 769, 908, 788, 862, 916, 1080, 2393, 939, 1075, 873, 1084, 1172,
+    0, 1203, 1219, 1231, 0, 0, 944, 904, 0, 1229, 965, 1244, 324, 770, 37,
+    1260, 0, 1253, 365, 0, 3503, 1291, 396, 1322, 3504, 1353, 3510, 1384,
+    1257, 980, 3520, 985, 0, 239, 1312, 1324, 3458, 1415, 934, 1446, 1343,
+    427, 1355, 3317, 0, 3422, 1477, 2420, 0, 0, 3521, 1508, 1539, 1570,
+    1757, 3531, 1016, 3545, 1601, 3556, 1632, 1048, 0, 1663, 115, 1694,
+    1079, 1356, 157, 1721, 2447, 1340, 44, 401, 2474, 273, 1386, 1405,
+    1400, 310, 3534, 836, 946, 319, 2501, 432, 458, 793, 1715, 1436, 1439,
+    1448, 2528, 1161, 2555, 1449, 2582, 1756, 2609, 740, 1762, 161, 940,
+    90, 1112, 2636, 3474, 983, 1450, 2663, 3546, 905, 677, 1814, 638, 1433,
+    1793, 2690, 3438, 3443, 2717, 1199, 1478, 1479, 1472, 1482, 2744, 2213,
+    2771, 1498, 1820, 3550, 3563, 1230, 2798, 3400, 2825, 1507, 1510, 1511,
+    3330, 2852, 27, 3341, 1511, 0, 1523, 1540, 488, 1541, 3289, 1726, 1495,
+    1544, 1518, 0, 0, 0, 1533, 3278, 1716, 76, 77, 1525, 1261, 707, 1534,
+    1851, 1882, 1538, 0, 1913, 1552, 3315, 1944, 1563, 1568, 3524, 1075,
+    738, 1586, 3320, 3370, 0, 3487, 1587, 1292, 1583, 1975, 524, 1589,
+    2879, 3421, 3340, 3371, 1599, 0, 0, 2006, 1596, 2037, 3525, 1319, 772,
+    1602, 1614, 0, 0, 3327, 3576, 0, 622, 704, 555, 2068, 1288, 0, 1720,
+    119, 162, 941, 2099, 0, 1143, 2333, 3480, 1629, 2906, 2933, 2960, 3577,
+    3409, 2987, 100, 1665, 1666, 3495, 3014, 811, 3469, 113, 1629, 2130,
+    3041, 3578, 3068, 3583, 3095, 1647, 1665, 1696, 586, 3122, 205, 2161,
+    0, 2195, 2360, 3329, 3297, 3526, 3149, 529, 891, 560, 1659, 1662, 314,
+    0, 1232, 1714, 2192, 3555, 617, 3176, 1385, 1718, 1746, 519, 1047, 841,
+    3353, 3203, 712, 1004, 1037, 1787, 3551, 3567, 1794, 1387, 1821, 1139,
+    1836, 3230, 1837, 1260, 2219, 3588, 1836, 3573, 1853, 1416, 3563, 1883,
+    65, 3459, 2250, 3565, 1885, 3321, 1858, 1906, 1915, 2281, 1871, 2312,
+    3257, 3284, 3594, 1881,
+)
+CHECK = (
+    114, 4, 18, 8, 114, 11, 114, 114, 114, 114, 114, 114, 114, 114, 114,
+    114, 114, 114, 114, 114, 114, 8, 114, 114, 114, 114, 114, 114, 114,
+    114, 114, 43, 114, 114, 11, 4, 212, 84, 43, 114, 114, 114, 114, 114,
+    142, 142, 142, 142, 142, 43, 142, 142, 142, 142, 142, 142, 142, 142,
+    142, 142, 142, 142, 142, 142, 142, 375, 142, 142, 142, 142, 142, 142,
+    142, 142, 142, 84, 231, 232, 84, 142, 231, 10, 231, 231, 231, 231, 231,
+    231, 231, 231, 231, 231, 231, 231, 231, 231, 231, 173, 231, 231, 231,
+    231, 231, 231, 231, 231, 231, 303, 173, 10, 375, 232, 231, 310, 39,
+    134, 231, 6, 303, 288, 232, 231, 231, 288, 134, 288, 288, 288, 288,
+    288, 288, 288, 288, 288, 288, 288, 288, 288, 288, 288, 6, 288, 288,
+    288, 288, 288, 288, 288, 288, 288, 310, 39, 134, 39, 134, 288, 56, 138,
+    310, 288, 35, 171, 289, 138, 288, 288, 289, 36, 289, 289, 289, 289,
+    289, 289, 289, 289, 289, 289, 289, 289, 289, 289, 289, 20, 289, 289,
+    289, 289, 289, 289, 289, 289, 289, 56, 35, 56, 171, 35, 289, 35, 171,
+    36, 289, 37, 36, 323, 36, 289, 289, 323, 40, 323, 323, 323, 323, 323,
+    323, 323, 323, 323, 323, 323, 323, 323, 323, 323, 1, 323, 323, 323,
+    323, 323, 323, 323, 323, 323, 1, 37, 23, 103, 37, 323, 37, 25, 40, 323,
+    103, 40, 27, 40, 323, 323, 7, 7, 7, 7, 7, 103, 7, 7, 7, 7, 7, 7, 7, 7,
+    7, 7, 7, 7, 7, 7, 7, 145, 7, 7, 7, 7, 7, 7, 7, 7, 7, 29, 26, 27, 31,
+    29, 55, 29, 29, 29, 29, 29, 29, 29, 29, 29, 29, 29, 29, 29, 29, 29, 13,
+    29, 29, 29, 29, 29, 29, 29, 29, 29, 337, 145, 337, 337, 29, 153, 13,
+    57, 55, 29, 82, 55, 31, 55, 82, 29, 82, 82, 82, 82, 82, 82, 82, 82, 82,
+    82, 82, 82, 82, 82, 82, 149, 82, 82, 82, 82, 82, 82, 82, 82, 82, 57,
+    149, 153, 57, 82, 57, 28, 16, 153, 82, 88, 88, 88, 88, 88, 82, 88, 88,
+    88, 88, 88, 88, 88, 88, 88, 88, 88, 88, 88, 88, 88, 16, 88, 88, 88, 88,
+    88, 88, 88, 88, 88, 92, 92, 92, 92, 92, 143, 92, 92, 92, 92, 92, 92,
+    92, 92, 92, 92, 92, 92, 92, 92, 92, 32, 92, 92, 92, 92, 92, 92, 92, 92,
+    92, 111, 111, 111, 111, 111, 155, 111, 111, 111, 111, 111, 111, 111,
+    111, 111, 111, 111, 111, 111, 111, 111, 143, 111, 111, 111, 111, 111,
+    111, 111, 111, 111, 156, 156, 156, 156, 156, 33, 156, 156, 156, 156,
+    156, 156, 156, 156, 156, 156, 156, 156, 156, 156, 156, 155, 156, 156,
+    156, 156, 156, 156, 156, 156, 156, 218, 218, 218, 218, 17, 218, 218,
+    218, 218, 218, 218, 218, 218, 218, 218, 218, 218, 218, 218, 218, 41,
+    218, 218, 218, 218, 218, 218, 218, 218, 218, 348, 17, 348, 348, 218,
+    259, 259, 259, 259, 259, 332, 259, 259, 259, 259, 259, 259, 259, 259,
+    259, 259, 259, 259, 259, 259, 259, 42, 259, 259, 259, 259, 259, 259,
+    259, 259, 259, 283, 283, 283, 283, 283, 334, 283, 283, 283, 283, 283,
+    283, 283, 283, 283, 283, 283, 283, 283, 283, 283, 332, 283, 283, 283,
+    283, 283, 283, 283, 283, 283, 321, 321, 321, 321, 321, 334, 321, 321,
+    321, 321, 321, 321, 321, 321, 321, 321, 321, 321, 321, 321, 321, 50,
+    321, 321, 321, 321, 321, 321, 321, 321, 321, 343, 343, 343, 343, 343,
+    281, 343, 343, 343, 343, 343, 343, 343, 343, 343, 343, 343, 343, 343,
+    343, 343, 184, 343, 343, 343, 343, 343, 343, 343, 343, 343, 34, 34, 34,
+    34, 281, 34, 34, 34, 34, 34, 34, 34, 34, 34, 34, 34, 34, 34, 34, 34,
+    51, 34, 34, 34, 34, 34, 34, 34, 34, 34, 182, 182, 182, 182, 184, 182,
+    182, 182, 182, 182, 182, 182, 182, 182, 182, 182, 182, 182, 182, 182,
+    52, 182, 182, 182, 182, 182, 182, 182, 182, 182, 235, 235, 235, 235,
+    353, 235, 235, 235, 235, 235, 235, 235, 235, 235, 235, 235, 235, 235,
+    235, 235, 53, 235, 235, 235, 235, 235, 235, 235, 235, 235, 249, 282,
+    169, 282, 249, 282, 249, 249, 249, 249, 249, 249, 249, 249, 249, 249,
+    249, 249, 249, 249, 249, 353, 249, 249, 249, 249, 249, 249, 249, 249,
+    249, 58, 83, 24, 273, 249, 24, 169, 273, 249, 273, 273, 273, 273, 273,
+    273, 273, 273, 273, 273, 273, 273, 273, 273, 273, 157, 273, 273, 273,
+    273, 273, 273, 273, 273, 273, 58, 60, 83, 58, 273, 58, 38, 83, 273,
+    308, 308, 308, 308, 83, 308, 308, 308, 308, 308, 308, 308, 308, 308,
+    308, 308, 308, 308, 308, 308, 157, 308, 308, 308, 308, 308, 308, 308,
+    308, 308, 350, 350, 350, 350, 38, 350, 350, 350, 350, 350, 350, 350,
+    350, 350, 350, 350, 350, 350, 350, 350, 61, 350, 350, 350, 350, 350,
+    350, 350, 350, 350, 9, 67, 151, 67, 9, 151, 9, 9, 9, 9, 9, 9, 9, 9, 9,
+    9, 9, 9, 9, 9, 9, 333, 9, 9, 9, 9, 9, 9, 9, 9, 9, 22, 77, 181, 9, 22,
+    59, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 22, 181,
+    22, 22, 22, 22, 22, 22, 22, 22, 22, 108, 108, 333, 62, 77, 65, 172,
+    290, 59, 77, 76, 59, 152, 59, 76, 22, 76, 76, 76, 76, 76, 76, 76, 76,
+    76, 76, 76, 76, 76, 76, 76, 80, 76, 76, 76, 76, 76, 76, 76, 76, 76,
+    172, 65, 290, 65, 172, 99, 290, 80, 177, 152, 101, 290, 290, 99, 101,
+    76, 101, 101, 101, 101, 101, 101, 101, 101, 101, 101, 101, 101, 101,
+    101, 101, 354, 101, 101, 101, 101, 101, 101, 101, 101, 101, 126, 99,
+    177, 99, 126, 101, 126, 126, 126, 126, 126, 126, 126, 126, 126, 126,
+    126, 126, 126, 126, 126, 355, 126, 126, 126, 126, 126, 126, 126, 126,
+    126, 349, 131, 354, 131, 349, 126, 349, 349, 349, 349, 349, 349, 349,
+    349, 349, 349, 349, 349, 349, 349, 349, 355, 349, 349, 349, 349, 349,
+    349, 349, 349, 349, 5, 136, 63, 136, 5, 349, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 5, 5, 5, 5, 66, 5, 5, 5, 5, 5, 5, 5, 5, 5, 12, 248, 68, 174, 12,
+    248, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 174,
+    12, 12, 12, 12, 12, 12, 12, 12, 12, 15, 362, 362, 293, 15, 293, 15, 15,
+    15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 163, 15, 15, 15,
+    15, 15, 15, 15, 15, 15, 44, 69, 44, 44, 44, 44, 44, 44, 44, 44, 44, 44,
+    44, 44, 44, 44, 44, 293, 44, 44, 44, 44, 44, 44, 44, 44, 44, 49, 191,
+    163, 44, 49, 71, 49, 49, 49, 49, 49, 49, 49, 49, 49, 49, 49, 49, 49,
+    49, 49, 72, 49, 49, 49, 49, 49, 49, 49, 49, 49, 79, 203, 73, 339, 79,
+    191, 79, 79, 79, 79, 79, 79, 79, 79, 79, 79, 79, 79, 79, 79, 79, 339,
+    79, 79, 79, 79, 79, 79, 79, 79, 79, 85, 234, 366, 366, 85, 203, 85, 85,
+    85, 85, 85, 85, 85, 85, 85, 85, 85, 85, 85, 85, 85, 81, 85, 85, 85, 85,
+    85, 85, 85, 85, 85, 91, 256, 87, 98, 91, 234, 91, 91, 91, 91, 91, 91,
+    91, 91, 91, 91, 91, 91, 91, 91, 91, 104, 91, 91, 91, 91, 91, 91, 91,
+    91, 91, 93, 285, 105, 285, 93, 256, 93, 93, 93, 93, 93, 93, 93, 93, 93,
+    93, 93, 93, 93, 93, 93, 110, 93, 93, 93, 93, 93, 93, 93, 93, 93, 95,
+    272, 112, 137, 95, 272, 95, 95, 95, 95, 95, 95, 95, 95, 95, 95, 95, 95,
+    95, 95, 95, 141, 95, 95, 95, 95, 95, 95, 95, 95, 95, 97, 345, 146, 360,
+    97, 360, 97, 97, 97, 97, 97, 97, 97, 97, 97, 97, 97, 97, 97, 97, 97,
+    147, 97, 97, 97, 97, 97, 97, 97, 97, 97, 107, 372, 148, 372, 107, 345,
+    107, 107, 107, 107, 107, 107, 107, 107, 107, 107, 107, 107, 107, 107,
+    107, 159, 107, 107, 107, 107, 107, 107, 107, 107, 107, 109, 160, 161,
+    165, 109, 178, 109, 109, 109, 109, 109, 109, 109, 109, 109, 109, 109,
+    109, 109, 109, 109, 185, 109, 109, 109, 109, 109, 109, 109, 109, 109,
+    116, 192, 193, 194, 116, 195, 116, 116, 116, 116, 116, 116, 116, 116,
+    116, 116, 116, 116, 116, 116, 116, 199, 116, 116, 116, 116, 116, 116,
+    116, 116, 116, 121, 207, 208, 209, 121, 214, 121, 121, 121, 121, 121,
+    121, 121, 121, 121, 121, 121, 121, 121, 121, 121, 216, 121, 121, 121,
+    121, 121, 121, 121, 121, 121, 122, 217, 219, 222, 122, 223, 122, 122,
+    122, 122, 122, 122, 122, 122, 122, 122, 122, 122, 122, 122, 122, 224,
+    122, 122, 122, 122, 122, 122, 122, 122, 122, 123, 228, 233, 236, 123,
+    239, 123, 123, 123, 123, 123, 123, 123, 123, 123, 123, 123, 123, 123,
+    123, 123, 242, 123, 123, 123, 123, 123, 123, 123, 123, 123, 128, 245,
+    246, 250, 128, 255, 128, 128, 128, 128, 128, 128, 128, 128, 128, 128,
+    128, 128, 128, 128, 128, 257, 128, 128, 128, 128, 128, 128, 128, 128,
+    128, 130, 260, 265, 269, 130, 274, 130, 130, 130, 130, 130, 130, 130,
+    130, 130, 130, 130, 130, 130, 130, 130, 275, 130, 130, 130, 130, 130,
+    130, 130, 130, 130, 133, 296, 304, 305, 133, 311, 133, 133, 133, 133,
+    133, 133, 133, 133, 133, 133, 133, 133, 133, 133, 133, 318, 133, 133,
+    133, 133, 133, 133, 133, 133, 133, 135, 319, 320, 335, 135, 336, 135,
+    135, 135, 135, 135, 135, 135, 135, 135, 135, 135, 135, 135, 135, 135,
+    158, 135, 135, 135, 135, 135, 135, 135, 135, 135, 139, 221, 139, 139,
+    139, 139, 139, 139, 139, 139, 139, 139, 139, 139, 139, 139, 139, 2,
+    139, 139, 139, 139, 139, 139, 139, 139, 139, 158, 340, 230, 346, 167,
+    124, 287, 2, 230, 221, 2, 221, 287, 124, 170, 139, 170, 170, 170, 170,
+    170, 170, 170, 170, 170, 170, 170, 170, 170, 170, 170, 347, 170, 170,
+    170, 170, 170, 170, 170, 170, 170, 186, 124, 167, 124, 186, 170, 186,
+    186, 186, 186, 186, 186, 186, 186, 186, 186, 186, 186, 186, 186, 186,
+    183, 186, 186, 186, 186, 186, 186, 186, 186, 186, 200, 356, 200, 200,
+    200, 200, 200, 200, 200, 200, 200, 200, 200, 200, 200, 200, 200, 359,
+    200, 200, 200, 200, 200, 200, 200, 200, 200, 237, 361, 183, 363, 237,
+    200, 237, 237, 237, 237, 237, 237, 237, 237, 237, 237, 237, 237, 237,
+    237, 237, 365, 237, 237, 237, 237, 237, 237, 237, 237, 237, 238, 369,
+    371, 374, 238, 379, 238, 238, 238, 238, 238, 238, 238, 238, 238, 238,
+    238, 238, 238, 238, 238, 381, 238, 238, 238, 238, 238, 238, 238, 238,
+    238, 241, 382, 383, 385, 241, 390, 241, 241, 241, 241, 241, 241, 241,
+    241, 241, 241, 241, 241, 241, 241, 241, -1, 241, 241, 241, 241, 241,
+    241, 241, 241, 241, 244, -1, -1, -1, 244, -1, 244, 244, 244, 244, 244,
+    244, 244, 244, 244, 244, 244, 244, 244, 244, 244, -1, 244, 244, 244,
+    244, 244, 244, 244, 244, 244, 258, -1, -1, -1, 258, -1, 258, 258, 258,
+    258, 258, 258, 258, 258, 258, 258, 258, 258, 258, 258, 258, -1, 258,
+    258, 258, 258, 258, 258, 258, 258, 258, 268, -1, -1, -1, 268, -1, 268,
+    268, 268, 268, 268, 268, 268, 268, 268, 268, 268, 268, 268, 268, 268,
+    -1, 268, 268, 268, 268, 268, 268, 268, 268, 268, 270, -1, -1, -1, 270,
+    -1, 270, 270, 270, 270, 270, 270, 270, 270, 270, 270, 270, 270, 270,
+    270, 270, -1, 270, 270, 270, 270, 270, 270, 270, 270, 270, 284, -1, -1,
+    -1, 284, -1, 284, 284, 284, 284, 284, 284, 284, 284, 284, 284, 284,
+    284, 284, 284, 284, -1, 284, 284, 284, 284, 284, 284, 284, 284, 284,
+    291, -1, -1, -1, 291, -1, 291, 291, 291, 291, 291, 291, 291, 291, 291,
+    291, 291, 291, 291, 291, 291, -1, 291, 291, 291, 291, 291, 291, 291,
+    291, 291, 312, -1, -1, -1, 312, -1, 312, 312, 312, 312, 312, 312, 312,
+    312, 312, 312, 312, 312, 312, 312, 312, -1, 312, 312, 312, 312, 312,
+    312, 312, 312, 312, 324, -1, -1, -1, 324, -1, 324, 324, 324, 324, 324,
+    324, 324, 324, 324, 324, 324, 324, 324, 324, 324, -1, 324, 324, 324,
+    324, 324, 324, 324, 324, 324, 341, -1, -1, 326, 341, 326, 341, 341,
+    341, 341, 341, 341, 341, 341, 341, 341, 341, 341, 341, 341, 341, 197,
+    341, 341, 341, 341, 341, 341, 341, 341, 341, 367, -1, 367, 367, 367,
+    367, 367, 367, 367, 367, 367, 367, 367, 367, 367, 367, 367, 326, 367,
+    367, 367, 367, 367, 367, 367, 367, 367, 377, -1, 197, -1, 377, 367,
+    377, 377, 377, 377, 377, 377, 377, 377, 377, 377, 377, 377, 377, 377,
+    377, -1, 377, 377, 377, 377, 377, 377, 377, 377, 377, 384, -1, -1, -1,
+    384, -1, 384, 384, 384, 384, 384, 384, 384, 384, 384, 384, 384, 384,
+    384, 384, 384, -1, 384, 384, 384, 384, 384, 384, 384, 384, 384, 386,
+    -1, -1, -1, 386, -1, 386, 386, 386, 386, 386, 386, 386, 386, 386, 386,
+    386, 386, 386, 386, 386, 294, 386, 386, 386, 386, 386, 386, 386, 386,
+    386, 30, -1, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30,
+    30, 327, 30, 30, 30, 30, 30, 30, 30, 30, 30, 54, 294, 54, 54, 54, 54,
+    54, 54, 54, 54, 54, 54, 54, 54, 54, 54, 54, -1, 54, 54, 54, 54, 54, 54,
+    54, 54, 54, 64, 327, 64, 64, 64, 64, 64, 64, 64, 64, 64, 64, 64, 64,
+    64, 64, 64, -1, 64, 64, 64, 64, 64, 64, 64, 64, 64, 117, -1, 117, 117,
+    117, 117, 117, 117, 117, 117, 117, 117, 117, 117, 117, 117, 117, -1,
+    117, 117, 117, 117, 117, 117, 117, 117, 117, 140, -1, 140, 140, 140,
+    140, 140, 140, 140, 140, 140, 140, 140, 140, 140, 140, 140, -1, 140,
+    140, 140, 140, 140, 140, 140, 140, 140, 144, -1, 144, 144, 144, 144,
+    144, 144, 144, 144, 144, 144, 144, 144, 144, 144, 144, -1, 144, 144,
+    144, 144, 144, 144, 144, 144, 144, 154, -1, 154, 154, 154, 154, 154,
+    154, 154, 154, 154, 154, 154, 154, 154, 154, 154, -1, 154, 154, 154,
+    154, 154, 154, 154, 154, 154, 162, -1, 162, 162, 162, 162, 162, 162,
+    162, 162, 162, 162, 162, 162, 162, 162, 162, -1, 162, 162, 162, 162,
+    162, 162, 162, 162, 162, 164, -1, 164, 164, 164, 164, 164, 164, 164,
+    164, 164, 164, 164, 164, 164, 164, 164, -1, 164, 164, 164, 164, 164,
+    164, 164, 164, 164, 166, -1, 166, 166, 166, 166, 166, 166, 166, 166,
+    166, 166, 166, 166, 166, 166, 166, -1, 166, 166, 166, 166, 166, 166,
+    166, 166, 166, 168, -1, 168, 168, 168, 168, 168, 168, 168, 168, 168,
+    168, 168, 168, 168, 168, 168, -1, 168, 168, 168, 168, 168, 168, 168,
+    168, 168, 175, -1, 175, 175, 175, 175, 175, 175, 175, 175, 175, 175,
+    175, 175, 175, 175, 175, -1, 175, 175, 175, 175, 175, 175, 175, 175,
+    175, 179, -1, 179, 179, 179, 179, 179, 179, 179, 179, 179, 179, 179,
+    179, 179, 179, 179, -1, 179, 179, 179, 179, 179, 179, 179, 179, 179,
+    187, -1, 187, 187, 187, 187, 187, 187, 187, 187, 187, 187, 187, 187,
+    187, 187, 187, -1, 187, 187, 187, 187, 187, 187, 187, 187, 187, 190,
+    -1, 190, 190, 190, 190, 190, 190, 190, 190, 190, 190, 190, 190, 190,
+    190, 190, -1, 190, 190, 190, 190, 190, 190, 190, 190, 190, 196, -1,
+    196, 196, 196, 196, 196, 196, 196, 196, 196, 196, 196, 196, 196, 196,
+    196, -1, 196, 196, 196, 196, 196, 196, 196, 196, 196, 198, -1, 198,
+    198, 198, 198, 198, 198, 198, 198, 198, 198, 198, 198, 198, 198, 198,
+    -1, 198, 198, 198, 198, 198, 198, 198, 198, 198, 204, -1, 204, 204,
+    204, 204, 204, 204, 204, 204, 204, 204, 204, 204, 204, 204, 204, -1,
+    204, 204, 204, 204, 204, 204, 204, 204, 204, 206, -1, 206, 206, 206,
+    206, 206, 206, 206, 206, 206, 206, 206, 206, 206, 206, 206, -1, 206,
+    206, 206, 206, 206, 206, 206, 206, 206, 211, -1, 211, 211, 211, 211,
+    211, 211, 211, 211, 211, 211, 211, 211, 211, 211, 211, -1, 211, 211,
+    211, 211, 211, 211, 211, 211, 211, 261, -1, 261, 261, 261, 261, 261,
+    261, 261, 261, 261, 261, 261, 261, 261, 261, 261, -1, 261, 261, 261,
+    261, 261, 261, 261, 261, 261, 297, -1, 297, 297, 297, 297, 297, 297,
+    297, 297, 297, 297, 297, 297, 297, 297, 297, -1, 297, 297, 297, 297,
+    297, 297, 297, 297, 297, 298, -1, 298, 298, 298, 298, 298, 298, 298,
+    298, 298, 298, 298, 298, 298, 298, 298, -1, 298, 298, 298, 298, 298,
+    298, 298, 298, 298, 299, -1, 299, 299, 299, 299, 299, 299, 299, 299,
+    299, 299, 299, 299, 299, 299, 299, -1, 299, 299, 299, 299, 299, 299,
+    299, 299, 299, 302, -1, 302, 302, 302, 302, 302, 302, 302, 302, 302,
+    302, 302, 302, 302, 302, 302, -1, 302, 302, 302, 302, 302, 302, 302,
+    302, 302, 307, -1, 307, 307, 307, 307, 307, 307, 307, 307, 307, 307,
+    307, 307, 307, 307, 307, -1, 307, 307, 307, 307, 307, 307, 307, 307,
+    307, 313, -1, 313, 313, 313, 313, 313, 313, 313, 313, 313, 313, 313,
+    313, 313, 313, 313, -1, 313, 313, 313, 313, 313, 313, 313, 313, 313,
+    315, -1, 315, 315, 315, 315, 315, 315, 315, 315, 315, 315, 315, 315,
+    315, 315, 315, -1, 315, 315, 315, 315, 315, 315, 315, 315, 315, 317,
+    -1, 317, 317, 317, 317, 317, 317, 317, 317, 317, 317, 317, 317, 317,
+    317, 317, -1, 317, 317, 317, 317, 317, 317, 317, 317, 317, 322, -1,
+    322, 322, 322, 322, 322, 322, 322, 322, 322, 322, 322, 322, 322, 322,
+    322, -1, 322, 322, 322, 322, 322, 322, 322, 322, 322, 331, -1, 331,
+    331, 331, 331, 331, 331, 331, 331, 331, 331, 331, 331, 331, 331, 331,
+    -1, 331, 331, 331, 331, 331, 331, 331, 331, 331, 344, -1, 344, 344,
+    344, 344, 344, 344, 344, 344, 344, 344, 344, 344, 344, 344, 344, -1,
+    344, 344, 344, 344, 344, 344, 344, 344, 344, 352, -1, 352, 352, 352,
+    352, 352, 352, 352, 352, 352, 352, 352, 352, 352, 352, 352, -1, 352,
+    352, 352, 352, 352, 352, 352, 352, 352, 364, -1, 364, 364, 364, 364,
+    364, 364, 364, 364, 364, 364, 364, 364, 364, 364, 364, -1, 364, 364,
+    364, 364, 364, 364, 364, 364, 364, 387, -1, 387, 387, 387, 387, 387,
+    387, 387, 387, 387, 387, 387, 387, 387, 387, 387, 229, 387, 387, 387,
+    387, 387, 387, 387, 387, 387, 388, 220, 388, 388, 388, 388, 388, 388,
+    388, 388, 388, 388, 388, 388, 388, 388, 388, 48, 388, 388, 388, 388,
+    388, 388, 388, 388, 388, 243, 229, 113, -1, 48, 48, 380, 229, 243, 220,
+    -1, 220, 278, 220, 328, 210, 113, 113, 329, 251, 251, 278, 48, 48, 48,
+    263, 213, 329, 329, 48, 48, 48, 48, 48, 113, 113, 113, 251, 251, 263,
+    263, 113, 113, 113, 113, 113, 251, 251, 251, 278, 328, 380, 210, -1,
+    328, 252, 264, 263, 263, 328, 328, 14, 252, 213, 263, 263, 263, 263,
+    263, 263, 264, 264, 45, 252, 351, 264, -1, 46, -1, -1, -1, -1, 14, 351,
+    351, 205, 45, 45, 264, 264, 252, 46, 46, 47, 301, 264, 264, 264, 264,
+    264, -1, -1, 301, -1, 45, 45, 262, 47, 47, 46, 46, 45, 45, 45, 45, 45,
+    46, 46, 46, 46, 46, 115, 115, 188, 205, 47, 47, -1, 189, -1, -1, 301,
+    47, 47, 47, 47, 47, 188, 188, 115, 115, 115, 189, 189, 376, 262, 115,
+    115, 115, 115, 115, -1, 376, -1, 309, 188, 188, 106, 106, 176, 189,
+    189, 188, 188, 188, 188, 188, 189, 189, 189, 189, 189, 254, 176, 176,
+    106, 106, -1, -1, 254, 306, 376, 106, 106, 106, 106, 106, 306, 90, 94,
+    254, 176, 176, 309, -1, 96, 90, 94, 306, 295, 176, 176, 176, 96, -1,
+    100, 120, 254, 295, 247, 271, 330, 254, 100, 120, 306, 125, -1, 271,
+    150, -1, -1, 90, 94, 125, 90, 94, 90, 94, 96, 127, 180, 96, -1, 96,
+    201, 357, -1, 127, 100, 120, 129, 100, 120, 100, 120, 247, 330, 202,
+    129, 125, 330, 358, 125, 150, 125, 330, 330, 370, 150, -1, 279, 300,
+    314, 127, 150, 180, 127, 316, 127, 201, 180, 357, 368, 201, 129, 357,
+    342, 129, 389, 129, 357, 357, 202, 373, 342, 378, 202, 358, -1, -1, -1,
+    -1, 373, 370, 378, -1, 358, 279, 300, 314, -1, -1, 370, -1, 316, -1,
+    -1, -1, -1, 368, -1, -1, -1, -1, -1, 389, -1, -1, -1, -1, -1, -1, -1,
+    -1, -1, -1,
+)
+NEXT = (
+    187, 28, 70, 41, 45, 52, 45, 45, 45, 45, 45, 45, 45, 46, 188, 189, 45,
+    45, 45, 45, 45, 42, 45, 45, 45, 45, 48, 45, 45, 45, 45, 103, 111, 108,
+    53, 29, 213, 151, 104, 107, 109, 111, 111, 111, 218, 221, 221, 221,
+    220, 105, 220, 220, 220, 220, 220, 220, 220, 220, 220, 220, 220, 220,
+    220, 220, 220, 381, 220, 220, 220, 220, 220, 220, 220, 220, 220, 153,
+    289, 295, 152, 219, 290, 50, 290, 290, 290, 290, 290, 290, 290, 290,
+    290, 290, 290, 290, 290, 290, 290, 104, 290, 290, 290, 290, 290, 290,
+    290, 290, 290, 305, 105, 51, 294, 29, 293, 342, 99, 212, 291, 32, 304,
+    323, 4, 294, 292, 328, 213, 328, 328, 328, 328, 328, 328, 328, 328,
+    328, 328, 328, 328, 328, 328, 328, 33, 328, 328, 328, 328, 328, 328,
+    328, 328, 328, 343, 92, 135, 93, 133, 326, 124, 216, 177, 324, 90, 248,
+    329, 217, 327, 325, 290, 94, 290, 290, 290, 290, 290, 290, 290, 290,
+    290, 290, 290, 290, 290, 290, 290, 70, 290, 290, 290, 290, 290, 290,
+    290, 290, 290, 122, 91, 123, 247, 92, 293, 93, 97, 95, 291, 96, 92,
+    351, 93, 294, 292, 328, 100, 328, 328, 328, 328, 328, 328, 328, 328,
+    328, 328, 328, 328, 328, 328, 328, 23, 328, 328, 328, 328, 328, 328,
+    328, 328, 328, 22, 97, 22, 173, 92, 326, 93, 79, 101, 324, 104, 92, 81,
+    93, 327, 325, 34, 38, 38, 38, 39, 105, 39, 39, 39, 39, 39, 40, 39, 39,
+    39, 39, 39, 39, 39, 39, 39, 224, 36, 39, 39, 35, 37, 39, 39, 39, 39,
+    82, 80, 3, 87, 83, 120, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83,
+    83, 83, 83, 60, 83, 83, 83, 83, 83, 83, 83, 83, 83, 362, 225, 169, 169,
+    84, 230, 61, 125, 121, 85, 149, 122, 88, 123, 83, 86, 83, 83, 83, 83,
+    83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 84, 83, 83, 83, 83, 83, 83,
+    83, 83, 83, 126, 86, 232, 122, 84, 123, 29, 66, 231, 85, 156, 158, 158,
+    158, 157, 86, 157, 157, 157, 157, 157, 157, 157, 157, 157, 157, 157,
+    157, 157, 157, 157, 67, 157, 157, 157, 157, 157, 157, 157, 157, 157, 7,
+    38, 38, 38, 39, 222, 39, 39, 39, 39, 39, 40, 39, 39, 39, 39, 39, 39,
+    39, 39, 39, 33, 36, 39, 39, 35, 37, 39, 39, 39, 39, 182, 177, 177, 177,
+    183, 233, 183, 183, 183, 183, 183, 183, 183, 183, 183, 183, 183, 183,
+    183, 183, 183, 223, 183, 183, 183, 183, 183, 183, 183, 183, 183, 235,
+    158, 158, 158, 157, 89, 157, 157, 157, 157, 157, 157, 157, 157, 157,
+    157, 157, 157, 157, 157, 157, 234, 157, 157, 157, 157, 157, 157, 157,
+    157, 157, 221, 221, 221, 220, 68, 220, 220, 220, 220, 220, 220, 220,
+    220, 220, 220, 220, 220, 220, 220, 220, 42, 220, 220, 220, 220, 220,
+    220, 220, 220, 220, 366, 69, 203, 203, 219, 308, 310, 310, 310, 309,
+    359, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309,
+    309, 309, 102, 309, 309, 309, 309, 309, 309, 309, 309, 309, 321, 221,
+    221, 221, 220, 361, 220, 220, 220, 220, 220, 220, 220, 220, 220, 220,
+    220, 220, 220, 220, 220, 358, 220, 220, 220, 220, 220, 220, 220, 220,
+    220, 350, 221, 221, 221, 220, 360, 220, 220, 220, 220, 220, 220, 220,
+    220, 220, 220, 220, 220, 220, 220, 220, 51, 220, 220, 220, 220, 220,
+    220, 220, 220, 220, 259, 310, 310, 310, 309, 319, 309, 309, 309, 309,
+    309, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309, 260, 309, 309,
+    309, 309, 309, 309, 309, 309, 309, 38, 38, 38, 39, 320, 39, 39, 39, 39,
+    39, 40, 39, 39, 39, 39, 39, 39, 39, 39, 39, 118, 36, 39, 39, 35, 37,
+    39, 39, 39, 39, 177, 177, 177, 183, 259, 183, 183, 183, 183, 183, 183,
+    183, 183, 183, 183, 183, 183, 183, 183, 183, 53, 183, 183, 183, 183,
+    183, 183, 183, 183, 183, 158, 158, 158, 157, 369, 157, 157, 157, 157,
+    157, 157, 157, 157, 157, 157, 157, 157, 157, 157, 157, 119, 157, 157,
+    157, 157, 157, 157, 157, 157, 157, 302, 219, 246, 283, 171, 284, 171,
+    171, 171, 171, 171, 171, 171, 171, 171, 171, 171, 171, 171, 171, 171,
+    370, 171, 171, 171, 171, 171, 171, 171, 171, 171, 127, 150, 25, 317,
+    247, 26, 247, 201, 97, 201, 201, 201, 201, 201, 201, 201, 201, 201,
+    201, 201, 201, 201, 201, 201, 236, 201, 201, 201, 201, 201, 201, 201,
+    201, 201, 128, 61, 84, 122, 199, 123, 98, 85, 130, 310, 310, 310, 309,
+    86, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309, 309,
+    309, 309, 237, 309, 309, 309, 309, 309, 309, 309, 309, 309, 221, 221,
+    221, 220, 92, 220, 220, 220, 220, 220, 220, 220, 220, 220, 220, 220,
+    220, 220, 220, 220, 131, 220, 220, 220, 220, 220, 220, 220, 220, 220,
+    44, 136, 153, 137, 45, 152, 45, 45, 45, 45, 45, 45, 45, 46, 45, 45, 45,
+    45, 47, 45, 45, 334, 45, 45, 45, 45, 48, 45, 45, 45, 45, 76, 141, 255,
+    49, 77, 129, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77,
+    77, 256, 77, 77, 77, 77, 77, 77, 77, 77, 77, 178, 177, 294, 63, 142,
+    134, 249, 330, 130, 140, 139, 122, 228, 123, 77, 78, 77, 77, 77, 77,
+    77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 148, 77, 77, 77, 77, 77,
+    77, 77, 77, 77, 247, 135, 293, 133, 97, 160, 291, 147, 252, 229, 170,
+    294, 292, 161, 171, 78, 171, 171, 171, 171, 171, 171, 172, 171, 171,
+    171, 171, 171, 171, 171, 171, 355, 171, 171, 171, 171, 171, 171, 171,
+    171, 171, 200, 92, 253, 93, 201, 169, 201, 201, 201, 201, 201, 201,
+    202, 201, 201, 201, 201, 201, 201, 201, 201, 371, 201, 201, 201, 201,
+    201, 201, 201, 201, 201, 367, 207, 327, 208, 368, 203, 368, 368, 368,
+    368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 372, 368,
+    368, 368, 368, 368, 368, 368, 368, 368, 30, 214, 132, 137, 31, 223, 31,
+    31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 67, 31, 31, 31,
+    31, 31, 31, 31, 31, 31, 54, 247, 69, 250, 56, 97, 56, 56, 56, 56, 56,
+    57, 56, 56, 56, 56, 56, 56, 56, 56, 56, 105, 55, 56, 56, 58, 59, 56,
+    56, 56, 56, 64, 169, 169, 333, 65, 334, 65, 65, 65, 65, 65, 65, 65, 65,
+    65, 65, 65, 65, 65, 65, 65, 242, 65, 65, 65, 65, 65, 65, 65, 65, 65,
+    45, 138, 45, 45, 45, 45, 45, 45, 45, 46, 45, 45, 45, 45, 47, 45, 45,
+    294, 45, 45, 45, 45, 48, 45, 45, 45, 45, 117, 265, 97, 49, 45, 70, 45,
+    45, 45, 45, 45, 45, 45, 46, 45, 45, 45, 45, 47, 45, 45, 70, 45, 45, 45,
+    45, 48, 45, 45, 45, 45, 144, 274, 70, 363, 145, 176, 145, 145, 145,
+    145, 145, 145, 145, 145, 145, 145, 145, 145, 145, 145, 145, 304, 145,
+    145, 145, 145, 145, 145, 145, 145, 145, 154, 296, 203, 203, 83, 199,
+    83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 83, 3, 83, 83,
+    83, 83, 83, 83, 83, 83, 83, 162, 306, 88, 92, 163, 84, 163, 163, 163,
+    163, 163, 163, 163, 163, 163, 163, 163, 163, 163, 163, 163, 174, 163,
+    163, 163, 163, 163, 163, 163, 163, 163, 164, 219, 8, 283, 165, 253,
+    165, 165, 165, 165, 165, 165, 165, 165, 165, 165, 165, 165, 165, 165,
+    165, 181, 165, 165, 165, 165, 165, 165, 165, 165, 165, 166, 199, 184,
+    215, 167, 130, 167, 167, 167, 167, 167, 167, 167, 167, 167, 167, 167,
+    167, 167, 167, 167, 142, 167, 167, 167, 167, 167, 167, 167, 167, 167,
+    168, 365, 226, 374, 169, 375, 169, 169, 169, 169, 169, 169, 169, 169,
+    169, 169, 169, 169, 169, 169, 169, 227, 169, 169, 169, 169, 169, 169,
+    169, 169, 169, 175, 379, 147, 380, 176, 177, 176, 176, 176, 176, 176,
+    176, 176, 176, 176, 176, 176, 176, 176, 176, 176, 240, 176, 176, 176,
+    176, 176, 176, 176, 176, 176, 179, 161, 241, 243, 180, 177, 180, 180,
+    180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 186,
+    180, 180, 180, 180, 180, 180, 180, 180, 180, 190, 266, 267, 195, 191,
+    268, 191, 191, 191, 191, 191, 191, 191, 191, 191, 191, 191, 191, 191,
+    191, 191, 271, 191, 191, 191, 191, 191, 191, 191, 191, 191, 196, 208,
+    276, 277, 197, 137, 197, 197, 197, 197, 197, 197, 197, 197, 197, 197,
+    197, 197, 197, 197, 197, 217, 197, 197, 197, 197, 197, 197, 197, 197,
+    197, 12, 280, 281, 223, 56, 286, 56, 56, 56, 56, 56, 57, 56, 56, 56,
+    56, 56, 56, 56, 56, 56, 225, 55, 56, 56, 58, 59, 56, 56, 56, 56, 198,
+    229, 234, 237, 199, 238, 199, 199, 199, 199, 199, 199, 199, 199, 199,
+    199, 199, 199, 199, 199, 199, 97, 199, 199, 199, 199, 199, 199, 199,
+    199, 199, 204, 244, 247, 105, 205, 256, 205, 205, 205, 205, 205, 205,
+    205, 205, 205, 205, 205, 205, 205, 205, 205, 258, 205, 205, 205, 205,
+    205, 205, 205, 205, 205, 206, 259, 176, 270, 203, 199, 203, 203, 203,
+    203, 203, 203, 203, 203, 203, 203, 203, 203, 203, 203, 203, 130, 203,
+    203, 203, 203, 203, 203, 203, 203, 203, 211, 84, 338, 339, 210, 312,
+    210, 210, 210, 210, 210, 210, 210, 210, 210, 210, 210, 210, 210, 210,
+    210, 135, 210, 210, 210, 210, 210, 210, 210, 210, 210, 15, 320, 349,
+    232, 65, 337, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65,
+    65, 239, 65, 65, 65, 65, 65, 65, 65, 65, 65, 77, 285, 77, 77, 77, 77,
+    77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 24, 77, 77, 77, 77, 77, 77,
+    77, 77, 77, 238, 341, 232, 122, 245, 194, 4, 25, 231, 219, 26, 283,
+    288, 195, 171, 78, 171, 171, 171, 171, 171, 171, 172, 171, 171, 171,
+    171, 171, 171, 171, 171, 348, 171, 171, 171, 171, 171, 171, 171, 171,
+    171, 261, 122, 244, 123, 262, 169, 262, 262, 262, 262, 262, 262, 262,
+    262, 262, 262, 262, 262, 262, 262, 262, 257, 262, 262, 262, 262, 262,
+    262, 262, 262, 262, 201, 4, 201, 201, 201, 201, 201, 201, 202, 201,
+    201, 201, 201, 201, 201, 201, 201, 358, 201, 201, 201, 201, 201, 201,
+    201, 201, 201, 297, 360, 258, 304, 158, 203, 158, 158, 158, 158, 158,
+    158, 158, 158, 158, 158, 158, 158, 158, 158, 158, 177, 158, 158, 158,
+    158, 158, 158, 158, 158, 158, 5, 370, 372, 375, 31, 380, 31, 31, 31,
+    31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 294, 31, 31, 31, 31,
+    31, 31, 31, 31, 31, 298, 383, 386, 327, 38, 377, 38, 38, 38, 38, 38,
+    38, 38, 38, 38, 38, 38, 38, 38, 38, 38, -1, 38, 38, 38, 38, 38, 38, 38,
+    38, 38, 299, -1, -1, -1, 300, -1, 300, 300, 300, 300, 300, 300, 300,
+    300, 300, 300, 300, 300, 300, 300, 300, -1, 300, 300, 300, 300, 300,
+    300, 300, 300, 300, 307, -1, -1, -1, 177, -1, 177, 177, 177, 177, 177,
+    177, 177, 177, 177, 177, 177, 177, 177, 177, 177, -1, 177, 177, 177,
+    177, 177, 177, 177, 177, 177, 313, -1, -1, -1, 314, -1, 314, 314, 314,
+    314, 314, 314, 314, 314, 314, 314, 314, 314, 314, 314, 314, -1, 314,
+    314, 314, 314, 314, 314, 314, 314, 314, 315, -1, -1, -1, 316, -1, 316,
+    316, 316, 316, 316, 316, 316, 316, 316, 316, 316, 316, 316, 316, 316,
+    -1, 316, 316, 316, 316, 316, 316, 316, 316, 316, 322, -1, -1, -1, 221,
+    -1, 221, 221, 221, 221, 221, 221, 221, 221, 221, 221, 221, 221, 221,
+    221, 221, -1, 221, 221, 221, 221, 221, 221, 221, 221, 221, 331, -1, -1,
+    -1, 290, -1, 290, 290, 290, 290, 290, 290, 290, 290, 290, 290, 290,
+    290, 290, 290, 290, -1, 290, 290, 290, 290, 290, 290, 290, 290, 290,
+    344, -1, -1, -1, 345, -1, 345, 345, 345, 345, 345, 345, 345, 345, 345,
+    345, 345, 345, 345, 345, 345, -1, 345, 345, 345, 345, 345, 345, 345,
+    345, 345, 352, -1, -1, -1, 328, -1, 328, 328, 328, 328, 328, 328, 328,
+    328, 328, 328, 328, 328, 328, 328, 328, -1, 328, 328, 328, 328, 328,
+    328, 328, 328, 328, 364, -1, -1, 354, 310, 355, 310, 310, 310, 310,
+    310, 310, 310, 310, 310, 310, 310, 310, 310, 310, 310, 269, 310, 310,
+    310, 310, 310, 310, 310, 310, 310, 368, -1, 368, 368, 368, 368, 368,
+    368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 327, 368, 368, 368,
+    368, 368, 368, 368, 368, 368, 384, -1, 270, -1, 368, 223, 368, 368,
+    368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368, -1,
+    368, 368, 368, 368, 368, 368, 368, 368, 368, 387, -1, -1, -1, 368, -1,
+    368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368, 368,
+    368, -1, 368, 368, 368, 368, 368, 368, 368, 368, 368, 388, -1, -1, -1,
+    389, -1, 389, 389, 389, 389, 389, 389, 389, 389, 389, 389, 389, 389,
+    389, 389, 389, 335, 389, 389, 389, 389, 389, 389, 389, 389, 389, 31,
+    -1, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 31, 356,
+    31, 31, 31, 31, 31, 31, 31, 31, 31, 56, 232, 56, 56, 56, 56, 56, 57,
+    56, 56, 56, 56, 56, 56, 56, 56, 56, -1, 55, 56, 56, 58, 59, 56, 56, 56,
+    56, 65, 4, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65, 65,
+    -1, 65, 65, 65, 65, 65, 65, 65, 65, 65, 45, -1, 45, 45, 45, 45, 45, 45,
+    45, 46, 45, 45, 45, 45, 47, 45, 45, -1, 45, 45, 45, 45, 48, 45, 45, 45,
+    45, 77, -1, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77,
+    -1, 77, 77, 77, 77, 77, 77, 77, 77, 77, 145, -1, 145, 145, 145, 145,
+    145, 145, 145, 145, 145, 145, 145, 145, 145, 145, 145, -1, 145, 145,
+    145, 145, 145, 145, 145, 145, 145, 83, -1, 83, 83, 83, 83, 83, 83, 83,
+    83, 83, 83, 83, 83, 83, 83, 83, -1, 83, 83, 83, 83, 83, 83, 83, 83, 83,
+    163, -1, 163, 163, 163, 163, 163, 163, 163, 163, 163, 163, 163, 163,
+    163, 163, 163, -1, 163, 163, 163, 163, 163, 163, 163, 163, 163, 165,
+    -1, 165, 165, 165, 165, 165, 165, 165, 165, 165, 165, 165, 165, 165,
+    165, 165, -1, 165, 165, 165, 165, 165, 165, 165, 165, 165, 167, -1,
+    167, 167, 167, 167, 167, 167, 167, 167, 167, 167, 167, 167, 167, 167,
+    167, -1, 167, 167, 167, 167, 167, 167, 167, 167, 167, 169, -1, 169,
+    169, 169, 169, 169, 169, 169, 169, 169, 169, 169, 169, 169, 169, 169,
+    -1, 169, 169, 169, 169, 169, 169, 169, 169, 169, 176, -1, 176, 176,
+    176, 176, 176, 176, 176, 176, 176, 176, 176, 176, 176, 176, 176, -1,
+    176, 176, 176, 176, 176, 176, 176, 176, 176, 180, -1, 180, 180, 180,
+    180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, -1, 180,
+    180, 180, 180, 180, 180, 180, 180, 180, 45, -1, 45, 45, 45, 45, 45, 45,
+    45, 46, 45, 45, 45, 45, 45, 45, 45, -1, 45, 45, 45, 45, 48, 45, 45, 45,
+    45, 191, -1, 191, 191, 191, 191, 191, 191, 191, 191, 191, 191, 191,
+    191, 191, 191, 191, -1, 191, 191, 191, 191, 191, 191, 191, 191, 191,
+    197, -1, 197, 197, 197, 197, 197, 197, 197, 197, 197, 197, 197, 197,
+    197, 197, 197, -1, 197, 197, 197, 197, 197, 197, 197, 197, 197, 199,
+    -1, 199, 199, 199, 199, 199, 199, 199, 199, 199, 199, 199, 199, 199,
+    199, 199, -1, 199, 199, 199, 199, 199, 199, 199, 199, 199, 205, -1,
+    205, 205, 205, 205, 205, 205, 205, 205, 205, 205, 205, 205, 205, 205,
+    205, -1, 205, 205, 205, 205, 205, 205, 205, 205, 205, 203, -1, 203,
+    203, 203, 203, 203, 203, 203, 203, 203, 203, 203, 203, 203, 203, 203,
+    -1, 203, 203, 203, 203, 203, 203, 203, 203, 203, 210, -1, 210, 210,
+    210, 210, 210, 210, 210, 210, 210, 210, 210, 210, 210, 210, 210, -1,
+    210, 210, 210, 210, 210, 210, 210, 210, 210, 262, -1, 262, 262, 262,
+    262, 262, 262, 262, 262, 262, 262, 262, 262, 262, 262, 262, -1, 262,
+    262, 262, 262, 262, 262, 262, 262, 262, 158, -1, 158, 158, 158, 158,
+    158, 158, 158, 158, 158, 158, 158, 158, 158, 158, 158, -1, 158, 158,
+    158, 158, 158, 158, 158, 158, 158, 38, -1, 38, 38, 38, 38, 38, 38, 38,
+    38, 38, 38, 38, 38, 38, 38, 38, -1, 38, 38, 38, 38, 38, 38, 38, 38, 38,
+    300, -1, 300, 300, 300, 300, 300, 300, 300, 300, 300, 300, 300, 300,
+    300, 300, 300, -1, 300, 300, 300, 300, 300, 300, 300, 300, 300, 171,
+    -1, 171, 171, 171, 171, 171, 171, 171, 171, 171, 171, 171, 171, 171,
+    171, 171, -1, 171, 171, 171, 171, 171, 171, 171, 171, 171, 177, -1,
+    177, 177, 177, 177, 177, 177, 177, 177, 177, 177, 177, 177, 177, 177,
+    177, -1, 177, 177, 177, 177, 177, 177, 177, 177, 177, 314, -1, 314,
+    314, 314, 314, 314, 314, 314, 314, 314, 314, 314, 314, 314, 314, 314,
+    -1, 314, 314, 314, 314, 314, 314, 314, 314, 314, 316, -1, 316, 316,
+    316, 316, 316, 316, 316, 316, 316, 316, 316, 316, 316, 316, 316, -1,
+    316, 316, 316, 316, 316, 316, 316, 316, 316, 201, -1, 201, 201, 201,
+    201, 201, 201, 201, 201, 201, 201, 201, 201, 201, 201, 201, -1, 201,
+    201, 201, 201, 201, 201, 201, 201, 201, 221, -1, 221, 221, 221, 221,
+    221, 221, 221, 221, 221, 221, 221, 221, 221, 221, 221, -1, 221, 221,
+    221, 221, 221, 221, 221, 221, 221, 290, -1, 290, 290, 290, 290, 290,
+    290, 290, 290, 290, 290, 290, 290, 290, 290, 290, -1, 290, 290, 290,
+    290, 290, 290, 290, 290, 290, 345, -1, 345, 345, 345, 345, 345, 345,
+    345, 345, 345, 345, 345, 345, 345, 345, 345, -1, 345, 345, 345, 345,
+    345, 345, 345, 345, 345, 328, -1, 328, 328, 328, 328, 328, 328, 328,
+    328, 328, 328, 328, 328, 328, 328, 328, -1, 328, 328, 328, 328, 328,
+    328, 328, 328, 328, 310, -1, 310, 310, 310, 310, 310, 310, 310, 310,
+    310, 310, 310, 310, 310, 310, 310, -1, 310, 310, 310, 310, 310, 310,
+    310, 310, 310, 368, -1, 368, 368, 368, 368, 368, 368, 368, 368, 368,
+    368, 368, 368, 368, 368, 368, 287, 368, 368, 368, 368, 368, 368, 368,
+    368, 368, 389, 282, 389, 389, 389, 389, 389, 389, 389, 389, 389, 389,
+    389, 389, 389, 389, 389, 115, 389, 389, 389, 389, 389, 389, 389, 389,
+    389, 160, 4, 185, -1, 112, 110, 385, 288, 161, 219, -1, 283, 212, 284,
+    357, 278, 112, 110, 293, 112, 110, 213, 111, 108, 116, 260, 279, 294,
+    292, 107, 109, 111, 111, 111, 111, 108, 186, 111, 108, 112, 110, 107,
+    109, 111, 111, 111, 111, 111, 111, 135, 326, 327, 135, -1, 324, 303,
+    255, 111, 108, 327, 325, 62, 305, 135, 107, 109, 111, 111, 111, 259,
+    112, 110, 106, 304, 326, 256, -1, 113, -1, -1, -1, -1, 63, 327, 325,
+    275, 112, 110, 111, 108, 253, 112, 110, 114, 160, 107, 109, 111, 111,
+    111, -1, -1, 161, -1, 111, 108, 311, 112, 110, 111, 108, 107, 109, 111,
+    111, 111, 107, 109, 111, 111, 111, 112, 110, 263, 130, 111, 108, -1,
+    264, -1, -1, 92, 107, 109, 111, 111, 111, 112, 110, 111, 108, 116, 112,
+    110, 382, 312, 107, 109, 111, 111, 111, -1, 383, -1, 340, 111, 108,
+    112, 110, 251, 111, 108, 107, 109, 111, 111, 111, 107, 109, 111, 111,
+    111, 303, 112, 110, 111, 108, -1, -1, 305, 252, 377, 107, 109, 111,
+    111, 111, 305, 160, 160, 304, 111, 108, 341, -1, 160, 161, 161, 304,
+    29, 111, 111, 111, 161, -1, 160, 194, 253, 4, 301, 194, 329, 109, 161,
+    195, 253, 194, -1, 195, 149, -1, -1, 91, 95, 195, 92, 92, 93, 93, 97,
+    194, 254, 92, -1, 93, 272, 351, -1, 195, 101, 121, 194, 92, 122, 93,
+    123, 92, 293, 273, 195, 126, 291, 373, 122, 84, 123, 294, 292, 378, 85,
+    -1, 318, 336, 346, 128, 86, 253, 122, 347, 123, 199, 109, 326, 376,
+    130, 130, 324, 343, 122, 390, 123, 327, 325, 199, 293, 177, 326, 130,
+    293, -1, -1, -1, -1, 294, 326, 327, -1, 294, 135, 337, 122, -1, -1,
+    327, -1, 348, -1, -1, -1, -1, 377, -1, -1, -1, -1, -1, 377, -1, -1, -1,
+    -1, -1, -1, -1, -1, -1, -1,
+)
+CALLS = {
+    0: ((1, 18), (2, 19), (6, 20), (11, 21)),
+    3: ((4, 27),),
+    7: ((8, 38),),
+    8: ((4, 43), (9, 43)),
+    18: ((1, 18), (2, 19), (6, 20), (10, 0), (11, 21)),
+    19: ((1, 18), (2, 19), (6, 20), (10, 0), (11, 21)),
+    20: ((13, 71), (14, 72), (16, 73), (17, 0)),
+    21: ((1, 18), (2, 19), (6, 20), (10, 0), (11, 21), (13, 19), (14, 74), (16, 75)),
+    71: ((17, 0),),
+    72: ((13, 71), (16, 73), (17, 0)),
+    73: ((13, 71), (17, 0)),
+    74: ((1, 18), (2, 19), (6, 20), (10, 0), (11, 21), (13, 19), (16, 75)),
+    75: ((1, 18), (2, 19), (6, 20), (10, 0), (11, 21), (13, 19)),
+    78: ((0, 143),),
+    79: ((3, 146),),
+    86: ((5, 155),),
+    89: ((7, 159),),
+    92: ((8, 38),),
+    102: ((4, 43),),
+    118: ((8, 192),),
+    119: ((12, 193),),
+    132: ((15, 209),),
+    174: ((4, 43), (9, 43)),
+    225: ((4, 146),),
+    227: ((3, 146),),
+    292: ((5, 332),),
+    325: ((5, 353),),
+    338: ((9, 177),),
+    339: ((9, 177),),
+}
+FINAL = (
+    18, 20, 27, 35, 36, 37, 38, 39, 40, 43, 55, 56, 57, 58, 59, 65, 70, 71,
+    72, 73, 84, 137, 138, 146, 158, 159, 177, 180, 192, 193, 208, 209, 210,
+    213, 215, 219, 223, 226, 240, 247, 253, 256, 266, 267, 276, 277, 279,
+    280, 281, 286, 306, 314, 368, 376, 389, 390,
+)
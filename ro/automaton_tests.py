@@ -0,0 +1,69 @@
+import unittest
+from ro import automaton_tables, cases, grammar
+from ro.automaton import (Compiler, Recognizer, accepts, benchmark,
+                          first_error)
+from ro.fuzz import QueryGenerator, differential, parses
+
+
+def nested(depth):
+    return "MATCH (n) WHERE %s%s RETURN n" % (
+        " AND ".join(["(n.a = 1"] * depth), ")" * depth)
+
+
+class AutomatonTests(unittest.TestCase):
+
+    def test_tables_current(self):
+        tables = Compiler().tables()
+        for name, value in tables.items():
+            self.assertEqual(getattr(automaton_tables, name), value,
+                             "%s is stale, run python -m ro.automaton --emit"
+                             % name)
+
+    def test_cases(self):
+        verdict = parses(grammar.query)
+        for case in cases.load_all():
+            if case.production == "query":
+                self.assertEqual(accepts(case.query), verdict(case.query),
+                                 case.name)
+
+    def test_differential(self):
+        corpus = QueryGenerator(seed=2).corpus(300, invalid=0.3)
+        disagreements = list(differential(corpus, {
+            "automaton": accepts, "pyparsing": parses(grammar.query)}))
+        self.assertEqual(disagreements, [])
+
+    def test_first_error(self):
+        self.assertIsNone(first_error("MATCH (n:Person) RETURN n\t"))
+        self.assertEqual(first_error("MATCH (n) DELETE n"), 10)
+        self.assertEqual(first_error("MATCH (n) RETURN"), 16)
+        self.assertEqual(first_error("MATCH (n)"), 9)
+
+    def test_lexical(self):
+        self.assertTrue(accepts("match (n) return n order by n.x desc"))
+        self.assertTrue(accepts("MATCH (`MATCH`) RETURN `RETURN`"))
+        self.assertFalse(accepts("MATCH (n) RETURN n ORDER  BY n.x"))
+        self.assertFalse(accepts("MATCH (n) RETURN ( ORDER BY )"))
+        self.assertFalse(accepts("RETURN 42SKIP 1"))
+        self.assertFalse(accepts("MATCH (n) RETURN $n"))
+
+    def test_ordered_choice(self):
+        # Pyparsing commits to (m:L as a label comparison, the tables do not.
+        q = "MATCH (a)-->(b) WHERE a.p = 1 AND (m:L)<--(x) RETURN a"
+        self.assertFalse(parses(grammar.query)(q))
+        self.assertTrue(accepts(q))
+
+    def test_depth(self):
+        self.assertTrue(accepts(nested(60)))
+        shallow = Recognizer(automaton_tables, max_depth=10)
+        self.assertTrue(shallow.accepts(nested(5)))
+        self.assertFalse(shallow.accepts(nested(20)))
+
+    def test_benchmark(self):
+        report = benchmark(20)
+        self.assertEqual(sorted(report), ["automaton", "lexer", "pyparsing"])
+        for stats in report.values():
+            self.assertEqual(stats["queries"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
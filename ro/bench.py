@@ -0,0 +1,253 @@
+"""
+Per-production micro-benchmarks over the table driven cases in ``ro/cases``.
+
+Every case is parsed ``repeat`` times with the production it names and the
+best time is kept, so each grammar feature with a case gets a timing for free.
+
+``--memory`` measures the validation path on a large generated query:
+``validate`` as it runs, with the ``spans`` lexer in front of the parse, the
+same without the lexer, and both again on the query with a stray ``;``
+appended, which the lexer rejects. The lexer only pays off on such
+rejections. An accepted query is lexed and then parsed, allocating every
+parse token as before, and the lexer's time and buffer come on top.
+
+``--grammar`` reports what importing the hooked grammar costs every process
+that validates, against ``GRAMMAR_TARGET``.
+
+``--threads`` validates a generated corpus on up to that many threads at
+once, checking every verdict against a single threaded run, and reports the
+throughput for each thread count. Scaling is only near linear on a free
+threaded interpreter (3.13t), with the GIL the threads take turns.
+
+    python -m ro.bench [-n REPEAT] [PRODUCTION ...]
+    python -m ro.bench --memory CLAUSES
+    python -m ro.bench --grammar
+    python -m ro.bench --threads THREADS [--queries QUERIES]
+"""
+import argparse
+import collections
+import gc
+import os
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+from pyparsing import ParseBaseException
+
+from . import cases
+from .fuzz import QueryGenerator
+from .grammar import parse, query
+from .validator import collect, validate
+
+
+def time_case(case, repeat=20):
+    """Best of ``repeat`` parse times for ``case``, in seconds."""
+    element = cases.element(case.production)
+    q = case.query
+    timer = time.perf_counter
+    best = None
+    for _ in range(repeat):
+        start = timer()
+        try:
+            parse(q, element)
+        except ParseBaseException:
+            pass
+        elapsed = timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run(case_list, repeat=20):
+    """
+    Time every case and return ``{production: (cases, mean, worst)}`` with
+    times in microseconds.
+    """
+    timings = collections.defaultdict(list)
+    for case in case_list:
+        timings[case.production].append(time_case(case, repeat) * 1e6)
+    return dict((production, (len(times), sum(times) / len(times),
+                              max(times)))
+                for production, times in timings.items())
+
+
+def large_query(clauses):
+    """A valid query with ``clauses`` MATCH/WHERE pairs, about 90 bytes each."""
+    parts = []
+    for i in range(clauses):
+        parts.append("MATCH (n%d:Person {name: 'person %d', age: %d})"
+                     "-[:KNOWS]->(m%d) WHERE m%d.age > %d" % (i, i, i, i, i, i))
+    parts.append("RETURN n0")
+    return " ".join(parts)
+
+
+def footprint(fn, *args):
+    """
+    Return ``(retained_bytes, retained_blocks, peak_bytes, seconds)`` for the
+    call ``fn(*args)``, counting what its result still holds on to. The time
+    is the best of three calls without tracing, which also warm any caches.
+    """
+    seconds = None
+    for _ in range(3):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        gc.collect()  # Garbage cycles the call left are not retained.
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    del result
+    return current, blocks, peak, seconds
+
+
+def _unlexed(q):
+    # validate() as it was before the spans lexer screened queries.
+    try:
+        collect(q, element=_UNLEXED)
+    except ParseBaseException:
+        return False
+    return True
+
+
+_UNLEXED = query.copy()
+
+
+def memory(q):
+    """
+    ``{name: footprint}`` of validating the query ``q``, and ``q`` with a
+    ``;`` appended, with and without the ``spans`` lexer in front.
+    """
+    bad = q + " ;"
+    return {"validate": footprint(validate, q),
+            "unlexed": footprint(_unlexed, q),
+            "validate;": footprint(validate, bad),
+            "unlexed;": footprint(_unlexed, bad)}
+
+
+# Bytes the grammar and its hooks may hold once imported.
+GRAMMAR_TARGET = 500000
+
+_GRAMMAR_FOOTPRINT = """
+import gc, tracemalloc, pyparsing
+before = len([o for o in gc.get_objects()
+              if isinstance(o, pyparsing.ParserElement)])
+tracemalloc.start()
+import ro.hooks
+gc.collect()
+elements = len([o for o in gc.get_objects()
+                if isinstance(o, pyparsing.ParserElement)]) - before
+print(tracemalloc.get_traced_memory()[0], elements)
+"""
+
+
+def grammar_footprint():
+    """
+    Return ``(retained_bytes, elements)`` for importing the grammar and its
+    hooks, measured in a fresh interpreter so nothing is imported already.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c",
+                                      _GRAMMAR_FOOTPRINT], cwd=root)
+    retained, elements = output.split()
+    return int(retained), int(elements)
+
+
+def free_threaded():
+    """Whether the interpreter runs threads without the GIL."""
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def stress(threads, count=2000, seed=0):
+    """
+    Validate ``count`` generated queries on every thread of 1, 2, 4 ... up to
+    ``threads`` threads at once. Returns ``{threads: (queries_per_second,
+    scaling)}``, scaling against one thread, and raises ``AssertionError`` if
+    any thread sees another verdict than a single threaded run.
+    """
+    queries = [q for q, _ in QueryGenerator(seed).corpus(count, invalid=0.3)]
+    expected = [validate(q) for q in queries]
+    counts = [1]
+    while counts[-1] * 2 < threads:
+        counts.append(counts[-1] * 2)
+    if threads > 1:
+        counts.append(threads)
+    report = {}
+    for n in counts:
+        barrier = threading.Barrier(n + 1)
+        wrong = []
+
+        def work():
+            barrier.wait()
+            verdicts = [validate(q) for q in queries]
+            if verdicts != expected:
+                wrong.append(verdicts)
+            barrier.wait()
+
+        workers = [threading.Thread(target=work) for _ in range(n)]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = time.perf_counter()
+        barrier.wait()
+        seconds = time.perf_counter() - start
+        for worker in workers:
+            worker.join()
+        if wrong:
+            raise AssertionError("a thread saw another verdict")
+        rate = n * count / seconds if seconds else 0.0
+        report[n] = (rate, rate / report[1][0] if n > 1 else 1.0)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ro.bench",
+        description="Time each grammar production over its test cases.")
+    parser.add_argument("productions", nargs="*")
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    parser.add_argument("--memory", type=int, metavar="CLAUSES")
+    parser.add_argument("--grammar", action="store_true")
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args(argv)
+    if args.threads:
+        print("free threaded: %s" % ("yes" if free_threaded() else "no"))
+        print("%-8s %12s %8s" % ("threads", "queries/s", "scaling"))
+        report = stress(args.threads, args.queries)
+        for n in sorted(report):
+            print("%-8d %12.0f %8.2f" % ((n,) + report[n]))
+        return
+    if args.grammar:
+        retained, elements = grammar_footprint()
+        print("grammar %d bytes, %d elements, target %d bytes" % (
+            retained, elements, GRAMMAR_TARGET))
+        return
+    if args.memory:
+        q = large_query(args.memory)
+        print("%d bytes, %d clauses" % (len(q), args.memory + 1))
+        print("%-10s %12s %10s %12s %8s" % ("path", "retained", "blocks",
+                                            "peak", "ms"))
+        for name, (retained, blocks, peak, seconds) in sorted(
+                memory(q).items()):
+            print("%-10s %12d %10d %12d %8.1f" % (name, retained, blocks,
+                                                  peak, seconds * 1e3))
+        return
+    case_list = [case for case in cases.load_all()
+                 if not args.productions or case.production in args.productions]
+    report = run(case_list, args.repeat)
+    print("%-20s %6s %10s %10s" % ("production", "cases", "mean_us",
+                                   "worst_us"))
+    for production in sorted(report):
+        count, mean, worst = report[production]
+        print("%-20s %6d %10.1f %10.1f" % (production, count, mean, worst))
+
+
+if __name__ == "__main__":
+    main()
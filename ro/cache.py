@@ -0,0 +1,154 @@
+"""
+Verdict cache shared by every worker process on a host.
+
+The cache is a fixed size open addressing hash table living in an mmap-ed
+file, so a verdict computed by one worker is immediately visible to the others
+and the table outlives worker recycling. Put the file on a tmpfs such as
+``/dev/shm`` to keep it off disk.
+
+Layout: a 32 byte header (magic, slot count, grammar version) followed by 16
+byte slots of ``(sequence, verdict, key)``. Writers serialize on an exclusive ``flock``, and
+on a thread lock too since ``flock`` does not exclude the threads of one
+process, and bump the slot sequence to an odd value while they write. Readers
+never lock: they read the sequence before and after the slot and treat an odd
+or changed sequence as a miss, so a torn read can never produce a wrong
+verdict.
+
+The file outlives deploys, so keys and the header carry the grammar version
+(see ``store.grammar_version``). The first process to open the file under a
+new version, or in an older layout, clears every slot. The file only ever
+grows, so processes still mapping the older layout never fault, and their
+keys cannot match the new ones.
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+
+MAGIC = b"cyphro\x00\x02"
+HEADER = struct.Struct("<8sQ16s")
+SLOT = struct.Struct("<IIQ")
+SEQ = struct.Struct("<I")
+PROBES = 8
+
+ACCEPTED = 1
+REJECTED = 2
+
+
+_version = []
+
+
+def version():
+    """The grammar version verdicts are computed under, 16 bytes."""
+    if not _version:
+        from .store import grammar_version
+        _version.append(bytes.fromhex(grammar_version())[:16])
+    return _version[0]
+
+
+def query_key(query, policy=None):
+    """64 bit non zero key for ``query`` under ``policy`` and the current
+    grammar version."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(version())
+    if policy is not None:
+        digest.update(policy.digest.encode("ascii"))
+    digest.update(b"\x00")
+    digest.update(query.encode("utf-8"))
+    return struct.unpack("<Q", digest.digest())[0] or 1
+
+
+class SharedVerdictCache(object):
+    """Cross-process verdict store backed by the mmap-ed file at ``path``."""
+
+    def __init__(self, path, slots=1 << 16):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(self._fd).st_size
+            magic, found, current = HEADER.unpack(
+                os.pread(self._fd, HEADER.size, 0).ljust(HEADER.size, b"\0"))
+            if size == 0 or (magic[:7] == MAGIC[:7] and
+                             (magic != MAGIC or current != version())):
+                size = self._reset(size, found if size else slots)
+            magic, self.slots, current = HEADER.unpack(
+                os.pread(self._fd, HEADER.size, 0))
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        if magic != MAGIC or size != HEADER.size + self.slots * SLOT.size:
+            os.close(self._fd)
+            raise ValueError("%s is not a verdict cache" % path)
+        self._map = mmap.mmap(self._fd, size)
+        self._lock = threading.Lock()
+
+    def _reset(self, size, slots):
+        # Clear the table in place for the current version, growing the file
+        # if needed but never shrinking it under another process's mapping.
+        new_size = HEADER.size + slots * SLOT.size
+        if size < new_size:
+            os.ftruncate(self._fd, new_size)
+        zeros = bytes(min(new_size, 1 << 20))
+        for offset in range(0, new_size, len(zeros)):
+            os.pwrite(self._fd, zeros[:new_size - offset], offset)
+        os.pwrite(self._fd, HEADER.pack(MAGIC, slots, version()), 0)
+        return max(size, new_size)
+
+    def _offsets(self, key):
+        home = key % self.slots
+        for probe in range(min(PROBES, self.slots)):
+            yield HEADER.size + ((home + probe) % self.slots) * SLOT.size
+
+    def get(self, key):
+        """Return ``True``/``False`` for a cached verdict, ``None`` on a miss."""
+        view = self._map
+        for offset in self._offsets(key):
+            seq, verdict, slot_key = SLOT.unpack_from(view, offset)
+            if seq & 1 or SEQ.unpack_from(view, offset)[0] != seq:
+                return None
+            if slot_key == key:
+                return verdict == ACCEPTED
+            if not slot_key:
+                return None
+        return None
+
+    def put(self, key, accepted):
+        """Store a verdict, evicting the home slot when the probe run is full."""
+        view = self._map
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                target = None
+                for offset in self._offsets(key):
+                    slot_key = SLOT.unpack_from(view, offset)[2]
+                    if slot_key == key or not slot_key:
+                        target = offset
+                        break
+                if target is None:
+                    target = next(self._offsets(key))
+                seq = SEQ.unpack_from(view, target)[0]
+                SEQ.pack_into(view, target, (seq + 1) & 0xffffffff)
+                SLOT.pack_into(view, target, (seq + 1) & 0xffffffff,
+                               ACCEPTED if accepted else REJECTED, key)
+                SEQ.pack_into(view, target, (seq + 2) & 0xffffffff)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def verdict(self, query, compute, policy=None):
+        """
+        Return the cached verdict for ``query``, calling ``compute(query)`` and
+        publishing its result to the other workers on a miss.
+        """
+        key = query_key(query, policy)
+        accepted = self.get(key)
+        if accepted is None:
+            accepted = bool(compute(query))
+            self.put(key, accepted)
+        return accepted
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
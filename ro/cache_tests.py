@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pyparsing import ParseException, stringEnd
+from ro import cache as verdict_cache
+from ro.cache import SharedVerdictCache, query_key
+from ro.grammar import match_stmt
+from ro.policy import Policy
+
+
+def _publish(path, query):
+    cache = SharedVerdictCache(path)
+    cache.put(query_key(query), True)
+    cache.close()
+
+
+class SharedVerdictCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "verdicts")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_get_put(self):
+        cache = SharedVerdictCache(self.path, slots=64)
+        key = query_key("MATCH (n)")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, True)
+        self.assertTrue(cache.get(key))
+        cache.put(key, False)
+        self.assertFalse(cache.get(key))
+        cache.close()
+
+    def test_policy_key(self):
+        self.assertNotEqual(query_key("MATCH (n)"),
+                            query_key("MATCH (n)", Policy(max_limit=10)))
+
+    def test_shared_between_processes(self):
+        SharedVerdictCache(self.path, slots=64).close()
+        worker = multiprocessing.Process(target=_publish,
+                                         args=(self.path, "MATCH (n)"))
+        worker.start()
+        worker.join()
+        cache = SharedVerdictCache(self.path)
+        self.assertEqual(cache.slots, 64)
+        self.assertTrue(cache.get(query_key("MATCH (n)")))
+        cache.close()
+
+    def test_full_table(self):
+        cache = SharedVerdictCache(self.path, slots=4)
+        keys = [query_key("MATCH (n%d)" % i) for i in range(32)]
+        for key in keys:
+            cache.put(key, True)
+        self.assertTrue(cache.get(keys[-1]))
+        self.assertTrue(all(cache.get(key) in (True, None) for key in keys))
+        cache.close()
+
+    def test_verdict(self):
+        element = match_stmt + stringEnd
+        calls = []
+
+        def compute(query):
+            calls.append(query)
+            try:
+                element.parseString(query)
+            except ParseException:
+                return False
+            return True
+
+        cache = SharedVerdictCache(self.path, slots=64)
+        self.assertTrue(cache.verdict("MATCH (n)", compute))
+        self.assertTrue(cache.verdict("MATCH (n)", compute))
+        self.assertFalse(cache.verdict("MATCH (n", compute))
+        self.assertEqual(calls, ["MATCH (n)", "MATCH (n"])
+        cache.close()
+
+    def test_threads(self):
+        cache = SharedVerdictCache(self.path, slots=256)
+        keys = [query_key("MATCH (n%d)" % i) for i in range(64)]
+
+        def publish(accepted):
+            for key in keys:
+                cache.put(key, accepted)
+
+        workers = [threading.Thread(target=publish, args=(i % 2 == 0,))
+                   for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertTrue(all(cache.get(key) in (True, False) for key in keys))
+        cache.close()
+
+    def test_version_change(self):
+        cache = SharedVerdictCache(self.path, slots=64)
+        cache.put(query_key("MATCH (n)"), True)
+        cache.close()
+        version = verdict_cache._version[:]
+        verdict_cache._version[:] = [b"\x01" * 16]
+        try:
+            cache = SharedVerdictCache(self.path)
+            self.assertEqual(cache.slots, 64)
+            self.assertIsNone(cache.get(query_key("MATCH (n)")))
+            cache.put(query_key("MATCH (n)"), False)
+            cache.close()
+        finally:
+            verdict_cache._version[:] = version
+        cache = SharedVerdictCache(self.path)
+        self.assertIsNone(cache.get(query_key("MATCH (n)")))
+        cache.close()
+
+    def test_older_layout(self):
+        with open(self.path, "wb") as f:
+            f.write(b"cyphro\x00\x01" + (64).to_bytes(8, "little"))
+            f.write(b"\xff" * 16 * 64)
+        cache = SharedVerdictCache(self.path)
+        self.assertEqual(cache.slots, 64)
+        self.assertIsNone(cache.get(query_key("MATCH (n)")))
+        cache.close()
+
+    def test_not_a_cache(self):
+        with open(self.path, "wb") as f:
+            f.write(b"x" * 64)
+        self.assertRaises(ValueError, SharedVerdictCache, self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
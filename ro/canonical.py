@@ -0,0 +1,156 @@
+"""
+Canonical serialization of parsed read queries.
+
+The minified form is built from the parse tokens alone, so two queries that
+differ only in whitespace or keyword case serialize identically:
+
+* Keywords come out in the case the grammar defines them, upper case for
+clauses and operators.
+
+* Whitespace tokens are dropped and a single space is put back only where the
+grammar requires one: after keywords, before keywords and between two words.
+
+* Property map entries are sorted by key. The sort is stable, so a repeated
+key keeps its last-wins meaning. The braces of a ``CALL`` subquery are not a
+map and keep their clauses in order.
+
+The pretty form puts each clause on its own line and a space after commas and
+colons. Both forms re-parse to the same tokens, ignoring whitespace.
+
+``shape`` is a lexical fingerprint that needs no parse at all: literals are
+replaced with ``?`` and whitespace is collapsed, so queries that differ only
+in their literal values share a shape.
+"""
+import re
+
+from .grammar import NUMBER, QUOTED_IDENTIFIER, STRING, parse
+
+
+KEYWORDS = frozenset(["MATCH", "OPTIONAL", "WHERE", "ORDER BY", "SKIP",
+    "LIMIT", "WITH", "AS", "AND", "OR", "XOR", "NOT", "RETURN", "DISTINCT",
+    "HAS", "IN", "IS", "NULL", "ASC", "DESC", "UNION", "ALL", "CALL",
+    "YIELD"])
+
+CLAUSE_KEYWORDS = frozenset(["MATCH", "OPTIONAL", "WHERE", "WITH",
+    "ORDER BY", "SKIP", "LIMIT", "RETURN", "UNION", "CALL"])
+
+
+
+def _significant(tokens):
+    return [t for t in tokens if t.strip()]
+
+
+def _sort_maps(tokens):
+    # Rewrites every {k: v, ...} in place with its entries sorted by key. An
+    # entry is everything between the top level commas of the map.
+    out = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        if token != "{" or i and tokens[i - 1] == "CALL":
+            out.append(token)
+            i += 1
+            continue
+        entries = [[]]
+        i += 1
+        while i < n and tokens[i] != "}":
+            if tokens[i] == ",":
+                entries.append([])
+            else:
+                entries[-1].append(tokens[i])
+            i += 1
+        entries.sort(key=lambda entry: entry[0] if entry else "")
+        out.append("{")
+        for j, entry in enumerate(entries):
+            if j:
+                out.append(",")
+            out.extend(entry)
+        out.append("}")
+        i += 1
+    return out
+
+
+def _word_char(c):
+    return c.isalnum() or c == "_"
+
+
+def _needs_space(previous, token):
+    if previous in KEYWORDS:
+        return True
+    if token in KEYWORDS:
+        return previous != "("
+    return _word_char(previous[-1]) and _word_char(token[0])
+
+
+def canonical_tokens(tokens):
+    """Significant tokens of a parse in canonical order."""
+    return _sort_maps(_significant(tokens))
+
+
+def minify_tokens(tokens):
+    """Minified form of already parsed ``tokens``."""
+    parts = []
+    previous = None
+    for token in canonical_tokens(tokens):
+        if previous is not None and _needs_space(previous, token):
+            parts.append(" ")
+        parts.append(token)
+        previous = token
+    return "".join(parts)
+
+
+def pretty_tokens(tokens):
+    """Pretty form of already parsed ``tokens``, one clause per line."""
+    parts = []
+    previous = None
+    in_map = False
+    for token in canonical_tokens(tokens):
+        if previous is not None:
+            if token in CLAUSE_KEYWORDS and previous != "OPTIONAL":
+                parts.append("\n")
+            elif (previous == "," or previous == ":" and in_map or
+                  token == "{" or _needs_space(previous, token)):
+                parts.append(" ")
+        parts.append(token)
+        if token in ("{", "}"):
+            in_map = token == "{" and previous != "CALL"
+        previous = token
+    return "".join(parts)
+
+
+def minify(q):
+    """Canonical minified form of the query ``q``."""
+    return minify_tokens(parse(q))
+
+
+def pretty(q):
+    """Canonical pretty form of the query ``q``."""
+    return pretty_tokens(parse(q))
+
+
+LITERAL = re.compile(r"%s|(?<![\w.])(?:%s)(?!\w)" % (STRING, NUMBER))
+# Backtick quoted identifiers are skipped whole, they may contain quotes.
+LEXEME = re.compile(r"(%s)|%s" % (QUOTED_IDENTIFIER, LITERAL.pattern))
+SPACE = re.compile(r"\s+")
+
+
+def shape(q):
+    """
+    Return ``(key, spans)`` for the query ``q``: the literal free shape key and
+    the ``(start, end)`` offsets of the literals it abstracts, in order.
+    """
+    parts = []
+    spans = []
+    last = 0
+    for found in LEXEME.finditer(q):
+        start, end = found.span()
+        parts.append(SPACE.sub(" ", q[last:start]))
+        if found.group(1):
+            parts.append(found.group(1))
+        else:
+            parts.append("?")
+            spans.append((start, end))
+        last = end
+    parts.append(SPACE.sub(" ", q[last:]))
+    return "".join(parts).strip(), spans
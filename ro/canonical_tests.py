@@ -0,0 +1,53 @@
+import unittest
+from ro.canonical import canonical_tokens, minify, pretty, shape
+from ro.fuzz import QueryGenerator
+from ro.grammar import query
+
+
+class CanonicalTests(unittest.TestCase):
+
+    def test_minify(self):
+        self.assertEqual(minify("match  (n:Person)\n return   n"),
+                         "MATCH (n:Person) RETURN n")
+        self.assertEqual(minify("MATCH (n) WHERE n.name = 'dave' and "
+                                "n.age <> 3 RETURN n.name as name, n"),
+                         "MATCH (n) WHERE n.name='dave' AND n.age<>3 "
+                         "RETURN n.name AS name,n")
+
+    def test_same_query(self):
+        self.assertEqual(
+            minify("MATCH (p {name: 'dave', age: 34}) RETURN count(DISTINCT p)"),
+            minify("MATCH (p{age:34,name:'dave'})  RETURN COUNT(distinct p)"))
+
+    def test_sorted_keys(self):
+        self.assertEqual(minify("MATCH (p {b: 1, a: 2, b: 3}) RETURN p"),
+                         "MATCH (p{a:2,b:1,b:3}) RETURN p")
+
+    def test_pretty(self):
+        self.assertEqual(pretty("MATCH (n {b: 1, a: 2}) OPTIONAL MATCH (n)-->(m) "
+                                "RETURN n, m ORDER BY n.a LIMIT 5"),
+                         "MATCH (n {a: 2, b: 1})\n"
+                         "OPTIONAL MATCH (n)-->(m)\n"
+                         "RETURN n, m\n"
+                         "ORDER BY n.a\n"
+                         "LIMIT 5")
+
+    def test_shape(self):
+        key, spans = shape("MATCH (p {name: 'it''s'})\n  RETURN p LIMIT 10")
+        self.assertEqual(key, "MATCH (p {name: ?}) RETURN p LIMIT ?")
+        self.assertEqual(spans, [(16, 23), (43, 45)])
+        self.assertEqual(shape('MATCH (p {name: "x"}) RETURN p LIMIT 3')[0],
+                         key)
+
+    def test_reparse(self):
+        for q, _ in QueryGenerator(seed=5).corpus(200):
+            expected = canonical_tokens(query.parseString(q))
+            m = minify(q)
+            self.assertEqual(canonical_tokens(query.parseString(m)), expected)
+            self.assertEqual(minify(m), m)
+            p = pretty(q)
+            self.assertEqual(canonical_tokens(query.parseString(p)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Loader for the table driven grammar cases in ``ro/cases``.
+
+Each ``.tsv`` file holds one case per line as tab separated columns:
+
+* ``production``: name of the grammar element, parsed up to the string end.
+
+* ``expected``: ``accept``, ``reject``, or ``exact`` for an accepted query
+whose tokens join back to the input unchanged.
+
+* ``name``: short name used in failure messages and benchmark reports.
+
+* ``query``: the input text.
+
+Blank lines and lines starting with ``#`` are ignored. The same cases drive
+the correctness tests in ``cases_tests`` and the ``bench`` micro-benchmarks.
+"""
+import collections
+import glob
+import os
+
+from pyparsing import ParseBaseException, stringEnd
+
+from . import grammar
+
+
+CASES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cases")
+
+EXPECTED = ("accept", "reject", "exact")
+
+Case = collections.namedtuple("Case",
+    "production expected name query source line")
+
+
+def load(path):
+    """Return the cases in the file at ``path``."""
+    cases = []
+    with open(path) as f:
+        for line, text in enumerate(f, 1):
+            text = text.rstrip("\n")
+            if not text.strip() or text.startswith("#"):
+                continue
+            production, expected, name, q = text.split("\t", 3)
+            if expected not in EXPECTED:
+                raise ValueError("%s:%d: unknown verdict %r" % (path, line,
+                                                                expected))
+            cases.append(Case(production, expected, name, q,
+                              os.path.basename(path), line))
+    return cases
+
+
+def files(directory=CASES_DIR):
+    return sorted(glob.glob(os.path.join(directory, "*.tsv")))
+
+
+def load_all(directory=CASES_DIR):
+    cases = []
+    for path in files(directory):
+        cases.extend(load(path))
+    return cases
+
+
+_elements = {}
+
+
+def element(production):
+    """The grammar element for ``production``, anchored at the string end."""
+    try:
+        return _elements[production]
+    except KeyError:
+        anchored = getattr(grammar, production) + stringEnd
+        _elements[production] = anchored
+        return anchored
+
+
+def run(case):
+    """Parse ``case`` and return ``None`` if it behaved as expected, otherwise
+    a description of what went wrong."""
+    try:
+        tokens = grammar.parse(case.query, element(case.production))
+    except ParseBaseException as e:
+        if case.expected == "reject":
+            return None
+        return "rejected: %s" % e
+    if case.expected == "reject":
+        return "accepted"
+    if case.expected == "exact" and "".join(tokens.asList()) != case.query:
+        return "tokens join to %r" % "".join(tokens.asList())
+    return None
@@ -0,0 +1,26 @@
+import os
+import unittest
+from ro import cases
+
+
+class GrammarCases(unittest.TestCase):
+    """One test per data file in ``ro/cases``, one subtest per case."""
+
+
+def _case_test(path):
+    def test(self):
+        for case in cases.load(path):
+            with self.subTest(case=case.name, line=case.line):
+                problem = cases.run(case)
+                self.assertIsNone(problem, "%s:%d %s %r: %s" % (case.source,
+                    case.line, case.production, case.query, problem))
+    return test
+
+
+for _path in cases.files():
+    _name = "test_" + os.path.splitext(os.path.basename(_path))[0]
+    setattr(GrammarCases, _name, _case_test(_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+Command line validator.
+
+Queries are read from files, from directories searched recursively for
+``.cypher`` and ``.cql`` files, or from standard input when no path (or
+``-``) is given. Files are split into statements on semicolons, standard
+input on newlines, unless ``--delimiter`` says otherwise. Semicolons inside
+strings and quoted identifiers do not split.
+
+Every statement produces one JSON line on standard output:
+
+    {"source": "q/a.cypher", "line": 3, "accepted": false, "error": "..."}
+
+Accepted statements also list the labels, relationship types, property keys
+and functions they use. ``--quiet`` prints rejected statements only, and
+``--stats`` prints throughput to standard error at the end.
+
+With ``--log`` the paths are Neo4j ``query.log`` files instead (see
+``querylog``), and the output is one JSON line per user and per query
+fingerprint, rejected fingerprints first.
+
+The exit status is 0 if every statement was accepted, 1 if any was rejected
+and 2 on usage or read errors, so the command works as a pre-commit hook.
+
+    python -m ro [-j PROCESSES] [--policy FILE] [PATH ...]
+    python -m ro --log [-j PROCESSES] [--policy FILE] [LOG ...]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from . import spans
+from .policy import Policy
+from .querylog import LogScanner
+from .validator import summary, validate
+
+
+EXTENSIONS = (".cypher", ".cql")
+
+OK, REJECTED, ERROR = 0, 1, 2
+
+
+def statements(text, delimiter="semicolon"):
+    """
+    Yield ``(line, statement)`` for the non-blank statements in ``text``,
+    ``line`` being the 1-based line the statement starts on.
+    """
+    if delimiter == "newline":
+        for line, statement in enumerate(text.split("\n"), 1):
+            if statement.strip():
+                yield line, statement.strip()
+        return
+    buf = spans.scan(text)
+    line = 1
+    last = 0
+    for kind, start, end in buf:
+        if kind == spans.ERROR and text[start] == ";":
+            statement = text[last:start]
+            if statement.strip():
+                yield _first_line(line, statement), statement.strip()
+            line += statement.count("\n")
+            last = end
+    statement = text[last:]
+    if statement.strip():
+        yield _first_line(line, statement), statement.strip()
+
+
+def _first_line(line, statement):
+    # Leading blank lines belong to the gap before the statement.
+    return line + statement[:len(statement) - len(statement.lstrip())].count(
+        "\n")
+
+
+def paths(names, extensions=EXTENSIONS):
+    """Expand directories in ``names`` to the query files below them."""
+    for name in names:
+        if not os.path.isdir(name):
+            yield name
+            continue
+        for root, dirs, files in os.walk(name):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.endswith(extensions):
+                    yield os.path.join(root, filename)
+
+
+_policy = None
+
+
+def _init(policy):
+    global _policy
+    _policy = policy
+
+
+def check(item):
+    """Validate one ``(source, line, statement)`` item into a result dict."""
+    source, line, statement = item
+    result = summary(validate(statement, _policy))
+    result["source"] = source
+    result["line"] = line
+    if not result["accepted"]:
+        result["query"] = statement
+    return result
+
+
+def main(argv=None, stdin=None, stdout=None, stderr=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    parser = argparse.ArgumentParser(prog="python -m ro",
+        description="Check that Cypher queries are read only.")
+    parser.add_argument("paths", nargs="*", metavar="PATH",
+        help="query file or directory, - for standard input (the default)")
+    parser.add_argument("-j", "--processes", type=int, default=1,
+        help="worker processes, 0 for one per CPU")
+    parser.add_argument("-d", "--delimiter", choices=("newline", "semicolon"),
+        help="statement delimiter (semicolon for files, newline for stdin)")
+    parser.add_argument("--policy", metavar="FILE",
+        help="JSON read policy to enforce")
+    parser.add_argument("--log", action="store_true",
+        help="the paths are Neo4j query.log files")
+    parser.add_argument("-q", "--quiet", action="store_true",
+        help="only print rejected statements")
+    parser.add_argument("--stats", action="store_true",
+        help="print throughput statistics to standard error")
+    args = parser.parse_args(argv)
+
+    policy = None
+    if args.policy:
+        try:
+            with open(args.policy) as f:
+                policy = Policy.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            stderr.write("ro: cannot load policy %s: %s\n" % (args.policy, e))
+            return ERROR
+
+    if args.log:
+        return scan_logs(args, policy, stdin, stdout, stderr)
+
+    status = [OK]
+    size = [0]
+
+    def items():
+        for name in paths(args.paths or ["-"]):
+            try:
+                if name == "-":
+                    text, source = stdin.read(), "<stdin>"
+                    delimiter = args.delimiter or "newline"
+                else:
+                    with open(name, encoding="utf-8") as f:
+                        text, source = f.read(), name
+                    delimiter = args.delimiter or "semicolon"
+            except (OSError, UnicodeDecodeError) as e:
+                stderr.write("ro: %s: %s\n" % (name, e))
+                status[0] = ERROR
+                continue
+            size[0] += len(text.encode("utf-8"))
+            for line, statement in statements(text, delimiter):
+                yield source, line, statement
+
+    start = time.perf_counter()
+    counts = {"accepted": 0, "rejected": 0}
+    processes = args.processes or os.cpu_count()
+    pool = None
+    if processes > 1:
+        pool = multiprocessing.Pool(processes, _init, (policy,))
+        results = pool.imap(check, items(), chunksize=64)
+    else:
+        _init(policy)
+        results = map(check, items())
+    try:
+        for result in results:
+            if result["accepted"]:
+                counts["accepted"] += 1
+            else:
+                counts["rejected"] += 1
+                if status[0] == OK:
+                    status[0] = REJECTED
+            if not args.quiet or not result["accepted"]:
+                stdout.write(json.dumps(result, sort_keys=True) + "\n")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    seconds = time.perf_counter() - start
+
+    if args.stats:
+        total = counts["accepted"] + counts["rejected"]
+        stderr.write("%d statements, %d accepted, %d rejected, %d bytes in "
+                     "%.2fs: %.0f statements/s, %.2f MB/s\n" % (total,
+                     counts["accepted"], counts["rejected"], size[0], seconds,
+                     total / seconds if seconds else 0.0,
+                     size[0] / seconds / 1e6 if seconds else 0.0))
+    return status[0]
+
+
+def scan_logs(args, policy, stdin, stdout, stderr):
+    status = OK
+    start = time.perf_counter()
+    scanner = LogScanner(policy, args.processes or os.cpu_count())
+    try:
+        for name in args.paths or ["-"]:
+            try:
+                if name == "-":
+                    scanner.scan(stdin)
+                else:
+                    scanner.scan_file(name)
+            except OSError as e:
+                stderr.write("ro: %s: %s\n" % (name, e))
+                status = ERROR
+    finally:
+        scanner.close()
+    seconds = time.perf_counter() - start
+    report = scanner.report()
+    counts = report["counts"]
+    if counts.get("rejected") and status == OK:
+        status = REJECTED
+    for user in sorted(report["users"]):
+        stats = report["users"][user]
+        if not args.quiet or stats["rejected"]:
+            stdout.write(json.dumps(dict(stats, user=user),
+                                    sort_keys=True) + "\n")
+    for entry in report["fingerprints"]:
+        if not args.quiet or not entry["accepted"]:
+            stdout.write(json.dumps(entry, sort_keys=True) + "\n")
+    if args.stats:
+        size = counts.get("bytes", 0)
+        stderr.write("%d lines, %d queries, %d rejected, %d fingerprints "
+                     "validated, %d bytes in %.2fs: %.1f MB/min\n" % (
+                     counts.get("lines", 0), counts.get("accepted", 0) +
+                     counts.get("rejected", 0), counts.get("rejected", 0),
+                     counts.get("validated", 0), size, seconds,
+                     size / seconds * 60 / 1e6 if seconds else 0.0))
+    return status
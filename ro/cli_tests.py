@@ -0,0 +1,84 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from ro.cli import main, statements
+
+
+class StatementTests(unittest.TestCase):
+
+    def test_semicolon(self):
+        self.assertEqual(list(statements(
+            "MATCH (n) RETURN n;\n\nMATCH (n {s: 'a;b'})\nRETURN n;\n  ;")),
+            [(1, "MATCH (n) RETURN n"),
+             (3, "MATCH (n {s: 'a;b'})\nRETURN n")])
+
+    def test_newline(self):
+        self.assertEqual(list(statements("a\n\n b \n", "newline")),
+                         [(1, "a"), (3, "b")])
+
+
+class CommandTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def run_main(self, argv, stdin=""):
+        out = io.StringIO()
+        err = io.StringIO()
+        status = main(argv, io.StringIO(stdin), out, err)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        return status, lines, err.getvalue()
+
+    def test_directory(self):
+        self.write("a.cypher", "MATCH (n:A) RETURN n; MATCH (m) RETURN m")
+        self.write("sub/b.cql", "MATCH (n)-[:R]->(m) RETURN m")
+        self.write("notes.txt", "CREATE (n)")
+        status, lines, err = self.run_main([self.dir])
+        self.assertEqual(status, 0)
+        self.assertEqual([line["accepted"] for line in lines], [True] * 3)
+        self.assertEqual(lines[0]["labels"], ["A"])
+        self.assertEqual(lines[2]["rel_types"], ["R"])
+
+    def test_rejected(self):
+        path = self.write("a.cypher", "MATCH (n) RETURN n;\nCREATE (n)")
+        status, lines, err = self.run_main(["-q", path])
+        self.assertEqual(status, 1)
+        self.assertEqual(len(lines), 1)
+        self.assertEqual((lines[0]["line"], lines[0]["query"]),
+                         (2, "CREATE (n)"))
+
+    def test_stdin_processes(self):
+        stdin = "MATCH (n) RETURN n\n" * 50 + "MATCH (n) DELETE n\n"
+        status, lines, err = self.run_main(["-j", "2", "--stats"], stdin)
+        self.assertEqual(status, 1)
+        self.assertEqual(len(lines), 51)
+        self.assertEqual(lines[-1]["line"], 51)
+        self.assertIn("51 statements, 50 accepted, 1 rejected", err)
+
+    def test_policy(self):
+        policy = self.write("policy.json", json.dumps({"labels": ["A"]}))
+        status, lines, err = self.run_main(["--policy", policy, "-"],
+                                           "MATCH (n:B) RETURN n")
+        self.assertEqual(status, 1)
+        self.assertIn("'B'", lines[0]["error"])
+
+    def test_missing_file(self):
+        status, lines, err = self.run_main([os.path.join(self.dir, "nope")])
+        self.assertEqual(status, 2)
+        self.assertIn("nope", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
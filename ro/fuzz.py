@@ -0,0 +1,329 @@
+"""
+Grammar driven random query generator for fuzzing and benchmarks.
+
+Generators are derived from the productions in ``grammar`` themselves: every
+pyparsing element is compiled once into a closure producing a random string
+it accepts, so the corpus follows the grammar as it changes. Terminals that
+cannot be derived from the element (identifiers, quoted strings) come from
+small fixed pools, which keeps the output fast to produce and free of
+accidental keywords.
+
+Procedures are drawn from the names the catalogue of ``procedures`` declares
+one by one, and subqueries nest no deeper than ``depth``. Recursive
+productions expand no deeper than ``RECURSION`` whatever ``depth`` is: past
+two levels the optional parentheses and boolean chains of WHERE produce
+strings the context free reading accepts but the ordered choices of the
+grammar do not, and a query the oracle calls valid must parse.
+
+Invalid queries are made by mutating valid ones in ways the grammar can never
+accept: splicing in a write clause, replacing a clause keyword with a write
+keyword, or cutting the query before its final RETURN and any CALL clauses
+in front of it.
+
+    generator = QueryGenerator(seed=1)
+    for q, expected in generator.corpus(1000000, invalid=0.2):
+        ...
+
+Run ``python -m ro.fuzz --help`` to write corpora or benchmark the parser.
+A written corpus has one line per query: the expected verdict, 1 or 0, a tab
+and the query as a JSON string, since generated strings may hold newlines
+and tabs. ``read_corpus`` reads it back.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from pyparsing import (And, MatchFirst, Or, ParseElementEnhance,
+    Forward, Optional, ZeroOrMore, OneOrMore, Literal, Keyword, Regex, White,
+    Empty, StringEnd, ParseBaseException)
+
+from . import grammar, procedures
+
+
+IDENTIFIERS = ("n", "m", "p", "r", "a", "b", "name", "age", "Person",
+    "KNOWS", "since", "x1", "_tmp", "`first name`", "Straße")
+STRINGS = ("'dave'", "'literal'", '"quoted"', "''", "'a b'", "'it''s'",
+    r"'tab\tand \'quote\''", '"line\nbreak"')
+NUMBERS = ("0", "7", "42", "-3", "0.5", "-1.25", "1e3", "2.5E-2", ".5")
+WRITE_CLAUSES = ("CREATE (x)", "MERGE (x:Person {name: 'x'})",
+    "SET n.flag = 1", "DELETE n", "DETACH DELETE n", "REMOVE n.flag",
+    "FOREACH (x IN [1] | CREATE ())", "LOAD CSV FROM 'f' AS row")
+WRITE_KEYWORDS = ("CREATE", "MERGE", "DELETE", "SET", "REMOVE")
+RECURSION = 2
+
+
+def _word_char(c):
+    return c.isalnum() or c == "_"
+
+
+def _join(parts):
+    # Adjacent words need whitespace that the grammar skips implicitly.
+    text = ""
+    for part in parts:
+        if text and part and _word_char(text[-1]) and _word_char(part[0]):
+            text += " "
+        text += part
+    return text
+
+
+class QueryGenerator(object):
+    """
+    Random query generator. ``clauses`` is the number of clauses a query gets
+    before it is steered to a RETURN, ``depth`` bounds subquery nesting and,
+    up to ``RECURSION``, recursive productions, and ``repeat`` bounds
+    ZeroOrMore/OneOrMore repetitions.
+    """
+
+    def __init__(self, seed=0, clauses=4, depth=2, repeat=2):
+        self.random = random.Random(seed)
+        self.clauses = clauses
+        self.depth = depth
+        self.repeat = repeat
+        self._nesting = 0
+        names = [text for text in procedures.load().names()
+                 if not text.endswith(".*")]
+        # Lexical tokens by pattern, named copies share their pattern.
+        self.terminals = {
+            grammar.STRING: self._choice(STRINGS),
+            grammar.NUMBER: self._choice(NUMBERS),
+            grammar.integer.pattern: lambda: str(self.random.randint(0, 999)),
+            grammar.IDENTIFIER: self._choice(IDENTIFIERS),
+            grammar.PROCEDURE: self._choice(names),
+        }
+        self._compiled = {}
+        self._clause = dict((kind, self.production(element))
+                            for kind, element in grammar.CLAUSES.items())
+
+    def _choice(self, pool):
+        return lambda: self.random.choice(pool)
+
+    def production(self, element):
+        """Return a function generating random strings ``element`` accepts.
+        Raises ``ValueError`` for elements the grammar does not use, such as
+        ``Each``."""
+        return self._compile(element, min(self.depth, RECURSION))
+
+    def _compile(self, element, depth):
+        key = (id(element), depth)
+        try:
+            return self._compiled[key]
+        except KeyError:
+            pass
+        if isinstance(element, Forward):
+            # Compiled lazily, a Forward refers to itself.
+            self._compiled[key] = lambda: generate()
+            if depth > 0:
+                generate = self._compile(element.expr, depth - 1)
+            else:
+                generate = self._exhausted(element.expr)
+        else:
+            generate = self._build(element, depth)
+        self._compiled[key] = generate
+        return generate
+
+    def _exhausted(self, element):
+        # Shortest expansion, used once the recursion budget is spent.
+        if isinstance(element, (ZeroOrMore, Optional)):
+            return lambda: ""
+        if isinstance(element, And):
+            parts = [self._exhausted(e) for e in element.exprs]
+            return lambda: _join([part() for part in parts])
+        if isinstance(element, (MatchFirst, Or)):
+            return self._exhausted(element.exprs[-1])
+        if isinstance(element, ParseElementEnhance) and not isinstance(
+                element, OneOrMore):
+            return self._exhausted(element.expr)
+        return self._build(element, 0)
+
+    def _build(self, element, depth):
+        rand = self.random
+        if isinstance(element, Regex):
+            return self.terminals[element.pattern]
+        if isinstance(element, And):
+            parts = [self._compile(e, depth) for e in element.exprs]
+            return lambda: _join([part() for part in parts])
+        if isinstance(element, (MatchFirst, Or)):
+            choices = [self._compile(e, depth) for e in element.exprs]
+            return lambda: rand.choice(choices)()
+        if isinstance(element, (ZeroOrMore, OneOrMore)):
+            body = self._compile(element.expr, depth)
+            low = 1 if isinstance(element, OneOrMore) else 0
+            repeat = max(low, self.repeat)
+            return lambda: _join([body() for _ in
+                                  range(rand.randint(low, repeat))])
+        if isinstance(element, ParseElementEnhance):
+            body = self._compile(element.expr, depth)
+            if isinstance(element, Optional):
+                if isinstance(element.expr, White):
+                    return body
+                return lambda: body() if rand.random() < 0.5 else ""
+            return body
+        if isinstance(element, White):
+            return lambda: " "
+        if isinstance(element, (Keyword, Literal)):
+            match = element.match
+            return lambda: match
+        if isinstance(element, (Empty, StringEnd)):
+            return lambda: ""
+        if isinstance(element, grammar.ClauseSequence):
+            return self._clause_sequence
+        if isinstance(element, grammar.Subquery):
+            return self._subquery
+        raise ValueError("cannot generate %r" % element)
+
+    def _clause_sequence(self):
+        return " ".join(text for kind, text in self.clause_list())
+
+    def _subquery(self):
+        self._nesting += 1
+        try:
+            return self._clause_sequence()
+        finally:
+            self._nesting -= 1
+
+    def clause_list(self):
+        """Walk the clause state machine, returning ``(kind, text)`` pairs."""
+        rand = self.random
+        state = "start"
+        result = []
+        while True:
+            moves = grammar.TRANSITIONS[state]
+            if len(result) >= self.clauses:
+                if state in grammar.ACCEPTING:
+                    return result
+                kind = "return"
+            else:
+                kind = rand.choice(sorted(kind for kind in moves
+                    if kind != "call" or self._nesting < self.depth))
+            result.append((kind, self._clause[kind]().strip()))
+            state = moves[kind]
+
+    def query(self):
+        """A random query the grammar accepts."""
+        return " ".join(text for kind, text in self.clause_list())
+
+    def invalid(self):
+        """A random query the grammar must reject."""
+        rand = self.random
+        clauses = [text for kind, text in self.clause_list()]
+        mutation = rand.randint(0, 2)
+        if mutation == 0:
+            clauses.insert(rand.randint(0, len(clauses)),
+                           rand.choice(WRITE_CLAUSES))
+        elif mutation == 1:
+            i = rand.randrange(len(clauses))
+            keyword, _, rest = clauses[i].partition(" ")
+            clauses[i] = rand.choice(WRITE_KEYWORDS) + " " + rest
+        else:
+            last = max([i for i, text in enumerate(clauses)
+                        if text[:6].upper() == "RETURN"] or [len(clauses)])
+            # A query may end with a CALL, so those go as well.
+            while last and clauses[last - 1][:4].upper() == "CALL":
+                last -= 1
+            clauses = clauses[:last]
+        return " ".join(clauses)
+
+    def corpus(self, count, invalid=0.0):
+        """Yield ``count`` ``(query, expected verdict)`` pairs."""
+        rand = self.random
+        for _ in range(count):
+            if invalid and rand.random() < invalid:
+                yield self.invalid(), False
+            else:
+                yield self.query(), True
+
+
+def parses(element):
+    """Verdict function accepting the queries ``element`` parses."""
+    def verdict(q):
+        try:
+            grammar.parse(q, element)
+        except ParseBaseException:
+            return False
+        return True
+    return verdict
+
+
+def write_corpus(corpus, out):
+    """Write the ``(query, expected)`` pairs of ``corpus`` to the file
+    ``out``, one line each."""
+    for q, expected in corpus:
+        out.write("%d\t%s\n" % (expected, json.dumps(q)))
+
+
+def read_corpus(lines):
+    """Yield the ``(query, expected)`` pairs ``write_corpus`` wrote."""
+    for line in lines:
+        expected, _, q = line.rstrip("\n").partition("\t")
+        yield json.loads(q), bool(int(expected))
+
+
+def differential(corpus, parsers):
+    """
+    Run every ``(query, expected)`` pair of ``corpus`` through each of the
+    named verdict functions in ``parsers`` and yield ``(query, verdicts)`` for
+    the queries they do not all agree on, the expected verdict included under
+    the ``"expected"`` name.
+    """
+    for q, expected in corpus:
+        verdicts = {"expected": expected}
+        for name, parser in parsers.items():
+            verdicts[name] = parser(q)
+        if len(set(verdicts.values())) > 1:
+            yield q, verdicts
+
+
+def benchmark(parser, queries):
+    """Throughput and latency percentiles of ``parser`` over ``queries``."""
+    timer = time.perf_counter
+    latencies = []
+    size = 0
+    for q in queries:
+        start = timer()
+        parser(q)
+        latencies.append(timer() - start)
+        size += len(q)
+    latencies.sort()
+    total = sum(latencies)
+    count = len(latencies)
+
+    def percentile(p):
+        return latencies[min(count - 1, int(count * p))] * 1e6
+
+    return {
+        "queries": count,
+        "bytes": size,
+        "seconds": total,
+        "queries_per_second": count / total if total else 0.0,
+        "p50_us": percentile(0.50) if count else 0.0,
+        "p99_us": percentile(0.99) if count else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ro.fuzz",
+        description="Generate random Cypher read queries.")
+    parser.add_argument("-n", "--count", type=int, default=1000)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("--clauses", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=2,
+        help="subquery nesting, recursive productions stop at %d" % RECURSION)
+    parser.add_argument("--invalid", type=float, default=0.0,
+        help="fraction of mutated invalid queries")
+    parser.add_argument("--bench", action="store_true",
+        help="benchmark the parser instead of printing the corpus")
+    args = parser.parse_args(argv)
+    generator = QueryGenerator(args.seed, args.clauses, args.depth)
+    corpus = generator.corpus(args.count, args.invalid)
+    if args.bench:
+        stats = benchmark(parses(grammar.query), [q for q, _ in corpus])
+        for name in sorted(stats):
+            print("%s\t%s" % (name, stats[name]))
+    else:
+        write_corpus(corpus, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import io
+import unittest
+from pyparsing import Each, Literal, stringEnd
+from ro import grammar
+from ro.fuzz import (QueryGenerator, benchmark, differential, parses,
+    read_corpus, write_corpus)
+
+
+class QueryGeneratorTests(unittest.TestCase):
+
+    def test_reproducible(self):
+        first = list(QueryGenerator(seed=7).corpus(50, invalid=0.5))
+        second = list(QueryGenerator(seed=7).corpus(50, invalid=0.5))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, list(QueryGenerator(seed=8).corpus(50)))
+
+    def test_productions(self):
+        generator = QueryGenerator(seed=1)
+        for element in (grammar.node, grammar.edge, grammar.where_stmt,
+                        grammar.with_stmt, grammar.return_stmt):
+            verdict = parses(element + stringEnd)
+            generate = generator.production(element)
+            for _ in range(20):
+                q = generate()
+                self.assertTrue(verdict(q), q)
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            QueryGenerator().production(Each([Literal("a"), Literal("b")]))
+
+    def test_differential(self):
+        corpus = QueryGenerator(seed=2).corpus(300, invalid=0.3)
+        verdict = parses(grammar.query)
+        disagreements = list(differential(corpus, {"pyparsing": verdict}))
+        self.assertEqual(disagreements, [])
+
+    def test_deep(self):
+        # Deeper WHERE chains would be labelled valid but fail to parse.
+        corpus = QueryGenerator(seed=13, depth=3).corpus(1000)
+        verdict = parses(grammar.query)
+        disagreements = list(differential(corpus, {"pyparsing": verdict}))
+        self.assertEqual(disagreements, [])
+        queries = [q for q, _ in QueryGenerator(seed=13, depth=3).corpus(300)]
+        self.assertTrue(any(q.count("CALL {") >= 2 for q in queries))
+
+    def test_corpus_file(self):
+        corpus = list(QueryGenerator(seed=6).corpus(300, invalid=0.3))
+        self.assertTrue(any("\n" in q for q, _ in corpus))
+        out = io.StringIO()
+        write_corpus(corpus, out)
+        self.assertEqual(out.getvalue().count("\n"), len(corpus))
+        out.seek(0)
+        self.assertEqual(list(read_corpus(out)), corpus)
+
+    def test_size(self):
+        short = QueryGenerator(seed=3, clauses=1).clause_list()
+        long = QueryGenerator(seed=3, clauses=30).clause_list()
+        self.assertLessEqual(len(short), 4)
+        self.assertGreaterEqual(len(long), 30)
+
+    def test_benchmark(self):
+        queries = [q for q, _ in QueryGenerator(seed=4).corpus(20)]
+        stats = benchmark(parses(grammar.query), queries)
+        self.assertEqual(stats["queries"], 20)
+        self.assertEqual(stats["bytes"], sum(len(q) for q in queries))
+        self.assertLessEqual(stats["p50_us"], stats["p99_us"])
+
+
+if __name__ == "__main__":
+    unittest.main()
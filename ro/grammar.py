@@ -16,38 +16,81 @@ mapping an new style label to a legacy Neo4j index.
 
 # [MATCH WHERE]
 # [OPTIONAL MATCH WHERE]
-# [WITH [ORDER BY] [SKIP] [LIMIT]]
+# [WITH [ORDER BY] [SKIP] [LIMIT] [WHERE]]
+# [CALL procedure(...) [YIELD ...] [WHERE]]
+# [CALL { subquery }]
 # RETURN [ORDER BY] [SKIP] [LIMIT]
+# [UNION [ALL] ...]
+
+The MATCH, OPTIONAL MATCH, WITH and CALL stages may repeat in any order before
+the RETURN. A query may also end with a CALL, as in ``CALL db.labels()``.
+
+Only procedures declared read only in the catalogue of ``procedures`` may be
+called. A subquery is parsed like a whole query.
+
+Any number of threads may parse at once with ``parse``: the grammar is only
+read once it is built, and what a parse observes goes to listeners local to
+its thread (see ``hooks``).
 
 """
-from pyparsing import (Word, alphanums, ZeroOrMore, OneOrMore, nums, stringEnd, Literal,
-    CaselessKeyword, Optional, Forward, quotedString, White)
+import collections
+import linecache
+import re
+import sys
+import threading
+
+from pyparsing import (ZeroOrMore, OneOrMore, stringEnd, Literal,
+    CaselessKeyword, Optional, Forward, Regex, White, Token, ParserElement,
+    ParseBaseException, ParseException, ParseFatalException, ParseResults)
 
 #############################################################################
 ############### KWRDS #######################################################
-match = CaselessKeyword("MATCH") + White()
-optional = CaselessKeyword("OPTIONAL") + White()
-where = CaselessKeyword("WHERE") + White()
-order_by = CaselessKeyword("ORDER BY") + White()
-skip = CaselessKeyword("SKIP") + White()
-limit = CaselessKeyword("LIMIT") + White()
-with_kwrd = CaselessKeyword("WITH") + White()
-as_kwrd = CaselessKeyword("AS") + White()
-and_kwrd = CaselessKeyword("AND") + White()
-or_kwrd = CaselessKeyword("OR") + White()
-xor = CaselessKeyword("XOR") + White()
-not_kwrd = CaselessKeyword("NOT") + White()
-return_kwrd = CaselessKeyword("RETURN") + White()
-distinct = CaselessKeyword("DISTINCT") + White()
-has = CaselessKeyword("HAS") + White()
-in_kwrd = CaselessKeyword("IN") + White()
-is_kwrd = CaselessKeyword("IS") + White()
-null = CaselessKeyword("NULL") + Optional(White())
-asc = CaselessKeyword("ASC") + Optional(White())
-desc = CaselessKeyword("DESC") + Optional(White())
-skip = CaselessKeyword("SKIP") + Optional(White())
-
-type_kwrd = CaselessKeyword("type")  # Literal?
+
+# Whitespace the query keeps as tokens. Every keyword and separator shares
+# these two elements.
+space = White()
+maybe_space = Optional(space)
+
+# Every keyword also shares one set of the characters that may not follow
+# it, instead of holding a copy of its own.
+_IDENT_CHARS = frozenset(CaselessKeyword.DEFAULT_KEYWORD_CHARS.upper())
+
+
+def keyword(text):
+    """``CaselessKeyword(text)`` with the shared identifier characters."""
+    element = CaselessKeyword(text)
+    element.ident_chars = _IDENT_CHARS
+    return element
+
+
+match = keyword("MATCH") + space
+optional = keyword("OPTIONAL") + space
+where = keyword("WHERE") + space
+order_by = keyword("ORDER BY") + space
+skip = keyword("SKIP") + maybe_space
+limit = keyword("LIMIT") + space
+with_kwrd = keyword("WITH") + space
+as_kwrd = keyword("AS") + space
+and_kwrd = keyword("AND") + space
+or_kwrd = keyword("OR") + space
+xor = keyword("XOR") + space
+not_kwrd = keyword("NOT") + space
+return_kwrd = keyword("RETURN") + space
+distinct = keyword("DISTINCT") + space
+has = keyword("HAS") + space
+in_kwrd = keyword("IN") + space
+is_kwrd = keyword("IS") + space
+null = keyword("NULL") + maybe_space
+asc = keyword("ASC") + maybe_space
+desc = keyword("DESC") + maybe_space
+
+union = keyword("UNION") + space
+all_kwrd = keyword("ALL") + space
+
+call = keyword("CALL") + maybe_space
+yield_kwrd = keyword("YIELD") + space
+
+type_kwrd = keyword("type")  # Literal?
 
 
 #############################################################################
@@ -62,10 +105,31 @@ where_opts = (and_not | or_not | xor_not | and_kwrd | or_kwrd | xor | not_kwrd)
 #############################################################################
 ############### Generics ####################################################
 
-# Some basic symbols.
-var = Word(alphanums, "_" + alphanums)
-integer = Word(nums)
-flt = integer + "." + integer
+# Lexical tokens are single precompiled regular expressions.
+#
+# Identifiers start with a letter or underscore and go on with letters, digits
+# and underscores, non-ASCII ones included. Anything else can be quoted in
+# backticks, with a doubled backtick standing for a literal one.
+QUOTED_IDENTIFIER = r"`(?:[^`]|``)+`"
+IDENTIFIER = r"[^\W\d]\w*|" + QUOTED_IDENTIFIER
+# Strings take backslash escapes as well as doubled quotes and may span lines.
+STRING = r"'(?:[^'\\]|\\.|'')*'" r'|"(?:[^"\\]|\\.|"")*"'
+# Numbers may be negative and have a fraction, an exponent or both.
+NUMBER = r"-?(?:\d+(?:\.\d+)?|\.\d+)(?:[eE][-+]?\d+)?"
+
+var = Regex(IDENTIFIER)
+ref = var.copy()  # A variable used after it has been bound
+integer = Regex(r"\d+")
+flt = Regex(NUMBER)
+string = Regex(STRING)
+
+
+def name(token):
+    """The name an identifier token stands for, without backtick quoting."""
+    if token.startswith("`"):
+        return token[1:-1].replace("``", "`")
+    return token
+
 
 # Operators
 equals = Literal("=")
@@ -76,25 +140,25 @@ leq = Literal("<=")
 neq = Literal("<>")
 reg = Literal("=~")
 
-operators = (equals | geq | leq | gt | lt | neq)
+operators = (equals | geq | leq | neq | gt | lt)
 
 # Useful combos
 gettr = var + "." + var
-right = gettr | quotedString | integer
+right = gettr | string | flt
 
 
 #############################################################################
 ############### Misc. Functions #############################################
-simple_param = "(" + var + ")"
+simple_param = "(" + ref + ")"
 type_fn = type_kwrd + simple_param
 
 
 #############################################################################
 ############### Path Functions ##############################################
 ### UNTESTED
-length = CaselessKeyword("length")
-nodes = CaselessKeyword("nodes")
-rels = CaselessKeyword("rels")
+length = keyword("length")
+nodes = keyword("nodes")
+rels = keyword("rels")
 
 length_fn = length + simple_param
 nodes_fn = nodes + simple_param
@@ -112,14 +176,14 @@ rels_fn = rels + simple_param
 ############### Aggregation #################################################
 
 # Kwrds
-count = CaselessKeyword("count")  # Literal?
-sum = CaselessKeyword("sum")  # Literal?
-disc_per = CaselessKeyword("percentileDisc")  # Literal?
-standard_dev = CaselessKeyword("stdev")  # Literal?
+count = keyword("count")  # Literal?
+sum = keyword("sum")  # Literal?
+disc_per = keyword("percentileDisc")  # Literal?
+standard_dev = keyword("stdev")  # Literal?
 
 # Count function
-dist_iden = (distinct + gettr) | (distinct + var)
-count_opts = dist_iden | gettr | var | "*"
+dist_iden = (distinct + gettr) | (distinct + ref)
+count_opts = dist_iden | gettr | ref | "*"
 count_fn = count + "(" + count_opts + ")"
 
 # Sum function
@@ -144,33 +208,37 @@ fns = (aggr_fn | type_fn)
 #############################################################################
 ############### Collections #################################################
 
-lst = "[" + right + ZeroOrMore("," + Optional(White()) + right) + "]"
+lst = "[" + right + ZeroOrMore("," + maybe_space + right) + "]"
 
 
 #############################################################################
 ############### Nodes/Edges #################################################
 
-# Labels for nodes/edges
+# Labels for nodes, relationship types for edges
 label = ":" + var
 alias_label = var + ZeroOrMore(label) | ZeroOrMore(label)
+rel_label = ":" + var("rel_type*")
+alias_rel_label = var + ZeroOrMore(rel_label) | ZeroOrMore(rel_label)
 
 # Parse property prop_map style syntax.
-keyval = var + ":" + Optional(White()) + right
+keyval = var + ":" + maybe_space + right
 
 # Comma seperated recursive pattern for property.
 keyval_csv_pattern = Forward()
-keyval_csv_pattern << keyval + ZeroOrMore("," + Optional(White()) +
+keyval_csv_pattern << keyval + ZeroOrMore("," + maybe_space +
     keyval_csv_pattern)
 
 # Property map
 prop_map = "{" + keyval_csv_pattern + "}"
 
 # Nodes
-node = "(" + Optional(alias_label) + Optional(White()) + Optional(prop_map) + ")"
+node = "(" + Optional(alias_label) + maybe_space + Optional(prop_map) + ")"
 
 # Edges
-cardinality = "*" + integer + ".." + integer | "*"
-edge_content = ("[" + Optional(alias_label) + Optional(White()) +
+var_length = Literal("*")("var_length")
+cardinality = (var_length + integer("min_hops") + ".." + integer("max_hops") |
+    var_length)
+edge_content = ("[" + Optional(alias_rel_label) + maybe_space +
     Optional(prop_map) + Optional(cardinality) + "]")
 undir_edge = "-" + Optional(edge_content) + "-"
 out_edge = undir_edge + ">"
@@ -195,60 +263,63 @@ traversal_csv_pattern << traversal_pattern + ZeroOrMore("," +
 # This is pretty permissive, but fine for our purposes. For now anyway, can
 # make stricter if necessary
 has_comp = has + "(" + gettr + ")"
-full_left = gettr | type_fn | var
+full_left = gettr | type_fn | ref
 
 # operator + right combos
 simple_comp = operators + right
 in_comp = in_kwrd + lst
 isnull_comp = is_kwrd + null
-reg_comp = reg + quotedString
+reg_comp = reg + string
 op_right = isnull_comp | simple_comp | in_comp | reg_comp
 
-comp = (has_comp | full_left + op_right | (var + OneOrMore(label)))
+comp = (has_comp | full_left + op_right | (ref + OneOrMore(label)))
 
 comp_obj = not_kwrd + comp | comp
 traversal_pattern_obj = not_kwrd + traversal_pattern | traversal_pattern
 
 # Comma seperated recursive pattern for comp_obj style syntax
 comparison_pattern = Forward()
-comparison_pattern << Optional("(") + comp_obj + ZeroOrMore(White() +
+comparison_pattern << Optional("(") + comp_obj + ZeroOrMore(space +
     where_opts + comparison_pattern) + Optional(")")
 
+# A pattern or comparison that ends in an unmatched ZeroOrMore/Optional has
+# already skipped the whitespace in front of the boolean operator.
 multi_comparison_pattern = Forward()
 multi_comparison_pattern << ((traversal_pattern_obj | comparison_pattern) +
-    ZeroOrMore(White() + where_opts + multi_comparison_pattern))
+    ZeroOrMore(maybe_space + where_opts + multi_comparison_pattern))
 
 
 #############################################################################
 ############### WITH pattern ################################################
 
-as_left = aggr_fn | type_fn | gettr | var
-as_stmt =  as_left + White() + as_kwrd + var
+as_left = fns | gettr | ref
+as_stmt =  as_left + space + as_kwrd + var
 
-with_obj = as_stmt | var
+with_obj = as_stmt | ref
 
 with_pattern = Forward()
-with_pattern << with_obj + ZeroOrMore("," + Optional(White()) + with_pattern)
+with_pattern << with_obj + ZeroOrMore("," + maybe_space + with_pattern)
 
 
 #############################################################################
 ############### ORDER BY pattern ############################################
 
-orderby_obj = (gettr | var) + Optional(White() + (asc | desc))
+orderby_obj = (gettr | ref) + Optional(space + (asc | desc))
 
 orderby_pattern = Forward()
-orderby_pattern << orderby_obj + ZeroOrMore("," + Optional(White()) +
+orderby_pattern << orderby_obj + ZeroOrMore("," + maybe_space +
     orderby_pattern)
 
 
 #############################################################################
 ############### RETURN pattern ##############################################
 
-return_obj = (quotedString | as_stmt | fns | multi_comparison_pattern | flt |
-    var)
+# Comparisons come before fns so that type(r) = 'KNOWS' is not cut short.
+return_obj = (string | as_stmt | multi_comparison_pattern | fns | flt |
+    ref)
 
 return_pattern = Forward()
-return_pattern << return_obj + ZeroOrMore("," + Optional(White()) +
+return_pattern << return_obj + ZeroOrMore("," + maybe_space +
     return_pattern)
 
 
@@ -256,16 +327,325 @@ return_pattern << return_obj + ZeroOrMore("," + Optional(White()) +
 ############### STATEMENTS ##################################################
 
 match_stmt = ((Optional(optional) + match + traversal_csv_pattern |
-    match + var + "=" + traversal_pattern) + Optional(White()))
+    match + var("path") + "=" + traversal_pattern) + maybe_space)
+
+where_stmt = where + multi_comparison_pattern + maybe_space
+
+with_stmt = with_kwrd + with_pattern + maybe_space
+
+order_stmt = order_by + orderby_pattern + maybe_space
 
-where_stmt = where + multi_comparison_pattern + Optional(White())
+limit_stmt = limit + integer("limit") + maybe_space
 
-with_stmt = with_kwrd + with_pattern + Optional(White())
+skip_stmt = skip + integer("skip") + maybe_space
 
-order_stmt = order_by + orderby_pattern + Optional(White())
+return_stmt = return_kwrd + return_pattern + maybe_space
 
-limit_stmt = limit + integer + Optional(White())
+union_stmt = union + Optional(all_kwrd)
 
-skip_stmt = skip + integer + Optional(White())
 
-return_stmt = return_kwrd + return_pattern + Optional(White())
+#############################################################################
+############### CALL ########################################################
+
+# Procedure names are dotted identifiers, db.schema.visualization.
+PROCEDURE = r"(?:%s)(?:\.(?:%s))*" % (IDENTIFIER, IDENTIFIER)
+
+
+class Procedure(Regex):
+    """
+    A procedure name, matched only if ``catalogue`` declares it read only.
+    The catalogue defaults to the one at ``procedures.CATALOGUE_PATH``,
+    loaded once on first use.
+    """
+
+    def __init__(self, catalogue=None):
+        super(Procedure, self).__init__(PROCEDURE)
+        self.name = "procedure"
+        self.catalogue = catalogue
+        self._lock = threading.Lock()
+
+    def _catalogue(self):
+        with self._lock:
+            if self.catalogue is None:
+                from .procedures import load
+                self.catalogue = load()
+            return self.catalogue
+
+    def parseImpl(self, instring, loc, doActions=True):
+        end, tokens = super(Procedure, self).parseImpl(instring, loc,
+                                                       doActions)
+        catalogue = self.catalogue
+        if catalogue is None:
+            catalogue = self._catalogue()
+        if tokens[0] not in catalogue:
+            raise ParseFatalException(instring, loc,
+                "procedure %s is not declared read only" % tokens[0], self)
+        return end, tokens
+
+
+class Subquery(Token):
+    """
+    The clauses of a ``CALL { ... }`` subquery, up to its closing brace,
+    parsed like a whole query.
+
+    Bodies are memoized by their text, shared by every query and nesting
+    level. A body that was rejected before fails again at once. One that was
+    accepted is not parsed again either: ``recorder`` is set by ``hooks``,
+    which records the matches the listeners saw during the first parse and
+    replays them to the listeners of later ones.
+    """
+    block = re.compile(r"%s|%s|[{}]" % (STRING, QUOTED_IDENTIFIER))
+
+    def __init__(self, cache_size=4096):
+        super(Subquery, self).__init__()
+        self.name = "subquery"
+        self.mayIndexError = False
+        self.cache_size = cache_size
+        self.recorder = None
+        self._memo = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _close(self, instring, loc):
+        # Offset of the brace closing the block loc is in, or None.
+        depth = 0
+        for found in self.block.finditer(instring, loc):
+            if found.group() == "{":
+                depth += 1
+            elif found.group() == "}":
+                if not depth:
+                    return found.start()
+                depth -= 1
+        return None
+
+    def parseImpl(self, instring, loc, doActions=True):
+        close = self._close(instring, loc)
+        if close is None:
+            raise ParseException(instring, loc, "unclosed subquery", self)
+        body = instring[loc:close]
+        recording = doActions and self.recorder is not None
+        with self._lock:
+            memo = self._memo.get(body)
+            if memo is not None:
+                self._memo.move_to_end(body)
+        if memo is not None:
+            error, end, tokens, events = memo
+            if error is not None:
+                raise ParseException(instring, loc + error[0], error[1], self)
+            if events is not None or not recording:
+                if recording:
+                    self.recorder.replay(events, instring, loc)
+                return loc + end, tokens.copy()
+        events = [] if recording else None
+        try:
+            if recording:
+                with self.recorder.recording(events, loc):
+                    end, tokens = self._parse_body(instring, loc, close)
+            else:
+                end, tokens = self._parse_body(instring, loc, close,
+                                               doActions)
+        except ParseException as e:
+            self._remember(body, ((e.loc - loc, e.msg), None, None, None))
+            raise
+        self._remember(body, (None, end - loc, tokens.copy(), events))
+        return end, tokens
+
+    def _parse_body(self, instring, loc, close, doActions=True):
+        end, tokens = clause_sequence._parse(instring, loc, doActions)
+        if self.preParse(instring, end) != close:
+            raise ParseException(instring, end,
+                "expected } to close the subquery", self)
+        return end, tokens
+
+    def _remember(self, body, memo):
+        with self._lock:
+            self._memo[body] = memo
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+
+
+procedure = Procedure()
+procedure_arg = right | ref
+procedure_args = "(" + Optional(procedure_arg + ZeroOrMore("," +
+    maybe_space + procedure_arg)) + ")"
+
+yield_obj = var + Optional(space + as_kwrd + var)
+yield_pattern = "*" | yield_obj + ZeroOrMore("," + maybe_space + yield_obj)
+
+procedure_call = (procedure + procedure_args +
+    Optional(space + yield_kwrd + yield_pattern))
+
+subquery_body = Subquery()
+subquery = "{" + subquery_body + "}"
+
+call_stmt = call + (subquery | procedure_call) + maybe_space
+
+
+#############################################################################
+############### QUERY #######################################################
+
+# Clause kind for the leading keyword of each statement.
+CLAUSE_KINDS = {
+    "MATCH": "match",
+    "OPTIONAL": "match",
+    "WHERE": "where",
+    "WITH": "with",
+    "ORDER": "order",
+    "SKIP": "skip",
+    "LIMIT": "limit",
+    "RETURN": "return",
+    "UNION": "union",
+    "CALL": "call",
+}
+
+CLAUSES = {
+    "match": match_stmt,
+    "where": where_stmt,
+    "with": with_stmt,
+    "order": order_stmt,
+    "skip": skip_stmt,
+    "limit": limit_stmt,
+    "return": return_stmt,
+    "union": union_stmt,
+    "call": call_stmt,
+}
+
+# state -> {clause kind: next state}
+TRANSITIONS = {
+    "start": {"match": "match", "with": "with", "call": "call",
+        "return": "return"},
+    "match": {"match": "match", "where": "match_where", "with": "with",
+        "call": "call", "return": "return"},
+    "match_where": {"match": "match", "with": "with", "call": "call",
+        "return": "return"},
+    "with": {"where": "with_where", "order": "with_order", "skip": "with_skip",
+        "limit": "with_limit", "match": "match", "with": "with",
+        "call": "call", "return": "return"},
+    "with_order": {"skip": "with_skip", "limit": "with_limit",
+        "where": "with_where", "match": "match", "with": "with",
+        "call": "call", "return": "return"},
+    "with_skip": {"limit": "with_limit", "where": "with_where",
+        "match": "match", "with": "with", "call": "call", "return": "return"},
+    "with_limit": {"where": "with_where", "match": "match", "with": "with",
+        "call": "call", "return": "return"},
+    "with_where": {"match": "match", "with": "with", "call": "call",
+        "return": "return"},
+    "call": {"where": "match_where", "match": "match", "with": "with",
+        "call": "call", "return": "return"},
+    "return": {"order": "return_order", "skip": "return_skip",
+        "limit": "return_limit", "union": "start"},
+    "return_order": {"skip": "return_skip", "limit": "return_limit",
+        "union": "start"},
+    "return_skip": {"limit": "return_limit", "union": "start"},
+    "return_limit": {"union": "start"},
+}
+
+ACCEPTING = frozenset(["return", "return_order", "return_skip",
+    "return_limit", "call"])
+
+
+class ClauseSequence(Token):
+    """
+    Sequences whole statements with the TRANSITIONS state machine. The leading
+    keyword picks the one statement that can follow, so clauses are never
+    retried and a query parses in time linear in its number of clauses.
+
+    Each clause is reported under the ``clauses`` results name as a
+    ``(kind, start, end)`` tuple of offsets into the query.
+    """
+    keyword = re.compile(r"[A-Za-z]+")
+
+    def __init__(self):
+        super(ClauseSequence, self).__init__()
+        self.name = "query"
+        self.mayIndexError = False
+
+    def parseImpl(self, instring, loc, doActions=True):
+        state = "start"
+        tokens = ParseResults([])
+        spans = []
+        while True:
+            start = self.preParse(instring, loc)
+            found = self.keyword.match(instring, start)
+            kind = found and CLAUSE_KINDS.get(found.group().upper())
+            if not kind:
+                break
+            next_state = TRANSITIONS[state].get(kind)
+            if next_state is None:
+                raise ParseException(instring, start,
+                    "unexpected %s clause" % found.group(), self)
+            loc, clause_tokens = CLAUSES[kind]._parse(instring, start,
+                doActions)
+            tokens += clause_tokens
+            end = loc
+            while end > start and instring[end - 1].isspace():
+                end -= 1
+            spans.append((kind, start, end))
+            state = next_state
+        if state not in ACCEPTING:
+            raise ParseException(instring, loc, "expected RETURN", self)
+        tokens["clauses"] = spans
+        return loc, tokens
+
+
+clause_sequence = ClauseSequence()
+query = clause_sequence + stringEnd
+
+
+_frozen = False
+_freezing = threading.Lock()
+
+
+def freeze():
+    """
+    Compile every regular expression of the grammar, once, instead of on the
+    first parse that reaches each of them, so that parses never modify the
+    grammar. ``parse`` calls it before its first parse rather than at import,
+    which processes that never parse do not pay for.
+    """
+    global _frozen
+    with _freezing:
+        if _frozen:
+            return
+        todo = [element for element in globals().values()
+                if isinstance(element, ParserElement)]
+        seen = set()
+        while todo:
+            element = todo.pop()
+            if id(element) not in seen:
+                seen.add(id(element))
+                if isinstance(element, Regex):
+                    element.re_match
+                todo.extend(element.recurse())
+        _frozen = True
+
+
+def parse(q, element=query):
+    """
+    ``element.parseString(q)`` without the class wide state ``parseString``
+    resets and streamlines on a first call, safe to run from any number of
+    threads at once.
+
+    Pyparsing's packrat cache and left recursion memos are shared by every
+    thread, and a packrat hit would skip the parse actions listeners rely
+    on, so neither may be enabled.
+    """
+    if (ParserElement._packratEnabled or
+            ParserElement._left_recursion_enabled):
+        raise RuntimeError("the grammar cannot be shared with packrat "
+                           "parsing or left recursion enabled")
+    if not _frozen:
+        freeze()
+    if not element.keepTabs:
+        q = q.expandtabs()
+    try:
+        return element._parse(q, 0)[1]
+    except ParseBaseException as e:
+        raise e.with_traceback(None)
+
+
+# Forward notes where it was created and assigned with traceback, which reads
+# this module and pyparsing's source into linecache. Nothing needs the lines
+# once the grammar is built, and a traceback reads them again.
+for _source in (__file__, sys.modules[ParserElement.__module__].__file__):
+    linecache.cache.pop(_source, None)
+del _source
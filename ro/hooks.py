@@ -0,0 +1,96 @@
+"""
+Parse action hooks shared by everything that needs to observe a parse.
+
+Each hooked production gets exactly one parse action, attached at import time.
+The action forwards the matched tokens to every listener that is active on the
+current thread and defines a method named after the production. Listeners are
+plain objects, so policies, analyses and collectors all run in the same pass
+over the query without a second walk of the tokens.
+
+    with listening(checker):
+        parse(query, match_stmt)
+
+Listeners are local to a thread, so threads can parse at once, each seeing
+only its own matches.
+
+"""
+import sys
+import threading
+from contextlib import contextmanager
+
+from . import grammar
+
+
+_local = threading.local()
+
+
+def listeners():
+    """Return the listeners active on the current thread."""
+    return getattr(_local, "listeners", ())
+
+
+@contextmanager
+def listening(*objs):
+    """Activate ``objs`` as listeners for parses run inside the block."""
+    previous = listeners()
+    _local.listeners = previous + objs
+    try:
+        yield
+    finally:
+        _local.listeners = previous
+
+
+def _dispatch(name):
+    def action(s, loc, toks):
+        for listener in listeners():
+            method = getattr(listener, name, None)
+            if method is not None:
+                method(s, loc, toks)
+    return action
+
+
+def hook(name, element):
+    """Forward matches of ``element`` to listener methods called ``name``."""
+    element.addParseAction(_dispatch(name))
+    HOOKED[name] = element
+
+
+HOOKED = {}
+
+for _name in ("label", "edge_content", "keyval", "gettr", "fns",
+              "limit_stmt", "match", "where", "with_kwrd", "order_by",
+              "return_kwrd", "alias_label", "alias_rel_label", "ref",
+              "as_stmt", "with_obj", "with_stmt", "match_stmt",
+              "union_stmt", "node", "optional", "type_fn", "procedure",
+              "subquery", "call", "procedure_call", "yield_obj",
+              "return_obj", "skip_stmt"):
+    hook(_name, getattr(grammar, _name))
+
+
+class _Recording(object):
+    """Listener appending ``(name, loc - offset, toks)`` to ``events``."""
+
+    def __init__(self, events, offset):
+        self.events = events
+        self.offset = offset
+
+    def __getattr__(self, name):
+        if name not in HOOKED:
+            raise AttributeError(name)
+        return lambda s, loc, toks: self.events.append(
+            (name, loc - self.offset, toks))
+
+
+def recording(events, offset):
+    """Record the matches of parses run inside the block to ``events``."""
+    return listening(_Recording(events, offset))
+
+
+def replay(events, s, offset):
+    """Forward recorded ``events`` to the active listeners, at ``offset``."""
+    for name, loc, toks in events:
+        _dispatch(name)(s, loc + offset, toks)
+
+
+# Memoized subquery bodies record and replay their matches here.
+grammar.subquery_body.recorder = sys.modules[__name__]
@@ -0,0 +1,504 @@
+"""
+Offline MATCH optimization from database statistics.
+
+``Statistics`` holds node counts per label and the single property indexes of
+a database. It is loaded from a JSON snapshot, either in the short form
+
+    {"nodes": 10000, "labels": {"Person": 9000, "Admin": 12},
+     "indexes": {"Person": ["name", "id"]}}
+
+or as the output of ``CALL db.stats.retrieve('GRAPH COUNTS')``.
+
+``Optimizer`` rewrites the MATCH clauses of a read query, each with the WHERE
+that belongs to it:
+
+* Equality predicates in WHERE on an indexed property of a labelled node move
+into the node's property map, where the planner sees an index seek:
+
+    MATCH (p:Person)-->(f) WHERE p.name = 'dave' RETURN f
+    MATCH (p:Person {name: 'dave'})-->(f) RETURN f
+
+* Each path starts from its most selective end, and the patterns of a clause
+are ordered by selectivity. A node is estimated at the count of its rarest
+label, one row for an indexed equality, and a tenth for any other equality.
+
+* Patterns that share no variable are a cartesian product. They are split
+into MATCH clauses of their own, most selective first, each followed by the
+WHERE predicates it can already evaluate. Relationships are only unique
+within one MATCH, so the split is made when at most one of the parts has
+relationships, and is otherwise only reported. OPTIONAL MATCH is never
+split, and named paths are never reversed.
+
+Decisions never depend on literal values, so rewrites are compiled once per
+query shape (see ``rewrite.Rewriter``). ``suggestions`` explains what a
+rewrite did, and what it could not do:
+
+    python -m ro.optimize --stats stats.json "MATCH (a:A), (b:B) RETURN a, b"
+"""
+import argparse
+import collections
+import json
+import sys
+
+from . import spans
+from .grammar import name, parse
+from .pattern import PatternGraph
+from .rewrite import Rewriter, Suggestion
+
+
+INDEX_SEEK = 1.0
+EQUALITY = 0.1
+
+
+class Statistics(object):
+    """Label counts and single property indexes of a database."""
+
+    def __init__(self, nodes=0, labels=None, indexes=None):
+        self.nodes = nodes
+        self.labels = dict(labels or {})
+        self.indexes = dict((label, frozenset(keys))
+                            for label, keys in (indexes or {}).items())
+
+    @classmethod
+    def from_dict(cls, snapshot):
+        """Build statistics from either snapshot form, see the module
+        docstring."""
+        nodes = snapshot.get("nodes", 0)
+        labels = dict(snapshot.get("labels", {}))
+        if isinstance(nodes, list):
+            entries, nodes = nodes, 0
+            for entry in entries:
+                if entry.get("label") is None:
+                    nodes = entry["count"]
+                else:
+                    labels[entry["label"]] = entry["count"]
+        indexes = snapshot.get("indexes", {})
+        if isinstance(indexes, list):
+            entries, indexes = indexes, {}
+            for entry in entries:
+                if len(entry.get("properties", ())) != 1:
+                    continue
+                for label in entry.get("labels", ()):
+                    indexes.setdefault(label, set()).update(
+                        entry["properties"])
+        return cls(nodes, labels, indexes)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def indexed(self, label, key):
+        return key in self.indexes.get(label, ())
+
+    def estimate(self, labels, keys=()):
+        """Rows expected for a node with ``labels`` and equality predicates
+        on ``keys``."""
+        rows = float(min([self.labels.get(label, 0) for label in labels] or
+                         [self.nodes]))
+        for key in keys:
+            if any(self.indexed(label, key) for label in labels):
+                rows = min(rows, INDEX_SEEK)
+            else:
+                rows *= EQUALITY
+        return rows
+
+
+class _Node(object):
+    __slots__ = ("start", "end", "alias", "labels", "keys", "close",
+                 "pushed")
+
+    def __init__(self, start, end, alias, labels, keys, close):
+        self.start = start
+        self.end = end
+        self.alias = alias
+        self.labels = labels
+        self.keys = keys
+        self.close = close
+        self.pushed = []
+
+
+class _Edge(object):
+    __slots__ = ("start", "end", "alias", "left", "right", "content")
+
+    def __init__(self, start, end, alias, left, right, content):
+        self.start = start
+        self.end = end
+        self.alias = alias
+        self.left = left
+        self.right = right
+        self.content = content
+
+
+class _Clause(object):
+    """The patterns of one MATCH clause, found in its significant tokens."""
+
+    def __init__(self, q, tokens):
+        self.q = q
+        self.tokens = tokens
+        self.optional = self.text(0).upper() == "OPTIONAL"
+        i = 2 if self.optional else 1
+        self.head = (tokens[0][1], tokens[i - 1][2])
+        self.path = self.path_alias = None
+        if self.text(i + 1) == "=":
+            self.path = (tokens[i][1], tokens[i + 2][1])
+            self.path_alias = name(self.text(i))
+            i += 2
+        self.patterns = [[]]
+        while i < len(tokens):
+            token = self.text(i)
+            if token == "(":
+                i = self._node(i)
+            elif token == ",":
+                self.patterns.append([])
+                i += 1
+            else:
+                i = self._edge(i)
+
+    def text(self, i):
+        if i >= len(self.tokens):
+            return ""
+        kind, start, end = self.tokens[i]
+        return self.q[start:end]
+
+    def _node(self, i):
+        start = self.tokens[i][1]
+        alias = None
+        if self.tokens[i + 1][0] == spans.IDENTIFIER:
+            alias = name(self.text(i + 1))
+        labels = []
+        keys = []
+        close = None
+        in_map = False
+        i += 1
+        while self.text(i) != ")":
+            token = self.text(i)
+            if token == "{":
+                in_map = True
+            elif token == "}":
+                close = self.tokens[i][1]
+                in_map = False
+            elif token == ":" and not in_map:
+                labels.append(name(self.text(i + 1)))
+            elif token == ":" and self.text(i - 2) in ("{", ","):
+                keys.append(name(self.text(i - 1)))
+            i += 1
+        self.patterns[-1].append(_Node(start, self.tokens[i][2], alias,
+                                       labels, keys, close))
+        return i + 1
+
+    def _edge(self, i):
+        start = self.tokens[i][1]
+        left = self.text(i) in ("<-", "<")
+        i += 2 if self.text(i) == "<" else 1
+        alias = content = None
+        if self.text(i) == "[":
+            content_start = self.tokens[i][1]
+            if self.tokens[i + 1][0] == spans.IDENTIFIER:
+                alias = name(self.text(i + 1))
+            while self.text(i) != "]":
+                i += 1
+            content = (content_start, self.tokens[i][2])
+            i += 1
+        right = self.text(i) == "->"
+        i += 1
+        if not right and self.text(i) == ">":
+            right = True
+            i += 1
+        self.patterns[-1].append(_Edge(start, self.tokens[i - 1][2], alias,
+                                       left, right, content))
+        return i
+
+
+def _conjuncts(q, tokens):
+    # Top level AND operands of a WHERE body, as lists of significant
+    # tokens. AND binds tighter than OR and XOR, so a body with either at the
+    # top level is kept whole, as is one with unbalanced parentheses.
+    parts = [[]]
+    depth = 0
+    for token in tokens:
+        text = q[token[1]:token[2]]
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+        keyword = text.upper() if depth == 0 and \
+            token[0] == spans.IDENTIFIER else None
+        if keyword in ("OR", "XOR"):
+            return [tokens]
+        if keyword == "AND":
+            parts.append([])
+        else:
+            parts[-1].append(token)
+    if depth != 0 or not all(parts):
+        return [tokens]
+    return parts
+
+
+def _equality(q, tokens):
+    # (alias, key token, literal span) for alias.key = literal, or None.
+    if len(tokens) != 5:
+        return None
+    texts = [q[start:end] for kind, start, end in tokens]
+    kinds = [kind for kind, start, end in tokens]
+    literal = (spans.STRING, spans.NUMBER)
+    if texts[1:4:2] == [".", "="] and kinds[4] in literal and \
+            kinds[0] == kinds[2] == spans.IDENTIFIER:
+        return name(texts[0]), texts[2], tokens[4][1:]
+    return None
+
+
+def _references(q, tokens):
+    # Names of the variables a predicate uses.
+    names = set()
+    for i, (kind, start, end) in enumerate(tokens):
+        if kind != spans.IDENTIFIER:
+            continue
+        before = q[tokens[i - 1][1]:tokens[i - 1][2]] if i else ""
+        after = q[tokens[i + 1][1]:tokens[i + 1][2]] \
+            if i + 1 < len(tokens) else ""
+        if before not in (".", ":") and after != "(":
+            names.add(name(q[start:end]))
+    return names
+
+
+class Optimizer(Rewriter):
+    """Rewrites queries using ``statistics``, see the module docstring."""
+
+    def __init__(self, statistics, cache_size=4096):
+        super(Optimizer, self).__init__(cache_size)
+        self.statistics = statistics
+
+    def segments(self, q):
+        return self.analyze(q)[0]
+
+    def suggestions(self, q):
+        """What the rewrite of ``q`` changes and what it leaves alone, as
+        ``Suggestion(kind, message)`` tuples."""
+        return self.analyze(q)[1]
+
+    def analyze(self, q):
+        """Return ``(segments, suggestions)`` for ``q``."""
+        clauses = parse(q)["clauses"]
+        buf = spans.scan(q)
+        significant = [token for token in buf if token[0] != spans.SPACE]
+        segments = []
+        suggestions = []
+        last = 0
+        # Variables of earlier clauses of the same UNION part.
+        bound = set()
+        for i, (kind, start, end) in enumerate(clauses):
+            tokens = [t for t in significant if start <= t[1] < end]
+            if kind == "union":
+                bound = set()
+            if kind != "match":
+                bound.update(_references(q, tokens))
+                continue
+            where = []
+            if i + 1 < len(clauses) and clauses[i + 1][0] == "where":
+                where_start, where_end = clauses[i + 1][1:]
+                where = [t for t in significant
+                         if where_start <= t[1] < where_end][1:]
+            rewritten = self._clause(q, _Clause(q, tokens), where, bound,
+                                     suggestions)
+            bound.update(_references(q, tokens))
+            if rewritten is not None:
+                segments.append((last, start))
+                segments.extend(rewritten)
+                last = (where or tokens)[-1][2]
+        segments.append((last, len(q)))
+        return segments, suggestions
+
+    def _clause(self, q, clause, where, bound, suggestions):
+        # Output segments for the clause and its WHERE up to the last
+        # significant token, or None to keep them as they are. Nodes
+        # ``bound`` by earlier clauses are one row each.
+        statistics = self.statistics
+        conjuncts = _conjuncts(q, where) if where else []
+        nodes = [item for pattern in clause.patterns for item in pattern
+                 if isinstance(item, _Node)]
+        labels = collections.defaultdict(set)
+        keys = collections.defaultdict(set)
+        for node in nodes:
+            labels[node.alias].update(node.labels)
+            keys[node.alias].update(node.keys)
+
+        remaining = []
+        changed = False
+        for conjunct in conjuncts:
+            equality = _equality(q, conjunct)
+            if equality is not None and equality[0] in labels:
+                alias, key, literal = equality
+                keys[alias].add(name(key))
+                target = self._index_target(nodes, alias, name(key))
+                if target is not None:
+                    node, label = target
+                    node.pushed.append((key, literal))
+                    changed = True
+                    suggestions.append(Suggestion("index",
+                        "%s uses the index on :%s(%s) from the pattern" % (
+                        q[conjunct[0][1]:conjunct[-1][2]], label,
+                        name(key))))
+                    continue
+            remaining.append(conjunct)
+
+        def estimate(node):
+            if node.alias in bound:
+                return INDEX_SEEK
+            if node.alias is None:
+                return statistics.estimate(node.labels, node.keys)
+            return statistics.estimate(labels[node.alias], keys[node.alias])
+
+        # Each path from its most selective end.
+        reversed_patterns = set()
+        scores = []
+        for p, pattern in enumerate(clause.patterns):
+            estimates = [estimate(item) for item in pattern[::2]]
+            best = estimates.index(min(estimates))
+            scores.append(estimates[best])
+            if clause.path is None and best > (len(estimates) - 1) / 2.0:
+                reversed_patterns.add(p)
+                changed = True
+                suggestions.append(Suggestion("anchor",
+                    "%s starts from %s, an estimated %d rows" % (
+                    self._pattern_text(q, pattern),
+                    self._pattern_text(q, [pattern[2 * best]]),
+                    estimates[best])))
+
+        # Patterns grouped by connected component, most selective first.
+        graph = PatternGraph()
+        firsts = []
+        for pattern in clause.patterns:
+            previous = edge = None
+            for item in pattern:
+                if isinstance(item, _Edge):
+                    edge = item
+                    continue
+                node = graph.add_node(item.alias, ())
+                if previous is None:
+                    firsts.append(node)
+                else:
+                    graph.add_edge(previous, node, edge.left or edge.right)
+                previous = node
+        components = graph.components()
+        groups = collections.OrderedDict()
+        for p, first in enumerate(firsts):
+            groups.setdefault(components[first], []).append(p)
+        groups = sorted((sorted(group, key=scores.__getitem__)
+                         for group in groups.values()),
+                        key=lambda group: scores[group[0]])
+        if len(groups) > 1:
+            with_edges = sum(1 for group in groups
+                             if any(len(clause.patterns[p]) > 1
+                                    for p in group))
+            parts = " and ".join(", ".join(self._pattern_text(
+                q, clause.patterns[p]) for p in group) for group in groups)
+            if clause.optional or with_edges > 1:
+                suggestions.append(Suggestion("cartesian",
+                    "cartesian product of %s" % parts))
+                groups = [[p for group in groups for p in group]]
+            else:
+                changed = True
+                suggestions.append(Suggestion("cartesian",
+                    "cartesian product of %s split into MATCH clauses" %
+                    parts))
+        order = [p for group in groups for p in group]
+        if order != sorted(order):
+            changed = True
+            suggestions.append(Suggestion("order",
+                "patterns ordered by selectivity: %s" % ", ".join(
+                self._pattern_text(q, clause.patterns[p]) for p in order)))
+        if not changed:
+            return None
+
+        # Each remaining predicate follows the first group binding all the
+        # variables it uses.
+        binding = {clause.path_alias: 0}
+        for g, group in enumerate(groups):
+            for p in group:
+                for item in clause.patterns[p]:
+                    if item.alias is not None:
+                        binding.setdefault(item.alias, g)
+        placed = [[] for _ in groups]
+        for conjunct in remaining:
+            placed[max([binding[ref] for ref in _references(q, conjunct)
+                        if ref in binding] or [0])].append(conjunct)
+
+        out = []
+        for g, group in enumerate(groups):
+            out.append(clause.head if g == 0 else " MATCH")
+            out.append(" ")
+            if clause.path is not None:
+                out.append(clause.path)
+            for n, p in enumerate(group):
+                if n:
+                    out.append(", ")
+                out.extend(self._pattern(clause.patterns[p],
+                                         p in reversed_patterns))
+            for n, conjunct in enumerate(placed[g]):
+                out.append(" WHERE " if n == 0 else " AND ")
+                out.append((conjunct[0][1], conjunct[-1][2]))
+        return out
+
+    def _index_target(self, nodes, alias, key):
+        # (node, label) to move an equality on alias.key into, or None.
+        for node in nodes:
+            if node.alias != alias or key in node.keys or \
+                    key in (name(k) for k, literal in node.pushed):
+                continue
+            for label in node.labels:
+                if self.statistics.indexed(label, key):
+                    return node, label
+        return None
+
+    def _pattern_text(self, q, pattern):
+        return q[pattern[0].start:pattern[-1].end]
+
+    def _pattern(self, pattern, reverse):
+        out = []
+        for item in (pattern[::-1] if reverse else pattern):
+            if isinstance(item, _Edge):
+                if reverse:
+                    out.append("<-" if item.right else "-")
+                    if item.content is not None:
+                        out.append(item.content)
+                    out.append("->" if item.left else "-")
+                else:
+                    out.append((item.start, item.end))
+                continue
+            if not item.pushed:
+                out.append((item.start, item.end))
+                continue
+            entries = []
+            for key, literal in item.pushed:
+                entries.extend([", " if entries else "", key + ": ",
+                                literal])
+            if item.close is None:
+                out.extend([(item.start, item.end - 1), " {"] + entries +
+                           ["}", (item.end - 1, item.end)])
+            else:
+                out.extend([(item.start, item.close), ", "] + entries +
+                           [(item.close, item.end)])
+        return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ro.optimize",
+        description="Rewrite read queries using database statistics.")
+    parser.add_argument("queries", nargs="*", metavar="QUERY",
+        help="queries to rewrite, one per line of standard input if none")
+    parser.add_argument("--stats", required=True, metavar="FILE",
+        help="JSON statistics snapshot")
+    args = parser.parse_args(argv)
+
+    optimizer = Optimizer(Statistics.load(args.stats))
+    queries = args.queries or [line.strip() for line in sys.stdin
+                               if line.strip()]
+    for q in queries:
+        suggestions = [dict(s._asdict()) for s in optimizer.suggestions(q)]
+        print(json.dumps({"query": q, "rewritten": optimizer.rewrite(q),
+                          "suggestions": suggestions}, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from ro.grammar import query
+from ro.optimize import Optimizer, Statistics
+
+
+STATS = {"nodes": 10000, "labels": {"Person": 9000, "Admin": 12,
+                                    "City": 300},
+         "indexes": {"Person": ["name"], "City": ["name"]}}
+
+
+class StatisticsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def load(self, snapshot):
+        path = os.path.join(self.dir, "stats.json")
+        with open(path, "w") as f:
+            json.dump(snapshot, f)
+        return Statistics.load(path)
+
+    def test_short_form(self):
+        stats = self.load(STATS)
+        self.assertEqual(stats.nodes, 10000)
+        self.assertTrue(stats.indexed("Person", "name"))
+        self.assertFalse(stats.indexed("Admin", "name"))
+        self.assertEqual(stats.estimate(["Person", "Admin"]), 12)
+        self.assertEqual(stats.estimate([]), 10000)
+        self.assertEqual(stats.estimate(["Person"], ["name"]), 1)
+        self.assertAlmostEqual(stats.estimate(["Admin"], ["age"]), 1.2)
+
+    def test_graph_counts(self):
+        stats = self.load({
+            "nodes": [{"count": 500}, {"label": "Person", "count": 400}],
+            "relationships": [{"count": 900}],
+            "indexes": [{"labels": ["Person"], "properties": ["name"]},
+                        {"labels": ["Person"], "properties": ["a", "b"]}]})
+        self.assertEqual(stats.nodes, 500)
+        self.assertEqual(stats.labels, {"Person": 400})
+        self.assertTrue(stats.indexed("Person", "name"))
+        self.assertFalse(stats.indexed("Person", "a"))
+
+
+class OptimizerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.optimizer = Optimizer(Statistics.from_dict(STATS))
+
+    def assertRewrite(self, q, expected, kinds):
+        rewritten = self.optimizer.rewrite(q)
+        self.assertEqual(rewritten, expected)
+        query.parseString(rewritten)
+        self.assertEqual([s.kind for s in self.optimizer.suggestions(q)],
+                         kinds)
+
+    def test_index_predicates(self):
+        self.assertRewrite(
+            "MATCH (p:Person)-->(f) WHERE p.name = 'dave' RETURN f",
+            "MATCH (p:Person {name: 'dave'})-->(f) RETURN f", ["index"])
+        self.assertRewrite(
+            "MATCH (p:Person {age: 3})-->(f) WHERE p.name = 'dave' AND "
+            "f.age > 3 RETURN f",
+            "MATCH (p:Person {age: 3, name: 'dave'})-->(f) WHERE f.age > 3 "
+            "RETURN f", ["index"])
+
+    def test_unindexed_predicates_stay(self):
+        for q in ["MATCH (p:Person)-->(f) WHERE p.age = 3 RETURN f",
+                  "MATCH (p:Person {name: 'a'}) WHERE p.name = 'b' RETURN p",
+                  "MATCH (p:Person) WHERE p.name = 'a' OR p.age = 3 "
+                  "RETURN p",
+                  "MATCH (p:Person) WITH p MATCH (p)-->(f) "
+                  "WHERE p.name = 'a' RETURN f"]:
+            self.assertRewrite(q, q, [])
+
+    def test_anchor(self):
+        self.assertRewrite(
+            "MATCH (p:Person)-[:KNOWS {w: 1}]->(a:Admin) RETURN p",
+            "MATCH (a:Admin)<-[:KNOWS {w: 1}]-(p:Person) RETURN p",
+            ["anchor"])
+        self.assertRewrite(
+            "MATCH (p:Person)<--(f)--(a:Admin) RETURN p",
+            "MATCH (a:Admin)--(f)-->(p:Person) RETURN p", ["anchor"])
+        self.assertRewrite(
+            "MATCH (a) WITH a MATCH (p:Person)-->(a) RETURN p",
+            "MATCH (a) WITH a MATCH (a)<--(p:Person) RETURN p", ["anchor"])
+        q = "MATCH x=(p:Person)-->(a:Admin) RETURN x"
+        self.assertRewrite(q, q, [])
+
+    def test_cartesian_split(self):
+        self.assertRewrite(
+            "MATCH (p:Person)-->(f), (c:City) WHERE c.name = 'x' AND "
+            "p.age > 3 AND f.age = c.age RETURN p",
+            "MATCH (c:City {name: 'x'}) MATCH (p:Person)-->(f) "
+            "WHERE p.age > 3 AND f.age = c.age RETURN p",
+            ["index", "cartesian", "order"])
+        self.assertRewrite(
+            "MATCH (p:Person), (a:Admin) WHERE a.age > 3 RETURN p",
+            "MATCH (a:Admin) WHERE a.age > 3 MATCH (p:Person) RETURN p",
+            ["cartesian", "order"])
+
+    def test_cartesian_reported(self):
+        self.assertRewrite(
+            "MATCH (p:Person)-->(q), (c:City)-->(d) RETURN p",
+            "MATCH (c:City)-->(d), (p:Person)-->(q) RETURN p",
+            ["cartesian", "order"])
+        self.assertRewrite(
+            "OPTIONAL MATCH (a:Admin), (c:City) RETURN a",
+            "OPTIONAL MATCH (a:Admin), (c:City) RETURN a", ["cartesian"])
+
+    def test_union(self):
+        self.assertRewrite(
+            "MATCH (a)-->(p:Person) WHERE p.name = 'x' RETURN a UNION "
+            "MATCH (b)-->(c:City) RETURN b",
+            "MATCH (p:Person {name: 'x'})<--(a) RETURN a UNION "
+            "MATCH (c:City)<--(b) RETURN b", ["index", "anchor", "anchor"])
+
+    def test_cached_shape(self):
+        rewrite = self.optimizer.rewrite
+        rewrite("MATCH (p:Person)-->(f) WHERE p.name = 'a' RETURN f")
+        self.assertEqual(
+            rewrite("MATCH (p:Person)-->(f) WHERE p.name = 'b' RETURN f"),
+            "MATCH (p:Person {name: 'b'})-->(f) RETURN f")
+        self.assertEqual(len(self.optimizer._cache), 1)
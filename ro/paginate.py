@@ -0,0 +1,201 @@
+"""
+Bounded result sets for read queries.
+
+``Paginator`` rewrites the projections of a query so that none of them can
+return an unbounded number of rows:
+
+* A RETURN without LIMIT gets ``LIMIT default_limit``, after its ORDER BY and
+SKIP. Each part of a UNION is limited on its own, as Cypher does.
+
+* A LIMIT above ``max_limit``, in RETURN or WITH, is clamped to it.
+
+A SKIP of ``deep_skip`` rows or more still reads every skipped row. When the
+RETURN is ordered by a single property, ``suggestions`` proposes keyset
+pagination instead, and ``keyset`` turns the query into the request for the
+page after a given sort value:
+
+    MATCH (n:Event) RETURN n ORDER BY n.at SKIP 50000 LIMIT 50
+    MATCH (n:Event) WHERE n.at > 1700000000 RETURN n ORDER BY n.at LIMIT 50
+
+Keyset pages are only exact when the sort property is unique.
+
+Rewritten queries are parsed again, whether their template was just
+compiled or came from the cache, and the cache key is the query shape plus
+which of its LIMITs are clamped, the only literal values a rewrite depends
+on.
+"""
+import re
+
+from . import spans
+from .grammar import parse
+from .rewrite import Rewriter, Suggestion
+
+
+AGGREGATES = frozenset(["COUNT", "SUM", "PERCENTILEDISC", "STDEV"])
+
+_LIMIT = re.compile(r"\bLIMIT\s*$", re.I)
+
+
+def literal(value):
+    """Cypher literal for a Python string or number."""
+    if isinstance(value, str):
+        return "'%s'" % value.replace("\\", "\\\\").replace("'", "\\'")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError("keyset values are strings or numbers, not %r" %
+                        (value,))
+    return repr(value)
+
+
+class Paginator(Rewriter):
+    """LIMIT injection and clamping, see the module docstring."""
+
+    def __init__(self, default_limit=1000, max_limit=10000, deep_skip=1000,
+                 cache_size=4096):
+        super(Paginator, self).__init__(cache_size)
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.deep_skip = deep_skip
+
+    def cache_key(self, q, key, spans):
+        # A LIMIT that is not an integer is rejected by the check.
+        clamped = "".join("1" if q[start:end].isdigit() and
+                          int(q[start:end]) > self.max_limit else "0"
+                          for start, end in spans
+                          if _LIMIT.search(q, 0, start))
+        return key + "\0" + clamped
+
+    def check(self, q, rewritten):
+        super(Paginator, self).check(q, rewritten)
+        parse(rewritten)
+
+    def segments(self, q):
+        segments = self.analyze(q)[0]
+        parse("".join(q[s[0]:s[1]] if isinstance(s, tuple) else s
+                      for s in segments))
+        return segments
+
+    def suggestions(self, q):
+        """What the rewrite of ``q`` changes, and keyset pagination hints,
+        as ``Suggestion(kind, message)`` tuples."""
+        return self.analyze(q)[1]
+
+    def analyze(self, q):
+        """Return ``(segments, suggestions)`` for ``q``."""
+        clauses, tokens = _clauses(q)
+        segments = []
+        suggestions = []
+        last = 0
+        for i, (kind, start, end) in enumerate(clauses):
+            if kind == "limit":
+                value = tokens[i][1]
+                if int(q[value[1]:value[2]]) > self.max_limit:
+                    segments.extend([(last, value[1]), str(self.max_limit)])
+                    last = value[2]
+                    suggestions.append(Suggestion("clamp",
+                        "LIMIT %s clamped to %d" % (q[value[1]:value[2]],
+                                                    self.max_limit)))
+            elif kind == "skip":
+                value = tokens[i][1]
+                skipped = int(q[value[1]:value[2]])
+                if skipped >= self.deep_skip:
+                    suggestions.append(self._skip_hint(q, clauses, tokens, i,
+                                                       skipped))
+            if kind != "return":
+                continue
+            j = i + 1
+            while j < len(clauses) and clauses[j][0] in ("order", "skip"):
+                j += 1
+            if j == len(clauses) or clauses[j][0] != "limit":
+                end = clauses[j - 1][2]
+                segments.extend([(last, end),
+                                 " LIMIT %d" % self.default_limit])
+                last = end
+                suggestions.append(Suggestion("limit",
+                    "LIMIT %d added to %s" % (self.default_limit,
+                                              q[start:end])))
+        segments.append((last, len(q)))
+        return segments, suggestions
+
+    def _skip_hint(self, q, clauses, tokens, i, skipped):
+        key = _keyset_key(q, clauses, tokens, i)
+        if key is None:
+            return Suggestion("skip",
+                "SKIP %d reads and discards %d rows, ORDER BY a single "
+                "property would allow keyset pagination" % (skipped, skipped))
+        return Suggestion("keyset",
+            "SKIP %d reads and discards %d rows, filter on %s beyond the "
+            "last value of the previous page instead" % (skipped, skipped,
+                                                         key[0]))
+
+    def keyset(self, q, last):
+        """
+        ``q`` without its SKIP, filtered to rows sorting after ``last`` in its
+        ORDER BY. Raises ``ValueError`` if the query cannot be paged that way:
+        it must be a single part whose RETURN follows a MATCH or its WHERE,
+        does not aggregate, and has SKIP and an ORDER BY on one property.
+        """
+        clauses, tokens = _clauses(q)
+        kinds = [kind for kind, start, end in clauses]
+        if "union" in kinds:
+            raise ValueError("keyset pagination of a UNION is not supported")
+        r = kinds.index("return")
+        skips = [i for i in range(r + 1, len(kinds)) if kinds[i] == "skip"]
+        key = skips and _keyset_key(q, clauses, tokens, skips[0])
+        if not key:
+            raise ValueError("keyset pagination needs SKIP and an ORDER BY "
+                             "on a single property of a non-aggregating "
+                             "RETURN")
+        i = skips[0]
+        prop, descending = key
+        predicate = "%s %s %s" % (prop, "<" if descending else ">",
+                                  literal(last))
+        before = clauses[r - 1] if r else None
+        if before is None or before[0] not in ("match", "where") or \
+                before[0] == "where" and kinds[r - 2] != "match":
+            raise ValueError("keyset pagination needs the RETURN to follow "
+                             "a MATCH")
+        parts = []
+        if before[0] == "where":
+            body = tokens[r - 1][1:]
+            conditions = q[body[0][1]:body[-1][2]]
+            if any(q[s:e].upper() in ("OR", "XOR") for k, s, e in body
+                   if k == spans.IDENTIFIER):
+                conditions = "(%s)" % conditions
+            parts.extend([q[:body[0][1]], conditions, " AND ", predicate])
+        else:
+            parts.extend([q[:before[2]], " WHERE ", predicate])
+        parts.append(q[before[2]:clauses[i][1]])
+        parts.append(q[clauses[i + 1][1]:] if i + 1 < len(clauses) else "")
+        rewritten = "".join(parts).rstrip()
+        parse(rewritten)
+        return rewritten
+
+
+def _clauses(q):
+    # The clause spans of q and the significant tokens of each.
+    clauses = list(parse(q)["clauses"])
+    significant = [token for token in spans.scan(q)
+                   if token[0] != spans.SPACE]
+    return clauses, [[t for t in significant if start <= t[1] < end]
+                     for kind, start, end in clauses]
+
+
+def _keyset_key(q, clauses, tokens, i):
+    # (property text, descending) of the single property ORDER BY of the
+    # RETURN that skip clause i belongs to, or None.
+    if clauses[i - 1][0] != "order" or clauses[i - 2][0] != "return":
+        return None
+    returned = tokens[i - 2]
+    for n, (kind, start, end) in enumerate(returned):
+        word = q[start:end].upper()
+        after = q[returned[n + 1][1]:returned[n + 1][2]] \
+            if n + 1 < len(returned) else ""
+        if word == "DISTINCT" or word in AGGREGATES and after == "(":
+            return None
+    order = [q[start:end] for kind, start, end in tokens[i - 1][2:]]
+    direction = order[3:]
+    if len(order) < 3 or order[1] != "." or len(direction) > 1 or \
+            direction and direction[0].upper() not in ("ASC", "DESC"):
+        return None
+    return "".join(order[:3]), bool(direction) and \
+        direction[0].upper() == "DESC"
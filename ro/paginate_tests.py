@@ -0,0 +1,88 @@
+import unittest
+from pyparsing import ParseException
+from ro.paginate import Paginator, literal
+
+
+class PaginatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.paginator = Paginator(default_limit=100, max_limit=500,
+                                   deep_skip=1000)
+
+    def assertRewrite(self, q, expected, kinds):
+        self.assertEqual(self.paginator.rewrite(q), expected)
+        self.assertEqual([s.kind for s in self.paginator.suggestions(q)],
+                         kinds)
+
+    def test_inject(self):
+        self.assertRewrite("MATCH (n) RETURN n",
+                           "MATCH (n) RETURN n LIMIT 100", ["limit"])
+        self.assertRewrite("MATCH (n) RETURN n ORDER BY n.x SKIP 10",
+                           "MATCH (n) RETURN n ORDER BY n.x SKIP 10 LIMIT 100",
+                           ["limit"])
+        self.assertRewrite("MATCH (n) RETURN n LIMIT 5 UNION MATCH (m) "
+                           "RETURN m",
+                           "MATCH (n) RETURN n LIMIT 5 UNION MATCH (m) "
+                           "RETURN m LIMIT 100", ["limit"])
+
+    def test_clamp(self):
+        self.assertRewrite("MATCH (n) WITH n LIMIT 100000 RETURN n LIMIT 9",
+                           "MATCH (n) WITH n LIMIT 500 RETURN n LIMIT 9",
+                           ["clamp"])
+        self.assertRewrite("MATCH (n) RETURN n LIMIT 500",
+                           "MATCH (n) RETURN n LIMIT 500", [])
+
+    def test_cache_key(self):
+        rewrite = self.paginator.rewrite
+        self.assertEqual(rewrite("MATCH (n) RETURN n LIMIT 9999"),
+                         "MATCH (n) RETURN n LIMIT 500")
+        self.assertEqual(rewrite("MATCH (n) RETURN n LIMIT 50"),
+                         "MATCH (n) RETURN n LIMIT 50")
+        self.assertEqual(rewrite("MATCH (n) RETURN n LIMIT 600"),
+                         "MATCH (n) RETURN n LIMIT 500")
+        self.assertEqual(len(self.paginator._cache), 2)
+
+    def test_invalid_cached_shape(self):
+        rewrite = self.paginator.rewrite
+        rewrite("MATCH (n) RETURN n SKIP 5 LIMIT 5")
+        for q in ("MATCH (n) RETURN n SKIP 5 LIMIT 1.5",
+                  "MATCH (n) RETURN n SKIP -5 LIMIT 5",
+                  "MATCH (n) RETURN n SKIP 'x' LIMIT 5"):
+            self.assertRaises(ParseException, rewrite, q)
+
+    def test_hints(self):
+        self.assertEqual(
+            [s.kind for s in self.paginator.suggestions(
+                "MATCH (n) RETURN n ORDER BY n.at SKIP 5000 LIMIT 5")],
+            ["keyset"])
+        for q in ["MATCH (n) RETURN n SKIP 5000 LIMIT 5",
+                  "MATCH (n) RETURN count(n) ORDER BY n.at SKIP 5000 LIMIT 5",
+                  "MATCH (n) RETURN n ORDER BY n.at, n.id SKIP 5000 LIMIT 5"]:
+            self.assertEqual([s.kind for s in self.paginator.suggestions(q)],
+                             ["skip"])
+        self.assertEqual(self.paginator.suggestions(
+            "MATCH (n) RETURN n ORDER BY n.at SKIP 999 LIMIT 5"), [])
+
+    def test_keyset(self):
+        keyset = self.paginator.keyset
+        self.assertEqual(
+            keyset("MATCH (n:Event) RETURN n ORDER BY n.at SKIP 50000 "
+                   "LIMIT 50", 1700000000),
+            "MATCH (n:Event) WHERE n.at > 1700000000 RETURN n ORDER BY n.at "
+            "LIMIT 50")
+        self.assertEqual(
+            keyset("MATCH (n) WHERE n.a = 1 OR n.b = 2 RETURN n "
+                   "ORDER BY n.name DESC SKIP 50", "it's"),
+            "MATCH (n) WHERE (n.a = 1 OR n.b = 2) AND n.name < 'it\\'s' "
+            "RETURN n ORDER BY n.name DESC")
+        for q in ["MATCH (n) RETURN n ORDER BY n.at LIMIT 5",
+                  "MATCH (n) WITH n RETURN n ORDER BY n.at SKIP 5",
+                  "MATCH (n) RETURN n ORDER BY n.at SKIP 5 UNION "
+                  "MATCH (n) RETURN n"]:
+            self.assertRaises(ValueError, keyset, q, 1)
+
+    def test_literal(self):
+        self.assertEqual(literal("a'b\\"), "'a\\'b\\\\'")
+        self.assertEqual(literal(2.5), "2.5")
+        self.assertRaises(TypeError, literal, None)
+        self.assertRaises(TypeError, literal, True)
@@ -0,0 +1,318 @@
+"""
+MATCH patterns as graphs.
+
+Every MATCH and OPTIONAL MATCH pattern of a query part becomes a
+``PatternGraph``. Parts are separated by UNION. Pattern nodes are the node
+patterns, and a variable names the same node wherever it appears in the
+part, until a WITH that does not carry it over. A WITH can also rename a
+node, as in ``WITH a AS b``. Pattern edges are the relationship patterns, with their direction,
+types and hop bounds.
+
+The graph is kept in ``array`` columns, one row per edge. Outgoing edges are
+stored from their tail, so ``(a)<--(b)`` is the edge ``b -> a``. Undirected
+edges have ``directed`` set to 0. Adjacency is a compressed sparse row
+index, ``offsets`` into ``incident``, built when the parse of the clause
+ends, so the queries on it never rescan the pattern:
+
+    graph, = graphs(query, "MATCH (a)-[:KNOWS*]->(b), (c) RETURN a")
+    graph.component_count()    # 2, a cartesian product
+    graph.unbounded()          # [0]
+    graph.longest_path()       # [0]
+
+Pattern predicates in WHERE are not part of the graph, and neither are the
+patterns of a ``CALL {}`` subquery: ``PatternBuilder.subqueries`` has the
+graphs of each subquery, one per UNION part of it, as ``graphs`` has those
+of the query.
+"""
+import array
+import re
+
+from .grammar import IDENTIFIER, QUOTED_IDENTIFIER, name, parse
+from .hooks import listening
+
+
+UNBOUNDED = -1
+
+_VARIABLE = re.compile(r"(?:%s|%s)$" % (IDENTIFIER, QUOTED_IDENTIFIER))
+
+
+class PatternGraph(object):
+    """Nodes and edges of the MATCH patterns of one query part."""
+
+    def __init__(self):
+        self.names = []
+        self.labels = []
+        self.tail = array.array("i")
+        self.head = array.array("i")
+        self.directed = array.array("b")
+        self.min_hops = array.array("i")
+        self.max_hops = array.array("i")
+        self.types = []
+        self.optional = array.array("b")
+        self._index = {}
+        self._offsets = None
+        self._incident = None
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def edge_count(self):
+        return len(self.tail)
+
+    def add_node(self, alias, labels):
+        """Index of the node ``alias``, added unless it is already known."""
+        if alias is not None and alias in self._index:
+            node = self._index[alias]
+            self.labels[node] = self.labels[node] | frozenset(labels)
+            return node
+        node = len(self.names)
+        self.names.append(alias)
+        self.labels.append(frozenset(labels))
+        if alias is not None:
+            self._index[alias] = node
+        self._offsets = None
+        return node
+
+    def add_edge(self, tail, head, directed, types=(), min_hops=1,
+                 max_hops=1, optional=False):
+        self.tail.append(tail)
+        self.head.append(head)
+        self.directed.append(1 if directed else 0)
+        self.min_hops.append(min_hops)
+        self.max_hops.append(max_hops)
+        self.types.append(tuple(types))
+        self.optional.append(1 if optional else 0)
+        self._offsets = None
+
+    def node(self, alias):
+        return self._index.get(alias)
+
+    def rebind(self, aliases):
+        """Make ``aliases``, mapping names to nodes, the only names
+        ``add_node`` knows, as after a WITH."""
+        self._index = dict(aliases)
+
+    def _adjacency(self):
+        if self._offsets is None:
+            counts = [0] * (len(self.names) + 1)
+            for tail, head in zip(self.tail, self.head):
+                counts[tail + 1] += 1
+                counts[head + 1] += 1
+            for i in range(len(self.names)):
+                counts[i + 1] += counts[i]
+            offsets = array.array("i", counts)
+            incident = array.array("i", [0] * counts[-1])
+            fill = list(counts[:-1])
+            for edge, (tail, head) in enumerate(zip(self.tail, self.head)):
+                incident[fill[tail]] = edge
+                fill[tail] += 1
+                incident[fill[head]] = edge
+                fill[head] += 1
+            self._offsets, self._incident = offsets, incident
+        return self._offsets, self._incident
+
+    def neighbours(self, node):
+        """``(edge, other node)`` for every edge at ``node``, any direction."""
+        offsets, incident = self._adjacency()
+        for i in range(offsets[node], offsets[node + 1]):
+            edge = incident[i]
+            tail = self.tail[edge]
+            yield edge, self.head[edge] if tail == node else tail
+
+    def components(self):
+        """Component index of every node, numbered in order of appearance."""
+        parent = list(range(len(self.names)))
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for tail, head in zip(self.tail, self.head):
+            a, b = find(tail), find(head)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+        numbers = {}
+        return array.array("i", [numbers.setdefault(find(node), len(numbers))
+                                 for node in range(len(self.names))])
+
+    def component_count(self):
+        """Number of connected components, more than one being a cartesian
+        product."""
+        components = self.components()
+        return max(components) + 1 if components else 0
+
+    def unbounded(self):
+        """Indexes of the variable length edges without an upper bound."""
+        return [edge for edge, hops in enumerate(self.max_hops)
+                if hops == UNBOUNDED]
+
+    def longest_path(self):
+        """
+        Edge indexes of a longest simple path, ignoring direction. Patterns
+        are small, so this is an exhaustive depth first search from every
+        node.
+        """
+        best = []
+        used = set()
+        path = []
+
+        def extend(node):
+            if len(path) > len(best):
+                best[:] = path
+            for edge, other in self.neighbours(node):
+                if edge in used or other in visited:
+                    continue
+                used.add(edge)
+                visited.add(other)
+                path.append(edge)
+                extend(other)
+                path.pop()
+                visited.discard(other)
+                used.discard(edge)
+
+        for start in range(len(self.names)):
+            visited = {start}
+            extend(start)
+        return best
+
+
+def _skip_space(tokens, i):
+    while i < len(tokens) and not tokens[i].strip():
+        i += 1
+    return i
+
+
+def _node(tokens, i):
+    # tokens[i] is "(", returns (alias, labels, index after ")").
+    i = _skip_space(tokens, i + 1)
+    alias = None
+    labels = []
+    if tokens[i] not in (":", "{", ")"):
+        alias = name(tokens[i])
+        i += 1
+    while tokens[i] != ")":
+        if tokens[i] == ":":
+            labels.append(name(tokens[i + 1]))
+            i += 2
+        elif tokens[i] == "{":
+            while tokens[i] != "}":
+                i += 1
+            i += 1
+        else:
+            i += 1
+    return alias, labels, i + 1
+
+
+def _edge(tokens, i):
+    # tokens[i] is "<" or "-", returns (direction, types, min, max, index
+    # after the edge). direction is 1 for ->, -1 for <- and 0 for --.
+    left = tokens[i] == "<"
+    i += 2 if left else 1
+    types = []
+    low = high = 1
+    if tokens[i] == "[":
+        while tokens[i] != "]":
+            token = tokens[i]
+            if token == ":":
+                types.append(name(tokens[i + 1]))
+                i += 1
+            elif token == "{":
+                while tokens[i] != "}":
+                    i += 1
+            elif token == "*":
+                low, high = 1, UNBOUNDED
+                if tokens[i + 1] != "]" and tokens[i + 1].isdigit():
+                    low, high = int(tokens[i + 1]), int(tokens[i + 3])
+                    i += 3
+            i += 1
+        i += 1
+    i += 1  # the closing "-"
+    if i < len(tokens) and tokens[i] == ">":
+        return 1, types, low, high, i + 1
+    return -1 if left else 0, types, low, high, i
+
+
+class PatternBuilder(object):
+    """Listener building a ``PatternGraph`` per query part."""
+
+    def __init__(self):
+        self.graphs = [PatternGraph()]
+        self.subqueries = []
+        self._outer = []
+        self._carried = None
+
+    def with_kwrd(self, s, loc, toks):
+        self._carried = {}
+
+    def as_stmt(self, s, loc, toks):
+        if self._carried is not None:
+            # left, space, AS, space, alias when the left is a variable.
+            node = None
+            if len(toks) == 5 and _VARIABLE.match(toks[0]):
+                node = self.graphs[-1].node(name(toks[0]))
+            self._carried[name(toks[-1])] = node
+
+    def with_obj(self, s, loc, toks):
+        if len(toks) == 1:
+            self._carried[name(toks[0])] = self.graphs[-1].node(name(toks[0]))
+
+    def with_stmt(self, s, loc, toks):
+        self.graphs[-1].rebind((alias, node) for alias, node
+                               in self._carried.items() if node is not None)
+        self._carried = None
+
+    def union_stmt(self, s, loc, toks):
+        self.graphs.append(PatternGraph())
+
+    def call(self, s, loc, toks):
+        self._outer.append(self.graphs)
+        self.graphs = [PatternGraph()]
+
+    def procedure_call(self, s, loc, toks):
+        self.graphs = self._outer.pop()
+
+    def subquery(self, s, loc, toks):
+        self.subqueries.append(self.graphs)
+        self.graphs = self._outer.pop()
+
+    def match_stmt(self, s, loc, toks):
+        graph = self.graphs[-1]
+        tokens = toks.asList()
+        optional = tokens[0].upper() == "OPTIONAL"
+        previous = None
+        pending = None
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token == "(":
+                alias, labels, i = _node(tokens, i)
+                node = graph.add_node(alias, labels)
+                if pending is not None:
+                    direction, types, low, high = pending
+                    tail, head = previous, node
+                    if direction < 0:
+                        tail, head = head, tail
+                    graph.add_edge(tail, head, direction != 0, types, low,
+                                   high, optional)
+                    pending = None
+                previous = node
+            elif token in ("-", "<") and previous is not None:
+                direction, types, low, high, i = _edge(tokens, i)
+                pending = (direction, types, low, high)
+            elif token == ",":
+                previous = None
+                i += 1
+            else:
+                i += 1
+
+
+def graphs(element, query):
+    """Parse ``query`` with ``element`` and return its pattern graphs, one
+    per UNION part."""
+    builder = PatternBuilder()
+    with listening(builder):
+        parse(query, element)
+    return builder.graphs
@@ -0,0 +1,89 @@
+import unittest
+from ro.grammar import parse, query
+from ro.hooks import listening
+from ro.pattern import UNBOUNDED, PatternBuilder, PatternGraph, graphs
+
+
+def graph(q):
+    result, = graphs(query, q)
+    return result
+
+
+class PatternTests(unittest.TestCase):
+
+    def test_nodes(self):
+        g = graph("MATCH (a:Person)-->(`b c`), (a:Admin)-->() RETURN a")
+        self.assertEqual(g.names, ["a", "b c", None])
+        self.assertEqual(g.labels[0], {"Person", "Admin"})
+        self.assertEqual(g.node("b c"), 1)
+        self.assertEqual(g.edge_count, 2)
+
+    def test_edges(self):
+        g = graph("MATCH (a)-[r:KNOWS:LIKES *1..3]->(b)<-[:X {w: 1}]-(c)"
+                  "--(d) RETURN a")
+        self.assertEqual(list(g.tail), [0, 2, 2])
+        self.assertEqual(list(g.head), [1, 1, 3])
+        self.assertEqual(list(g.directed), [1, 1, 0])
+        self.assertEqual(g.types, [("KNOWS", "LIKES"), ("X",), ()])
+        self.assertEqual(list(g.min_hops), [1, 1, 1])
+        self.assertEqual(list(g.max_hops), [3, 1, 1])
+
+    def test_components(self):
+        g = graph("MATCH (a)-->(b), (c)-->(d) MATCH (d)-->(e), (f) "
+                  "RETURN a")
+        self.assertEqual(list(g.components()), [0, 0, 1, 1, 1, 2])
+        self.assertEqual(g.component_count(), 3)
+        self.assertEqual(graph("MATCH (a)-->(b), (b)-->(c) RETURN a"
+                               ).component_count(), 1)
+        self.assertEqual(PatternGraph().component_count(), 0)
+
+    def test_longest_path(self):
+        g = graph("MATCH (a)-->(b)-->(c), (x)-->(b), (c)<--(y)<--(z) "
+                  "RETURN a")
+        self.assertEqual(len(g.longest_path()), 4)
+        self.assertEqual(graph("MATCH (a) RETURN a").longest_path(), [])
+        cycle = graph("MATCH (a)-->(b)-->(c)-->(a) RETURN a")
+        self.assertEqual(len(cycle.longest_path()), 2)
+
+    def test_unbounded(self):
+        g = graph("MATCH (a)-[*]->(b)-[:X*2..5]-(c)<-[r*]-(d) RETURN a")
+        self.assertEqual(g.unbounded(), [0, 2])
+        self.assertEqual(g.max_hops[0], UNBOUNDED)
+        self.assertEqual((g.min_hops[1], g.max_hops[1]), (2, 5))
+
+    def test_optional(self):
+        g = graph("MATCH (a)-->(b) OPTIONAL MATCH (b)-->(c) RETURN a")
+        self.assertEqual(list(g.optional), [0, 1])
+
+    def test_union(self):
+        first, second = graphs(query, "MATCH (a)-->(b) RETURN a UNION "
+                                      "MATCH (a), (b) RETURN a")
+        self.assertEqual(first.component_count(), 1)
+        self.assertEqual(second.component_count(), 2)
+
+    def test_with(self):
+        g = graph("MATCH (a)-->(b) WITH a MATCH (b) RETURN b")
+        self.assertEqual(g.names, ["a", "b", "b"])
+        self.assertEqual(g.component_count(), 2)
+        g = graph("MATCH (a)-->(b) WITH a, b MATCH (b)-->(c) RETURN c")
+        self.assertEqual(g.component_count(), 1)
+        g = graph("MATCH (a)-->(b) WITH b AS x, count(a) AS a "
+                  "MATCH (x)-->(c), (a) RETURN c")
+        self.assertEqual(list(g.components()), [0, 0, 0, 1])
+
+    def test_subquery(self):
+        builder = PatternBuilder()
+        with listening(builder):
+            parse("MATCH (a) CALL { MATCH (a)-->(b) RETURN b "
+                              "UNION MATCH (c) RETURN c AS b } "
+                              "CALL db.labels() YIELD label "
+                              "MATCH (a)-->(x) RETURN x")
+        outer, = builder.graphs
+        self.assertEqual(outer.names, ["a", "x"])
+        inner, = builder.subqueries
+        self.assertEqual([g.names for g in inner], [["a", "b"], ["c"]])
+
+    def test_where_patterns(self):
+        g = graph("MATCH (a), (b) WHERE (a)-->(b) RETURN a")
+        self.assertEqual(g.edge_count, 0)
+        self.assertEqual(g.component_count(), 2)
@@ -0,0 +1,196 @@
+"""
+Per-tenant read policies evaluated while a query is being parsed.
+
+A policy narrows what the grammar accepts:
+
+* Allowed node labels and relationship types.
+
+* Forbidden property keys, in property maps as well as in ``n.prop`` access.
+
+* A maximum hop count for variable length relationships. A bare ``*`` is
+unbounded and is rejected whenever a maximum is set.
+
+* A mandatory LIMIT on the final RETURN of every UNION part, and an upper
+bound on the value of any LIMIT. A LIMIT on a WITH, or inside a ``CALL {}``
+subquery, does not bound what the query returns.
+
+* Allowed functions.
+
+* Allowed procedures, names or ``namespace.*`` as in the catalogue of
+``procedures``. The grammar only accepts procedures the catalogue declares
+read only, this narrows them down further.
+
+Rules are compiled into frozensets once, procedures into a ``Catalogue``
+trie, so every check is a single lookup on the token that triggered it.
+"""
+import hashlib
+import json
+
+from pyparsing import ParseFatalException
+
+from .grammar import name, parse
+from .hooks import listening
+from .procedures import Catalogue
+
+
+class PolicyViolation(ParseFatalException):
+    """Raised from inside the parse when a query breaks a policy rule."""
+
+
+def _compile(names, fold=False):
+    if names is None:
+        return None
+    if fold:
+        return frozenset(name.lower() for name in names)
+    return frozenset(names)
+
+
+class Policy(object):
+    """
+    Read policy for a single tenant. ``None`` for any of the allow lists
+    means that anything the grammar accepts is allowed.
+    """
+
+    def __init__(self, labels=None, rel_types=None, forbidden_properties=(),
+                 max_hops=None, require_limit=False, max_limit=None,
+                 functions=None, procedures=None):
+        self.labels = _compile(labels)
+        self.rel_types = _compile(rel_types)
+        self.forbidden_properties = frozenset(forbidden_properties)
+        self.max_hops = max_hops
+        self.require_limit = require_limit
+        self.max_limit = max_limit
+        self.functions = _compile(functions, fold=True)
+        self.procedures = None if procedures is None else \
+            Catalogue(procedures)
+
+    @classmethod
+    def from_dict(cls, config):
+        """Build a policy from a tenant configuration mapping."""
+        return cls(**config)
+
+    def as_dict(self):
+        def listed(names):
+            return None if names is None else sorted(names)
+        return {
+            "labels": listed(self.labels),
+            "rel_types": listed(self.rel_types),
+            "forbidden_properties": sorted(self.forbidden_properties),
+            "max_hops": self.max_hops,
+            "require_limit": self.require_limit,
+            "max_limit": self.max_limit,
+            "functions": listed(self.functions),
+            "procedures": None if self.procedures is None else
+                self.procedures.names(),
+        }
+
+    @property
+    def digest(self):
+        """Stable hex digest of the rules, used to key cached verdicts."""
+        try:
+            return self._digest
+        except AttributeError:
+            encoded = json.dumps(self.as_dict(), sort_keys=True).encode("utf-8")
+            self._digest = hashlib.sha1(encoded).hexdigest()
+            return self._digest
+
+    def parse(self, element, query):
+        """
+        Parse ``query`` with ``element`` while enforcing this policy. Returns
+        the parsed tokens, raises ``PolicyViolation`` on a rule violation and
+        ``ParseException`` on a syntax error.
+        """
+        check = PolicyCheck(self)
+        with listening(check):
+            tokens = parse(query, element)
+        check.finish(query)
+        return tokens
+
+
+class PolicyCheck(object):
+    """Listener enforcing a ``Policy`` over the course of one parse."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        # [loc, is_return, limited] for each WITH and RETURN, and the loc of
+        # each UNION, outside subqueries once those are done.
+        self.projections = []
+        self.unions = []
+
+    def label(self, s, loc, toks):
+        allowed = self.policy.labels
+        if allowed is not None and name(toks[1]) not in allowed:
+            raise PolicyViolation(s, loc,
+                "label %r is not allowed" % name(toks[1]))
+
+    def edge_content(self, s, loc, toks):
+        allowed = self.policy.rel_types
+        if allowed is not None:
+            for rel_type in map(name, toks.get("rel_type", ())):
+                if rel_type not in allowed:
+                    raise PolicyViolation(s, loc,
+                        "relationship type %r is not allowed" % rel_type)
+        max_hops = self.policy.max_hops
+        if max_hops is not None and "var_length" in toks:
+            hops = toks.get("max_hops")
+            if hops is None:
+                raise PolicyViolation(s, loc,
+                    "unbounded variable length relationship")
+            if int(hops) > max_hops:
+                raise PolicyViolation(s, loc,
+                    "%s hops exceeds the maximum of %d" % (hops, max_hops))
+
+    def keyval(self, s, loc, toks):
+        if name(toks[0]) in self.policy.forbidden_properties:
+            raise PolicyViolation(s, loc,
+                "property %r is forbidden" % name(toks[0]))
+
+    def gettr(self, s, loc, toks):
+        if name(toks[2]) in self.policy.forbidden_properties:
+            raise PolicyViolation(s, loc,
+                "property %r is forbidden" % name(toks[2]))
+
+    def fns(self, s, loc, toks):
+        allowed = self.policy.functions
+        if allowed is not None and toks[0].lower() not in allowed:
+            raise PolicyViolation(s, loc,
+                "function %r is not allowed" % toks[0])
+
+    type_fn = fns
+
+    def procedure(self, s, loc, toks):
+        allowed = self.policy.procedures
+        if allowed is not None and toks[0] not in allowed:
+            raise PolicyViolation(s, loc,
+                "procedure %s is not allowed" % toks[0])
+
+    def with_kwrd(self, s, loc, toks):
+        self.projections.append([loc, False, False])
+
+    def return_kwrd(self, s, loc, toks):
+        self.projections.append([loc, True, False])
+
+    def union_stmt(self, s, loc, toks):
+        self.unions.append(loc)
+
+    def subquery(self, s, loc, toks):
+        # Its projections and unions do not bound the outer query.
+        self.projections = [p for p in self.projections if p[0] < loc]
+        self.unions = [u for u in self.unions if u < loc]
+
+    def limit_stmt(self, s, loc, toks):
+        if self.projections:
+            self.projections[-1][2] = True
+        max_limit = self.policy.max_limit
+        if max_limit is not None and int(toks["limit"]) > max_limit:
+            raise PolicyViolation(s, loc,
+                "LIMIT %s exceeds the maximum of %d" % (toks["limit"],
+                                                       max_limit))
+
+    def finish(self, query):
+        if not self.policy.require_limit:
+            return
+        limited = [limited for _, is_return, limited in self.projections
+                   if is_return]
+        if len(limited) < len(self.unions) + 1 or not all(limited):
+            raise PolicyViolation(query, len(query), "LIMIT is required")
@@ -0,0 +1,114 @@
+import unittest
+from pyparsing import ParseException, Optional, stringEnd
+from ro.grammar import match_stmt, return_stmt, limit_stmt, query
+from ro.policy import Policy, PolicyViolation
+
+
+statements = match_stmt + return_stmt + Optional(limit_stmt) + stringEnd
+
+
+class PolicyTests(unittest.TestCase):
+
+    def assertAccepted(self, policy, query):
+        policy.parse(statements, query)
+
+    def assertViolation(self, policy, query):
+        self.assertRaises(PolicyViolation, policy.parse, statements, query)
+
+    def test_empty_policy(self):
+        policy = Policy()
+        self.assertAccepted(policy, "MATCH (p:Secret {ssn: 1})-[:OWNS*]->(a) "
+                                    "RETURN p.ssn AS s LIMIT 5")
+
+    def test_labels(self):
+        policy = Policy(labels=["Person"])
+        self.assertAccepted(policy,
+            "MATCH (p:Person)-[:KNOWS]->(f) RETURN p LIMIT 5")
+        self.assertViolation(policy,
+            "MATCH (p:Person)-->(s:Secret) RETURN p LIMIT 5")
+        self.assertAccepted(policy, "MATCH (p:`Person`) RETURN p LIMIT 5")
+
+    def test_rel_types(self):
+        policy = Policy(labels=["Person"], rel_types=["KNOWS"])
+        self.assertAccepted(policy,
+            "MATCH (p:Person)-[r:KNOWS]->(f:Person) RETURN p LIMIT 5")
+        self.assertViolation(policy,
+            "MATCH (p:Person)-[r:KNOWS:OWNS]->(f) RETURN p LIMIT 5")
+
+    def test_forbidden_properties(self):
+        policy = Policy(forbidden_properties=["ssn"])
+        self.assertAccepted(policy,
+            "MATCH (p {name: 'dave'}) RETURN p.name AS name LIMIT 5")
+        self.assertViolation(policy,
+            "MATCH (p {ssn: 'dave'}) RETURN p LIMIT 5")
+        self.assertViolation(policy, "MATCH (p) RETURN p.ssn AS s LIMIT 5")
+        self.assertViolation(policy,
+            "MATCH (p) RETURN p.`ssn` AS s LIMIT 5")
+
+    def test_max_hops(self):
+        policy = Policy(max_hops=3)
+        self.assertAccepted(policy, "MATCH (p)-[*1..3]->(f) RETURN f LIMIT 5")
+        self.assertViolation(policy,
+            "MATCH (p)-[*1..4]->(f) RETURN f LIMIT 5")
+        self.assertViolation(policy, "MATCH (p)-[:KNOWS*]->(f) RETURN f LIMIT 5")
+
+    def test_limit(self):
+        policy = Policy(require_limit=True, max_limit=100)
+        self.assertAccepted(policy, "MATCH (p) RETURN p LIMIT 100")
+        self.assertViolation(policy, "MATCH (p) RETURN p LIMIT 101")
+        self.assertViolation(policy, "MATCH (p) RETURN p")
+        self.assertAccepted(Policy(), "MATCH (p) RETURN p")
+
+    def test_limit_final_return(self):
+        policy = Policy(require_limit=True)
+        policy.parse(query,
+            "MATCH (p) WITH p LIMIT 5 MATCH (p)-->(q) RETURN q LIMIT 5")
+        policy.parse(query,
+            "MATCH (p) RETURN p LIMIT 5 UNION MATCH (p) RETURN p LIMIT 5")
+        self.assertRaises(PolicyViolation, policy.parse, query,
+            "MATCH (p) WITH p LIMIT 5 MATCH (p)-->(q) RETURN q")
+        self.assertRaises(PolicyViolation, policy.parse, query,
+            "MATCH (p) RETURN p LIMIT 5 UNION MATCH (p) RETURN p")
+        self.assertRaises(PolicyViolation, policy.parse, query,
+            "MATCH (p) RETURN p UNION MATCH (p) RETURN p LIMIT 5")
+        self.assertRaises(PolicyViolation, policy.parse, query,
+            "CALL { MATCH (p) RETURN p LIMIT 5 } RETURN p")
+        policy.parse(query,
+            "CALL { MATCH (p) RETURN p } RETURN p LIMIT 5")
+
+    def test_functions(self):
+        policy = Policy(functions=["COUNT"])
+        self.assertAccepted(policy, "MATCH (p) RETURN count(p) LIMIT 5")
+        self.assertAccepted(policy,
+            "MATCH (p) RETURN count(p) AS total LIMIT 5")
+        self.assertViolation(policy, "MATCH (p) RETURN sum(p.age) LIMIT 5")
+        self.assertRaises(PolicyViolation, policy.parse, query,
+            "MATCH (n)-[r]->() WHERE type(r) = 'X' RETURN n")
+
+    def test_procedures(self):
+        policy = Policy(procedures=["db.labels", "apoc.meta.*"])
+        for q in ("CALL db.labels() YIELD label RETURN label",
+                  "CALL apoc.meta.stats()",
+                  "CALL { CALL db.labels() YIELD label RETURN label } "
+                  "RETURN 1"):
+            policy.parse(query, q)
+        self.assertRaises(PolicyViolation, policy.parse, query,
+                          "CALL db.propertyKeys()")
+        self.assertRaises(PolicyViolation, policy.parse, query,
+                          "CALL { CALL dbms.components() RETURN 1 } "
+                          "RETURN 1")
+        self.assertEqual(Policy.from_dict(policy.as_dict()).digest,
+                         policy.digest)
+
+    def test_syntax_error(self):
+        self.assertRaises(ParseException, Policy().parse, statements,
+            "MATCH (p RETURN p")
+
+    def test_digest(self):
+        self.assertEqual(Policy(labels=["A", "B"]).digest,
+                         Policy.from_dict({"labels": ["B", "A"]}).digest)
+        self.assertNotEqual(Policy().digest, Policy(max_limit=10).digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Catalogue of the procedures a read query may CALL.
+
+A catalogue is a text file of procedures declared read only, one name per
+line, with ``#`` starting a comment. A name ending in ``.*`` declares every
+procedure of a namespace:
+
+    db.labels
+    db.schema.visualization
+    apoc.meta.*
+
+Names are case sensitive, as they are in Neo4j, and a segment may be quoted
+in backticks. The grammar accepts ``CALL`` of the procedures in the
+catalogue at ``CATALOGUE_PATH`` and rejects every other one, since a
+procedure can write whatever its name. A ``Policy`` can narrow that down
+further for a tenant.
+
+Lookups walk a trie of the dotted name segments, so they take one step per
+segment of the name, however large the catalogue.
+"""
+import os
+import re
+
+from .grammar import IDENTIFIER, name
+
+
+CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "procedures.txt")
+
+# Trie keys besides the segments themselves, which are never integers.
+_NAME, _NAMESPACE = 0, 1
+
+_SEGMENT = re.compile(IDENTIFIER)
+_PLAIN = re.compile(r"[^\W\d]\w*$")
+
+
+def segments(text):
+    """The unquoted segments of the procedure name ``text``."""
+    return [name(segment) for segment in _SEGMENT.findall(text)]
+
+
+def _quoted(segment):
+    if _PLAIN.match(segment):
+        return segment
+    return "`%s`" % segment.replace("`", "``")
+
+
+class Catalogue(object):
+    """Prefix trie of read only procedure names, see the module docstring."""
+
+    def __init__(self, names=()):
+        self._root = {}
+        for text in names:
+            self.add(text)
+
+    def add(self, text):
+        """Declare the procedure ``text``, or a namespace if it ends in
+        ``.*``."""
+        namespace = text.endswith(".*")
+        node = self._root
+        for segment in segments(text[:-2] if namespace else text):
+            node = node.setdefault(segment, {})
+        node[_NAMESPACE if namespace else _NAME] = True
+
+    def __contains__(self, text):
+        node = self._root
+        for segment in segments(text):
+            if _NAMESPACE in node:
+                return True
+            node = node.get(segment)
+            if node is None:
+                return False
+        return _NAME in node
+
+    def names(self):
+        """The declared names, sorted, namespaces ending in ``.*``."""
+        found = []
+        todo = [((), self._root)]
+        while todo:
+            prefix, node = todo.pop()
+            for key, child in node.items():
+                if key == _NAME:
+                    found.append(".".join(prefix))
+                elif key == _NAMESPACE:
+                    found.append(".".join(prefix + ("*",)))
+                else:
+                    todo.append((prefix + (_quoted(key),), child))
+        return sorted(found)
+
+
+def load(path=CATALOGUE_PATH):
+    """The ``Catalogue`` in the file at ``path``."""
+    catalogue = Catalogue()
+    with open(path) as f:
+        for line in f:
+            text = line.split("#", 1)[0].strip()
+            if text:
+                catalogue.add(text)
+    return catalogue
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pyparsing import ParseBaseException, stringEnd
+from ro import grammar
+from ro.procedures import Catalogue, load, segments
+
+
+class CatalogueTests(unittest.TestCase):
+
+    def test_lookup(self):
+        catalogue = Catalogue(["db.labels", "apoc.meta.*", "`my.proc`.run"])
+        self.assertIn("db.labels", catalogue)
+        self.assertIn("`db`.labels", catalogue)
+        self.assertIn("apoc.meta.stats", catalogue)
+        self.assertIn("apoc.meta.graph.deep", catalogue)
+        self.assertIn("`my.proc`.run", catalogue)
+        self.assertNotIn("db", catalogue)
+        self.assertNotIn("db.labels.more", catalogue)
+        self.assertNotIn("DB.LABELS", catalogue)
+        self.assertNotIn("apoc.meta", catalogue)
+        self.assertNotIn("apoc.create.node", catalogue)
+        self.assertEqual(catalogue.names(),
+                         ["`my.proc`.run", "apoc.meta.*", "db.labels"])
+        self.assertEqual(Catalogue(catalogue.names()).names(),
+                         catalogue.names())
+
+    def test_segments(self):
+        self.assertEqual(segments("db.`odd``name`.x"), ["db", "odd`name", "x"])
+
+    def test_load(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, "procedures.txt")
+            with open(path, "w") as f:
+                f.write("# read only\n\ndb.labels  # schema\nmy.ns.*\n")
+            self.assertEqual(load(path).names(), ["db.labels", "my.ns.*"])
+        finally:
+            shutil.rmtree(tmp)
+        self.assertIn("db.labels", load())
+
+    def test_grammar(self):
+        call = grammar.call_stmt + stringEnd
+        call.parseString("CALL db.labels() YIELD label")
+        with self.assertRaises(ParseBaseException) as raised:
+            call.parseString("CALL apoc.create.node(n)")
+        self.assertIn("apoc.create.node is not declared read only",
+                      str(raised.exception))
+        own = grammar.Procedure(Catalogue(["my.proc"])) + stringEnd
+        own.parseString("my.proc")
+        self.assertRaises(ParseBaseException, own.parseString, "db.labels")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,376 @@
+"""
+Read only proxy for the Neo4j transactional HTTP endpoint.
+
+Applications talk to the proxy as if it were Neo4j. Every ``POST`` to a
+transaction URL has its statements validated before anything is forwarded:
+
+    /db/data/transaction[/ID][/commit]      Neo4j 3.x
+    /db/NAME/tx[/ID][/commit]               Neo4j 4.x and later
+
+If any statement is rejected, the request is answered the way Neo4j answers
+a failed statement: status 200, no results and a
+``Neo.ClientError.Security.Forbidden`` error naming the statement. Nothing
+reaches the database. An open transaction is left open, and the client rolls
+it back as it would after any other statement error.
+
+Besides those, only requests that cannot write are forwarded: ``GET`` of the
+discovery documents (``/`` and ``/db/data/``) and ``DELETE`` of an open
+transaction, which rolls it back. Every other method and path, including the
+legacy ``/db/data/cypher`` endpoint and the REST node and relationship
+endpoints, is answered with a 403 ``Forbidden`` error. Paths are matched as
+Neo4j would route them: a path that percent encoding, empty or dot segments
+or ``;`` parameters would make differ from its routed form is refused with a
+400 ``InvalidFormat`` error rather than matched in either form.
+
+Verdicts are kept in an LRU keyed by statement text, so a statement an
+application sends again is only parsed once. The grammar has no query
+parameters: a statement that uses ``$name`` or ``{name}`` is refused like any
+other statement it rejects, and the cache only helps statements repeated
+verbatim, literals included. Misses go through the sidecar's
+micro-batcher to its worker pool. Upstream requests reuse a bounded
+pool of keep-alive connections, and client connections may pipeline.
+``/ro/metrics`` reports latency per endpoint and the verdict cache hit rate.
+
+Bolt is not proxied. Its PackStream framing is a protocol of its own, and
+HTTP covers the services that asked for this.
+
+    python -m ro.proxy --upstream localhost:7474 --port 7470
+    python -m ro.proxy --bench 1000      # latency added over a stub upstream
+"""
+import argparse
+import asyncio
+import collections
+import json
+import re
+import time
+from urllib.parse import unquote
+
+from .policy import Policy
+from .server import (JSON, Sidecar, read_request, read_response, request,
+                     _encode)
+
+
+TRANSACTION = re.compile(r"/db/(?:data/transaction|[^/]+/tx)(?:/\d+)?"
+                         r"(?:/commit)?/?$")
+OPEN_TRANSACTION = re.compile(r"/db/(?:data/transaction|[^/]+/tx)/\d+/?$")
+DISCOVERY = ("/", "/db/data", "/db/data/")
+# Characters that make a path route differently from how it reads.
+_UNROUTED = re.compile(r"%|;|\\|//|(?:^|/)\.\.?(?:/|$)|[\x00-\x20\x7f]")
+FORBIDDEN = "Neo.ClientError.Security.Forbidden"
+INVALID_FORMAT = "Neo.ClientError.Request.InvalidFormat"
+
+# Request headers passed on upstream, and response headers passed back.
+FORWARD = ("authorization", "content-type", "accept", "user-agent",
+           "x-stream", "access-mode")
+RETURN = ("content-type", "location")
+
+
+def neo4j_error(code, message):
+    return _encode({"results": [], "errors": [{"code": code,
+                                               "message": message}]})
+
+
+def routed_path(target):
+    """
+    The path of the request ``target``, or ``None`` if Neo4j could route it
+    to another path than it reads as: once percent decoded, or with empty or
+    dot segments or ``;`` parameters.
+    """
+    path = target.partition("?")[0]
+    if _UNROUTED.search(path) or _UNROUTED.search(unquote(path)):
+        return None
+    return path
+
+
+def allowed(method, path):
+    """Whether ``method`` on ``path`` is forwarded, see the module
+    docstring. Statements sent to a transaction are checked separately."""
+    if method in ("GET", "HEAD"):
+        return path in DISCOVERY
+    if method == "POST":
+        return TRANSACTION.match(path) is not None
+    if method == "DELETE":
+        return OPEN_TRANSACTION.match(path) is not None
+    return False
+
+
+class UpstreamPool(object):
+    """At most ``size`` keep-alive HTTP connections to ``host:port``."""
+
+    def __init__(self, host, port, size=8):
+        self.host = host
+        self.port = port
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def request(self, method, target, headers, body):
+        """Return ``(status, headers, data)`` from the upstream server."""
+        async with self._slots:
+            reused = bool(self._idle)
+            if reused:
+                reader, writer = self._idle.pop()
+            else:
+                reader, writer = await asyncio.open_connection(self.host,
+                                                               self.port)
+            try:
+                response = await _exchange(reader, writer, method, target,
+                                           headers, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+                # The server closed an idle connection, retry on a new one.
+                reader, writer = await asyncio.open_connection(self.host,
+                                                               self.port)
+                response = await _exchange(reader, writer, method, target,
+                                           headers, body)
+            status, returned, data, keep_alive = response
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, returned, data
+
+    async def close(self):
+        while self._idle:
+            reader, writer = self._idle.pop()
+            writer.close()
+            await writer.wait_closed()
+
+
+async def _exchange(reader, writer, method, target, headers, body):
+    head = ["%s %s HTTP/1.1" % (method, target), "Host: upstream"]
+    head.extend("%s: %s" % (name, value) for name, value in headers)
+    head.append("Content-Length: %d" % len(body))
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status, fields, data, keep_alive = await read_response(reader, method)
+    returned = [(name.title(), value) for name, value in fields.items()
+                if name in RETURN]
+    return status, returned, data, keep_alive
+
+
+class Proxy(Sidecar):
+    """
+    The proxy. ``upstream`` is the ``(host, port)`` of the Neo4j HTTP
+    connector. The remaining options are the sidecar's.
+    """
+
+    def __init__(self, upstream, policy=None, processes=1, window=0.0,
+                 max_batch=256, connections=8, cache_size=1 << 16):
+        super(Proxy, self).__init__(policy, processes, window, max_batch)
+        self.upstream = UpstreamPool(upstream[0], upstream[1], connections)
+        self.cache_size = cache_size
+        self._verdicts = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def close(self):
+        await super(Proxy, self).close()
+        await self.upstream.close()
+
+    def endpoint(self, target, status):
+        path = routed_path(target)
+        if path is not None and TRANSACTION.match(path):
+            return "transaction"
+        if status in (400, 403):
+            return "refused"
+        return "passthrough"
+
+    async def verdicts(self, statements):
+        """``validator.summary`` for each statement, cached by text."""
+        cache = self._verdicts
+        results = [cache.get(statement) for statement in statements]
+        missing = [statement for statement, result in
+                   zip(statements, results) if result is None]
+        self.hits += len(statements) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = dict(zip(missing,
+                                await self.batcher.submit(missing)))
+            results = [computed.get(statement, result) for statement, result
+                       in zip(statements, results)]
+            cache.update(computed)
+        for statement in statements:
+            cache.move_to_end(statement)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return results
+
+    async def respond(self, method, target, headers, body):
+        if target == "/ro/metrics":
+            status, payload = await self.route(method, "/metrics", body)
+            payload["verdict_cache"] = {"hits": self.hits,
+                                        "misses": self.misses,
+                                        "size": len(self._verdicts)}
+            return status, JSON, _encode(payload)
+        path = routed_path(target)
+        if path is None:
+            return 400, JSON, neo4j_error(INVALID_FORMAT,
+                "Unable to route %s through the read only proxy" % target)
+        if not allowed(method, path):
+            return 403, JSON, neo4j_error(FORBIDDEN,
+                "%s %s is not allowed through the read only proxy" % (
+                method, path))
+        if method == "POST":
+            try:
+                document = json.loads(body.decode("utf-8")) if body else {}
+                statements = [entry["statement"] for entry in
+                              document.get("statements", ())]
+                if not all(isinstance(s, str) for s in statements):
+                    raise TypeError("statements must be strings")
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                return 400, JSON, neo4j_error(INVALID_FORMAT,
+                                              "Unable to read request: %s" % e)
+            for i, result in enumerate(await self.verdicts(statements)):
+                if not result["accepted"]:
+                    return 200, JSON, neo4j_error(FORBIDDEN,
+                        "Statement %d is not an allowed read query: %s" % (
+                        i, result["error"]))
+        forward = [(name.title(), value) for name, value in headers.items()
+                   if name in FORWARD]
+        try:
+            return await self.upstream.request(method, target, forward, body)
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            return 502, JSON, neo4j_error("Neo.TransientError.General."
+                "DatabaseUnavailable", "Upstream request failed: %s" % e)
+
+
+class StubNeo4j(object):
+    """
+    Minimal stand-in for the Neo4j transactional endpoint. It answers every
+    statement with an empty result, using a chunked response as Neo4j does,
+    and records the statements and connections it was sent. A HEAD request
+    gets the ``Content-Length`` of that response and no body.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.connections = 0
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                incoming = await read_request(reader)
+                if incoming is None:
+                    break
+                method, target, headers, body, keep_alive = incoming
+                statements = []
+                if body:
+                    statements = [entry["statement"] for entry in
+                                  json.loads(body)["statements"]]
+                self.statements.extend(statements)
+                data = _encode({"results": [{"columns": [], "data": []}
+                                            for _ in statements],
+                                "errors": []})
+                if method == "HEAD":
+                    writer.write(b"HTTP/1.1 200 OK\r\n"
+                                 b"Content-Type: application/json\r\n"
+                                 b"Content-Length: %d\r\n\r\n" % len(data))
+                else:
+                    writer.write(b"HTTP/1.1 200 OK\r\n"
+                                 b"Content-Type: application/json\r\n"
+                                 b"Transfer-Encoding: chunked\r\n\r\n" +
+                                 b"%x\r\n%s\r\n0\r\n\r\n" % (len(data), data))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def added_latency(count=500, path="/db/data/transaction/commit"):
+    """
+    Median and p99 latency, in microseconds, of ``count`` one statement
+    requests straight to a stub upstream and through a proxy in front of it.
+    The proxy is measured with a cold verdict cache (every statement new)
+    and a warm one (the same statements again).
+    """
+    stub = StubNeo4j()
+    upstream = await stub.start()
+    proxy = Proxy(upstream)
+    server = await proxy.start(port=0)
+    address = server.sockets[0].getsockname()[:2]
+    statements = ["MATCH (n:Person {id: %d}) RETURN n" % i
+                  for i in range(count)]
+    report = {}
+    try:
+        for name, target in (("direct", upstream), ("cold", address),
+                             ("warm", address)):
+            reader, writer = await asyncio.open_connection(*target)
+            latencies = []
+            for statement in statements:
+                start = time.perf_counter()
+                await request(reader, writer, "POST", path,
+                              {"statements": [{"statement": statement}]})
+                latencies.append(time.perf_counter() - start)
+            writer.close()
+            await writer.wait_closed()
+            latencies.sort()
+            report[name + "_p50_us"] = latencies[count // 2] * 1e6
+            report[name + "_p99_us"] = latencies[
+                min(count - 1, int(count * 0.99))] * 1e6
+    finally:
+        await proxy.close()
+        await stub.close()
+    for name in ("cold", "warm"):
+        report[name + "_added_p50_us"] = (report[name + "_p50_us"] -
+                                          report["direct_p50_us"])
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ro.proxy",
+        description="Read only proxy for the Neo4j HTTP endpoint.")
+    parser.add_argument("--upstream", default="127.0.0.1:7474",
+        help="HOST:PORT of the Neo4j HTTP connector")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7470)
+    parser.add_argument("-j", "--processes", type=int, default=1)
+    parser.add_argument("--connections", type=int, default=8,
+        help="upstream keep-alive connections")
+    parser.add_argument("--policy", metavar="FILE",
+        help="JSON read policy to enforce")
+    parser.add_argument("--bench", type=int, metavar="REQUESTS",
+        help="measure the latency added over a stub upstream and exit")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        report = asyncio.run(added_latency(args.bench))
+        for name in sorted(report):
+            print("%s\t%.1f" % (name, report[name]))
+        return
+
+    policy = None
+    if args.policy:
+        with open(args.policy) as f:
+            policy = Policy.from_dict(json.load(f))
+    host, _, port = args.upstream.rpartition(":")
+
+    async def serve():
+        proxy = Proxy((host, int(port)), policy, args.processes,
+                      connections=args.connections)
+        server = await proxy.start(args.host, args.port)
+        try:
+            await server.serve_forever()
+        finally:
+            await proxy.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
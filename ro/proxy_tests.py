@@ -0,0 +1,139 @@
+import asyncio
+import unittest
+from ro.policy import Policy
+from ro.proxy import FORBIDDEN, Proxy, StubNeo4j, added_latency
+from ro.server import request
+
+
+class ProxyTests(unittest.TestCase):
+
+    def run_proxy(self, test, **options):
+        async def run():
+            stub = StubNeo4j()
+            upstream = await stub.start()
+            proxy = Proxy(upstream, **options)
+            server = await proxy.start(port=0)
+            reader, writer = await asyncio.open_connection(
+                *server.sockets[0].getsockname()[:2])
+            try:
+                return stub, await test(reader, writer)
+            finally:
+                writer.close()
+                await writer.wait_closed()
+                await proxy.close()
+                await stub.close()
+        return asyncio.run(run())
+
+    def test_forwards_reads(self):
+        async def test(reader, writer):
+            return await request(reader, writer, "POST",
+                "/db/data/transaction/commit", {"statements": [
+                    {"statement": "MATCH (n) RETURN n"},
+                    {"statement": "MATCH (n:A) RETURN n",
+                     "parameters": {"x": 1}}]})
+        stub, (status, document) = self.run_proxy(test)
+        self.assertEqual(status, 200)
+        self.assertEqual(len(document["results"]), 2)
+        self.assertEqual(stub.statements,
+                         ["MATCH (n) RETURN n", "MATCH (n:A) RETURN n"])
+
+    def test_rejects_writes(self):
+        async def test(reader, writer):
+            return await request(reader, writer, "POST", "/db/neo4j/tx/12",
+                {"statements": [{"statement": "MATCH (n) RETURN n"},
+                                {"statement": "MATCH (n) DETACH DELETE n"}]})
+        stub, (status, document) = self.run_proxy(test)
+        self.assertEqual(status, 200)
+        self.assertEqual(document["results"], [])
+        self.assertEqual(document["errors"][0]["code"], FORBIDDEN)
+        self.assertIn("Statement 1", document["errors"][0]["message"])
+        self.assertEqual(stub.statements, [])
+
+    def test_policy(self):
+        async def test(reader, writer):
+            return await request(reader, writer, "POST", "/db/neo4j/tx/commit",
+                {"statements": [{"statement": "MATCH (n:Secret) RETURN n"}]})
+        stub, (status, document) = self.run_proxy(
+            test, policy=Policy(labels=["Public"]))
+        self.assertEqual(document["errors"][0]["code"], FORBIDDEN)
+
+    def test_bad_body(self):
+        async def test(reader, writer):
+            return await request(reader, writer, "POST", "/db/neo4j/tx",
+                                 {"statements": [{"query": "x"}]})
+        stub, (status, document) = self.run_proxy(test)
+        self.assertEqual(status, 400)
+
+    def test_refuses_other_endpoints(self):
+        refused = [("POST", "/db/data/cypher", {"query": "CREATE (n)"}),
+                   ("POST", "/db/data/node", {}),
+                   ("DELETE", "/db/data/node/1", None),
+                   ("PUT", "/db/data/node/1/properties", {}),
+                   ("POST", "/db/neo4j/tx/commit/extra", {}),
+                   ("GET", "/db/data/node/1", None)]
+
+        async def test(reader, writer):
+            return [await request(reader, writer, method, target, document)
+                    for method, target, document in refused]
+        stub, responses = self.run_proxy(test)
+        self.assertEqual([status for status, _ in responses],
+                         [403] * len(refused))
+        self.assertEqual(responses[0][1]["errors"][0]["code"], FORBIDDEN)
+        self.assertEqual(stub.connections, 0)
+
+    def test_refuses_unrouted_paths(self):
+        for method, target in (("POST", "/db/neo4j/t%78/commit"),
+                               ("POST", "//db/neo4j/tx/commit"),
+                               ("POST", "/db/neo4j/tx;x=1/commit"),
+                               ("POST", "/db/neo4j/tx/../../data/cypher"),
+                               ("GET", "/db/data/%2e%2e/node")):
+            async def test(reader, writer):
+                return await request(reader, writer, method, target,
+                    {"statements": [{"statement": "CREATE (n)"}]})
+            stub, (status, document) = self.run_proxy(test)
+            self.assertEqual(status, 400, target)
+            self.assertEqual(stub.connections, 0)
+
+    def test_rollback(self):
+        async def test(reader, writer):
+            return await request(reader, writer, "DELETE", "/db/neo4j/tx/12")
+        stub, (status, document) = self.run_proxy(test)
+        self.assertEqual(status, 200)
+        self.assertEqual(stub.connections, 1)
+
+    def test_head(self):
+        # The upstream's Content-Length has no body behind it; reading one
+        # used to hang and hold an upstream slot.
+        async def test(reader, writer):
+            heads = [await asyncio.wait_for(
+                         request(reader, writer, "HEAD", "/"), 3)
+                     for _ in range(10)]
+            return heads, await request(reader, writer, "GET", "/db/data/")
+        stub, (heads, last) = self.run_proxy(test, connections=2)
+        self.assertEqual(heads, [(200, None)] * 10)
+        self.assertEqual(last[0], 200)
+        self.assertEqual(stub.connections, 1)
+
+    def test_passthrough_and_cache(self):
+        async def test(reader, writer):
+            await request(reader, writer, "GET", "/")
+            for _ in range(5):
+                await request(reader, writer, "POST", "/db/neo4j/tx/commit",
+                    {"statements": [{"statement": "MATCH (n) RETURN n"}]})
+            return await request(reader, writer, "GET", "/ro/metrics")
+        stub, (status, metrics) = self.run_proxy(test, connections=2)
+        self.assertEqual(metrics["verdict_cache"],
+                         {"hits": 4, "misses": 1, "size": 1})
+        self.assertEqual(metrics["latency_us"]["transaction"]["count"], 5)
+        self.assertEqual(metrics["latency_us"]["passthrough"]["count"], 1)
+        self.assertEqual(len(stub.statements), 5)
+        self.assertEqual(stub.connections, 1)
+
+    def test_added_latency(self):
+        report = asyncio.run(added_latency(20))
+        self.assertIn("warm_added_p50_us", report)
+        self.assertLess(report["warm_p50_us"], report["cold_p50_us"])
+
+
+if __name__ == "__main__":
+    unittest.main()
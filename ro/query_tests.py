@@ -0,0 +1,76 @@
+import unittest
+from pyparsing import ParseException, ParserElement
+from ro.bench import GRAMMAR_TARGET, grammar_footprint
+from ro.grammar import Subquery, match_stmt, parse, query, subquery_body
+
+
+class QueryTests(unittest.TestCase):
+    """Accept/reject cases for query live in cases/query.tsv."""
+
+    def test_clauses(self):
+        q = "MATCH (n)  WITH n\nRETURN n LIMIT 5 "
+        clauses = query.parseString(q)["clauses"]
+        self.assertEqual([kind for kind, start, end in clauses],
+                         ["match", "with", "return", "limit"])
+        self.assertEqual([q[start:end] for kind, start, end in clauses],
+                         ["MATCH (n)", "WITH n", "RETURN n", "LIMIT 5"])
+
+    def test_long_pipeline(self):
+        stages = " ".join("MATCH (n%d)-->(n%d) WITH n%d" % (i, i + 1, i + 1)
+                          for i in range(50))
+        clauses = query.parseString(stages + " RETURN n50")["clauses"]
+        self.assertEqual(len(clauses), 101)
+
+    def test_subquery_clauses(self):
+        q = "MATCH (n) CALL { MATCH (m) RETURN m } RETURN n"
+        clauses = query.parseString(q)["clauses"]
+        self.assertEqual([q[start:end] for kind, start, end in clauses],
+                         ["MATCH (n)", "CALL { MATCH (m) RETURN m }",
+                          "RETURN n"])
+
+    def test_subquery_memo(self):
+        body = "MATCH (m:Memo) RETURN m "
+        q = "CALL { %s} RETURN 1" % body
+        first = query.parseString(q).asList()
+        self.assertIn(body, subquery_body._memo)
+        self.assertEqual(query.parseString(q).asList(), first)
+        # Shared by every nesting level, errors move with the body.
+        bad = "RETURN 1 LIMIT x "
+        errors = []
+        for q in ("CALL { %s} RETURN 1" % bad,
+                  "MATCH (n) CALL { CALL { %s} RETURN 2 } RETURN 1" % bad):
+            with self.assertRaises(ParseException) as raised:
+                query.parseString(q)
+            errors.append((raised.exception.loc - q.index(bad),
+                           raised.exception.msg))
+        self.assertEqual(errors[0], errors[1])
+        self.assertIsNotNone(subquery_body._memo[bad][0])
+
+    def test_subquery_memo_size(self):
+        element = Subquery(cache_size=2)
+        for i in range(4):
+            element.parseString("RETURN %d}" % i)
+        self.assertEqual(list(element._memo), ["RETURN 2", "RETURN 3"])
+
+    def test_parse(self):
+        q = "MATCH (n)\tRETURN n"
+        self.assertEqual(list(parse(q)), list(query.parseString(q)))
+        self.assertEqual(list(parse("MATCH (n)", match_stmt)),
+                         list(match_stmt.parseString("MATCH (n)")))
+        with self.assertRaises(ParseException) as raised:
+            parse("MATCH (n) DELETE n")
+        self.assertEqual(raised.exception.loc, 10)
+        ParserElement._packratEnabled = True
+        try:
+            self.assertRaises(RuntimeError, parse, "MATCH (n) RETURN n")
+        finally:
+            ParserElement._packratEnabled = False
+
+    def test_grammar_footprint(self):
+        retained, elements = grammar_footprint()
+        self.assertLess(retained, GRAMMAR_TARGET)
+        self.assertGreater(elements, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,324 @@
+"""
+Streaming audit of Neo4j ``query.log`` files.
+
+Each log entry starts with a timestamp line. A multi-line query continues on
+the following lines until the next timestamp. The 3.x layout is understood:
+
+    2024-01-02 10:00:00.000+0000 INFO  12 ms: bolt-session	bolt	alice	...
+    	client/10.0.0.2:5000	server/10.0.0.1:7687>	alice - MATCH (n) RETURN n
+    	- {} - {}
+
+The header runs up to the first ``>``. It is followed by the user, the query,
+the parameters and the transaction metadata, separated by `` - ``.
+
+Queries are deduplicated by ``shape_fingerprint``, which abstracts literal
+values but keeps their classes, and keeps integer values too when the policy
+bounds LIMITs or hops. Each distinct fingerprint is validated once,
+and the results are aggregated per user and per fingerprint. Everything that
+grows with the log is bounded:
+
+* The verdict cache is an LRU of ``cache_size`` fingerprints.
+
+* Per fingerprint statistics keep every rejected fingerprint up to
+``max_fingerprints``, and only the most recent accepted ones.
+
+* Users beyond ``max_users`` are counted under ``OTHER_USER``.
+
+Validation of the new fingerprints of each batch of entries runs in a
+process pool when ``processes`` is more than one.
+
+    python -m ro.querylog -n 1000000 > query.log     # synthetic log
+    python -m ro --log --stats -j 4 query.log         # audit it
+"""
+import argparse
+import collections
+import gzip
+import hashlib
+import multiprocessing
+import random
+import re
+import sys
+
+from .canonical import shape
+from .fuzz import QueryGenerator
+from .validator import validate
+
+
+ENTRY_START = re.compile(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d")
+ENTRY = re.compile(r"\S+ \S+ +[A-Z]+ +(?:id:\d+ - )?\d+ ms: [^>]*>\s*(.*)",
+                   re.S)
+
+OTHER_USER = "<other>"
+MAX_FINGERPRINT_USERS = 32
+
+
+def entries(lines):
+    """Join the lines of a log into entries, dropping anything before the
+    first timestamp."""
+    entry = []
+    for line in lines:
+        if ENTRY_START.match(line):
+            if entry:
+                yield "".join(entry)
+            entry = [line]
+        elif entry:
+            entry.append(line)
+    if entry:
+        yield "".join(entry)
+
+
+def parse_entry(text):
+    """Return ``(user, query)`` for a log entry, or None if it has none."""
+    found = ENTRY.match(text)
+    if found is None:
+        return None
+    user, sep, body = found.group(1).rstrip().partition(" - ")
+    if not sep:
+        return None
+    parts = body.rsplit(" - ", 2)
+    if len(parts) == 3 and parts[1].startswith("{") and \
+            parts[2].startswith("{"):
+        body = parts[0]
+    elif parts[-1].startswith("{"):
+        body = body.rsplit(" - ", 1)[0]
+    return user, body.strip().rstrip(";").strip()
+
+
+def _literal_class(q, start, end):
+    if q[start] in "'\"":
+        return "s"
+    if q[start:end].isdigit():
+        return "i"
+    return "n"
+
+
+def shape_fingerprint(q, policy=None):
+    """
+    Hex fingerprint of the shape of ``q`` and the classes of its literals
+    (string, unsigned integer or other number). The grammar only tells
+    literals apart by class, so queries with the same fingerprint get the
+    same verdict. A ``policy`` with a ``max_limit`` or ``max_hops`` also
+    checks integer values, which are then kept in the fingerprint.
+    """
+    key, spans = shape(q)
+    values = policy is not None and (policy.max_limit is not None or
+                                     policy.max_hops is not None)
+    classes = []
+    for start, end in spans:
+        literal_class = _literal_class(q, start, end)
+        if values and literal_class == "i":
+            literal_class = "i%d," % int(q[start:end])
+        classes.append(literal_class)
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(key.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update("".join(classes).encode("ascii"))
+    return digest.hexdigest()
+
+
+_policy = None
+
+
+def _init(policy):
+    global _policy
+    _policy = policy
+
+
+def _verdict(q):
+    verdict = validate(q, _policy)
+    return verdict.accepted, verdict.error
+
+
+class LogScanner(object):
+    """
+    Accumulates verdicts and statistics over any number of logs, see the
+    module docstring. ``close`` shuts the process pool down.
+    """
+
+    def __init__(self, policy=None, processes=1, cache_size=1 << 16,
+                 max_fingerprints=10000, max_users=10000, batch=4096):
+        self.policy = policy
+        self.cache_size = cache_size
+        self.max_fingerprints = max_fingerprints
+        self.max_users = max_users
+        self.batch = batch
+        self.processes = processes
+        self.pool = None
+        if processes > 1:
+            self.pool = multiprocessing.Pool(processes, _init, (policy,))
+        self._cache = collections.OrderedDict()
+        self.accepted = collections.OrderedDict()
+        self.rejected = {}
+        self.users = {}
+        self.counts = collections.Counter()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def scan_file(self, path):
+        """Scan the log at ``path``, gzip compressed if it ends in ``.gz``."""
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            self.scan(f)
+
+    def scan(self, lines):
+        """Scan an iterable of ``bytes`` or ``str`` log lines."""
+        pending = []
+        for text in entries(self._decode(lines)):
+            self.counts["entries"] += 1
+            parsed = parse_entry(text)
+            if parsed is None:
+                self.counts["unparsed"] += 1
+                continue
+            pending.append(parsed)
+            if len(pending) >= self.batch:
+                self._process(pending)
+                pending = []
+        if pending:
+            self._process(pending)
+
+    def _decode(self, lines):
+        counts = self.counts
+        for line in lines:
+            counts["lines"] += 1
+            counts["bytes"] += len(line)
+            if not isinstance(line, str):
+                line = line.decode("utf-8", "replace")
+            yield line
+
+    def _process(self, pending):
+        cache = self._cache
+        fingerprints = [shape_fingerprint(q, self.policy)
+                        for user, q in pending]
+        known = {}
+        missing = {}
+        for fingerprint, (user, q) in zip(fingerprints, pending):
+            if fingerprint in known or fingerprint in missing:
+                continue
+            verdict = cache.get(fingerprint)
+            if verdict is None:
+                missing[fingerprint] = q
+            else:
+                cache.move_to_end(fingerprint)
+                known[fingerprint] = verdict
+        if missing:
+            queries = list(missing.values())
+            if self.pool is not None:
+                chunksize = max(1, len(queries) // (4 * self.processes))
+                verdicts = self.pool.map(_verdict, queries, chunksize)
+            else:
+                _init(self.policy)
+                verdicts = map(_verdict, queries)
+            for fingerprint, verdict in zip(missing, verdicts):
+                known[fingerprint] = cache[fingerprint] = verdict
+            self.counts["validated"] += len(missing)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        for fingerprint, (user, q) in zip(fingerprints, pending):
+            self._record(fingerprint, user, q, known[fingerprint])
+
+    def _record(self, fingerprint, user, q, verdict):
+        accepted, error = verdict
+        self.counts["accepted" if accepted else "rejected"] += 1
+        if user not in self.users and len(self.users) >= self.max_users:
+            user = OTHER_USER
+        stats = self.users.get(user)
+        if stats is None:
+            stats = self.users[user] = {"queries": 0, "rejected": 0}
+        stats["queries"] += 1
+        if not accepted:
+            stats["rejected"] += 1
+        table = self.accepted if accepted else self.rejected
+        entry = table.get(fingerprint)
+        if entry is None:
+            if not accepted and len(table) >= self.max_fingerprints:
+                self.counts["untracked_rejected"] += 1
+                return
+            entry = table[fingerprint] = {"fingerprint": fingerprint,
+                "count": 0, "accepted": accepted, "error": error,
+                "query": q, "users": set()}
+            if accepted and len(table) > self.max_fingerprints:
+                table.popitem(last=False)
+        elif accepted:
+            table.move_to_end(fingerprint)
+        entry["count"] += 1
+        if len(entry["users"]) < MAX_FINGERPRINT_USERS:
+            entry["users"].add(user)
+
+    def report(self):
+        """Counters, per user statistics and per fingerprint statistics."""
+        fingerprints = []
+        for table in (self.rejected, self.accepted):
+            for entry in table.values():
+                entry = dict(entry, users=sorted(entry["users"]))
+                fingerprints.append(entry)
+        fingerprints.sort(key=lambda entry: (entry["accepted"],
+                                             -entry["count"]))
+        return {"counts": dict(self.counts), "users": dict(self.users),
+                "fingerprints": fingerprints}
+
+
+def _randomize(q, rand):
+    # Same shape and literal classes, different literal values.
+    key, spans = shape(q)
+    parts = []
+    last = 0
+    for start, end in spans:
+        parts.append(q[last:start])
+        kind = _literal_class(q, start, end)
+        if kind == "s":
+            parts.append("'v%d'" % rand.randint(0, 99999))
+        elif kind == "i":
+            parts.append(str(rand.randint(0, 999)))
+        else:
+            parts.append("%.2f" % rand.uniform(-100, 100))
+        last = end
+    parts.append(q[last:])
+    return "".join(parts)
+
+
+def synthetic(count, users=20, shapes=200, writes=0.01, seed=0):
+    """
+    Yield ``count`` lines of a synthetic 3.x ``query.log``: ``shapes``
+    generated read queries with random literals, a ``writes`` fraction of
+    invalid ones, issued by ``users`` users. One query in twenty spans two
+    lines.
+    """
+    rand = random.Random(seed)
+    generator = QueryGenerator(seed)
+    reads = [generator.query() for _ in range(shapes)]
+    bad = [generator.invalid() for _ in range(max(1, shapes // 10))]
+    names = ["user%d" % i for i in range(users)]
+    for i in range(count):
+        pool = bad if rand.random() < writes else reads
+        q = _randomize(rand.choice(pool), rand)
+        if rand.random() < 0.05:
+            q = q.replace(" RETURN ", "\nRETURN ", 1)
+        user = rand.choice(names)
+        yield ("2024-01-01 %02d:%02d:%02d.%03d+0000 INFO  %d ms: "
+               "bolt-session\tbolt\t%s\tneo4j-python/4.4.0\t\t"
+               "client/10.0.0.%d:%d\tserver/10.0.0.1:7687>\t%s - %s - "
+               "{} - {}\n" % (i // 3600000 % 24, i // 60000 % 60,
+               i // 1000 % 60, i % 1000, rand.randint(0, 500), user,
+               rand.randint(2, 254), rand.randint(1024, 65535), user, q))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ro.querylog",
+        description="Write a synthetic Neo4j query.log to standard output.")
+    parser.add_argument("-n", "--lines", type=int, default=100000)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--shapes", type=int, default=200)
+    parser.add_argument("--writes", type=float, default=0.01,
+        help="fraction of write queries")
+    args = parser.parse_args(argv)
+    sys.stdout.writelines(synthetic(args.lines, args.users, args.shapes,
+                                    args.writes, args.seed))
+
+
+if __name__ == "__main__":
+    main()
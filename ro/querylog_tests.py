@@ -0,0 +1,112 @@
+import io
+import json
+import unittest
+from ro.cli import main
+from ro.policy import Policy
+from ro.querylog import (LogScanner, OTHER_USER, entries, parse_entry,
+                         shape_fingerprint, synthetic)
+
+
+HEADER = ("2024-01-01 00:00:0%d.000+0000 INFO  3 ms: bolt-session\tbolt\t"
+          "%s\tneo4j-python/4.4.0\t\tclient/10.0.0.2:5000\t"
+          "server/10.0.0.1:7687>\t%s - ")
+
+
+def line(i, user, q):
+    return HEADER % (i, user, user) + q + " - {} - {}\n"
+
+
+class ParseTests(unittest.TestCase):
+
+    def test_entry(self):
+        self.assertEqual(parse_entry(line(0, "alice", "MATCH (n) RETURN n")),
+                         ("alice", "MATCH (n) RETURN n"))
+        self.assertEqual(parse_entry(line(0, "bob", "MATCH (n {a: 'x - y'}) "
+                                          "RETURN n;")),
+                         ("bob", "MATCH (n {a: 'x - y'}) RETURN n"))
+        self.assertIsNone(parse_entry("2024-01-01 00:00:00 garbage\n"))
+
+    def test_multiline(self):
+        log = ["noise\n", HEADER % (0, "a", "a") + "MATCH (n)\n",
+               "RETURN n - {} - {}\n", line(1, "b", "RETURN 1")]
+        joined = list(entries(log))
+        self.assertEqual(len(joined), 2)
+        self.assertEqual(parse_entry(joined[0]), ("a", "MATCH (n)\nRETURN n"))
+
+    def test_fingerprint(self):
+        q = "MATCH (n) RETURN n LIMIT %s"
+        self.assertEqual(shape_fingerprint(q % "5"),
+                         shape_fingerprint(q % "10"))
+        self.assertNotEqual(shape_fingerprint(q % "5"),
+                            shape_fingerprint(q % "-5"))
+        self.assertNotEqual(shape_fingerprint(q % "5"),
+                            shape_fingerprint(q % "'5'"))
+        policy = Policy(max_limit=100)
+        self.assertNotEqual(shape_fingerprint(q % "10", policy),
+                            shape_fingerprint(q % "100000", policy))
+        self.assertEqual(shape_fingerprint(q % "10", Policy(labels=["A"])),
+                         shape_fingerprint(q % "100000", Policy(labels=["A"])))
+
+
+class ScannerTests(unittest.TestCase):
+
+    def test_dedupe(self):
+        scanner = LogScanner()
+        scanner.scan([line(0, "a", "MATCH (n {x: %d}) RETURN n" % i)
+                      for i in range(50)] +
+                     [line(1, "b", "MATCH (n) DELETE n")] * 3)
+        report = scanner.report()
+        self.assertEqual(report["counts"]["validated"], 2)
+        self.assertEqual(report["counts"]["rejected"], 3)
+        self.assertEqual(report["users"], {"a": {"queries": 50, "rejected": 0},
+                                           "b": {"queries": 3, "rejected": 3}})
+        rejected = report["fingerprints"][0]
+        self.assertEqual((rejected["accepted"], rejected["count"],
+                          rejected["users"]), (False, 3, ["b"]))
+
+    def test_policy_values(self):
+        scanner = LogScanner(Policy(max_limit=100, max_hops=3))
+        scanner.scan([line(0, "a", "MATCH (n) RETURN n LIMIT 10"),
+                      line(1, "a", "MATCH (n) RETURN n LIMIT 100000"),
+                      line(2, "a", "MATCH (n)-[*1..3]->(m) RETURN m LIMIT 1"),
+                      line(3, "a", "MATCH (n)-[*1..9]->(m) RETURN m LIMIT 1")])
+        counts = scanner.report()["counts"]
+        self.assertEqual((counts["accepted"], counts["rejected"]), (2, 2))
+
+    def test_bounded(self):
+        scanner = LogScanner(cache_size=4, max_fingerprints=5, max_users=3,
+                             batch=7)
+        scanner.scan(synthetic(500, users=10, shapes=50, writes=0.1))
+        report = scanner.report()
+        self.assertLessEqual(len(scanner._cache), 4)
+        self.assertLessEqual(len(scanner.accepted), 5)
+        self.assertLessEqual(len(scanner.rejected), 5)
+        self.assertIn(OTHER_USER, report["users"])
+        self.assertEqual(sum(user["queries"] for user in
+                             report["users"].values()), 500)
+
+    def test_processes(self):
+        log = list(synthetic(300, shapes=30, writes=0.2))
+        one = LogScanner()
+        one.scan(log)
+        many = LogScanner(processes=2, batch=50)
+        try:
+            many.scan(log)
+        finally:
+            many.close()
+        self.assertEqual(one.report(), many.report())
+
+    def test_command(self):
+        stdin = io.StringIO("".join(synthetic(100, users=2, writes=0.3)))
+        out = io.StringIO()
+        status = main(["--log", "-q"], stdin, out, io.StringIO())
+        self.assertEqual(status, 1)
+        lines = [json.loads(text) for text in out.getvalue().splitlines()]
+        self.assertTrue(lines)
+        self.assertTrue(all(entry.get("rejected") or
+                            entry.get("accepted") is False
+                            for entry in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Keys and invalidation tags for caching the results of read queries.
+
+``result_key`` parses a query once and derives everything a read-through
+result cache needs:
+
+* ``key``: a hex digest of the canonical minified query and the parameters
+serialized with sorted keys, so formatting and keyword case do not split
+cache entries.
+
+* ``tags``: ``label:``, ``type:`` and ``property:`` tags for every node
+label, relationship type and property key the query touches. A write that
+changes any of them should drop the entries carrying the tag.
+
+* ``cacheable``: false, with the reason in ``reason``, when the same query
+may legitimately return different rows on each run: SKIP or LIMIT in a
+projection without ORDER BY, in the query or any subquery, or a
+non-deterministic function. A procedure CALL is not cacheable either, no tag
+can tell when what a procedure reads changes.
+"""
+import collections
+import hashlib
+import json
+
+from .canonical import minify_tokens
+from .grammar import query
+from .validator import collect
+
+
+ResultKey = collections.namedtuple("ResultKey", "key tags cacheable reason")
+
+# Lower cased names of functions whose result changes between runs.
+NONDETERMINISTIC = frozenset(["rand", "timestamp", "randomuuid"])
+
+
+def tags(collector):
+    """Invalidation tags for the names seen by a ``validator.Collector``."""
+    return frozenset(["label:" + name for name in collector.labels] +
+                     ["type:" + name for name in collector.rel_types] +
+                     ["property:" + name for name in collector.properties])
+
+
+class Determinism(object):
+    """Listener finding the first reason the rows of a query may change
+    between runs, apart from non-deterministic functions."""
+
+    def __init__(self):
+        self.ordered = False
+        self.reason = None
+
+    def _uncacheable(self, reason):
+        if self.reason is None:
+            self.reason = reason
+
+    # ORDER BY, SKIP and LIMIT belong to the WITH or RETURN before them.
+    def _projection(self, s, loc, toks):
+        self.ordered = False
+
+    with_kwrd = return_kwrd = _projection
+
+    def order_by(self, s, loc, toks):
+        self.ordered = True
+
+    def skip_stmt(self, s, loc, toks):
+        if not self.ordered:
+            self._uncacheable("SKIP without ORDER BY")
+
+    def limit_stmt(self, s, loc, toks):
+        if not self.ordered:
+            self._uncacheable("LIMIT without ORDER BY")
+
+    def procedure(self, s, loc, toks):
+        self._uncacheable("procedure call %s()" % toks[0])
+
+
+def _uncacheable(determinism, functions):
+    if determinism.reason is not None:
+        return determinism.reason
+    for name in sorted(functions):
+        if name.lower() in NONDETERMINISTIC:
+            return "non-deterministic function %s()" % name
+    return None
+
+
+def result_key(q, params=None, policy=None):
+    """
+    Return the ``ResultKey`` for running ``q`` with ``params``. Raises
+    ``ParseException`` or ``PolicyViolation`` if the query is rejected.
+    """
+    determinism = Determinism()
+    tokens, collector = collect(q, policy, query, (determinism,))
+    encoded = json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha1()
+    digest.update(minify_tokens(tokens).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(encoded.encode("utf-8"))
+    reason = _uncacheable(determinism, collector.functions)
+    return ResultKey(digest.hexdigest(), tags(collector), reason is None,
+                     reason)
@@ -0,0 +1,59 @@
+import unittest
+from pyparsing import ParseException
+from ro.results import result_key
+
+
+class ResultKeyTests(unittest.TestCase):
+
+    def test_same_key(self):
+        a = result_key("match (p:Person {b: 1, a: 2})  return p",
+                       {"x": 1, "y": [1, 2]})
+        b = result_key("MATCH (p:Person {a: 2, b: 1}) RETURN p",
+                       {"y": [1, 2], "x": 1})
+        self.assertEqual(a.key, b.key)
+
+    def test_params_change_key(self):
+        q = "MATCH (p) RETURN p"
+        self.assertNotEqual(result_key(q, {"x": 1}).key,
+                            result_key(q, {"x": 2}).key)
+        self.assertEqual(result_key(q).key, result_key(q, {}).key)
+
+    def test_tags(self):
+        key = result_key("MATCH (p:Person)-[:KNOWS]->(f) WHERE f.age > 3 "
+                         "RETURN f.name AS name")
+        self.assertEqual(key.tags, frozenset(["label:Person", "type:KNOWS",
+                                              "property:age",
+                                              "property:name"]))
+
+    def test_cacheable(self):
+        key = result_key("MATCH (p) RETURN p ORDER BY p.name SKIP 5 LIMIT 5")
+        self.assertTrue(key.cacheable)
+        self.assertIsNone(key.reason)
+
+    def test_unordered_limit(self):
+        key = result_key("MATCH (p) RETURN p LIMIT 5")
+        self.assertFalse(key.cacheable)
+        self.assertEqual(key.reason, "LIMIT without ORDER BY")
+        key = result_key("MATCH (p) WITH p ORDER BY p.a LIMIT 5 "
+                         "RETURN p SKIP 2")
+        self.assertEqual(key.reason, "SKIP without ORDER BY")
+
+    def test_subquery_limit(self):
+        key = result_key("CALL { MATCH (p) RETURN p LIMIT 5 } "
+                         "RETURN p ORDER BY p.name")
+        self.assertEqual(key.reason, "LIMIT without ORDER BY")
+        key = result_key("CALL { MATCH (p) RETURN p ORDER BY p.a LIMIT 5 } "
+                         "RETURN p")
+        self.assertTrue(key.cacheable)
+
+    def test_procedure(self):
+        key = result_key("CALL db.labels() YIELD label RETURN label")
+        self.assertFalse(key.cacheable)
+        self.assertEqual(key.reason, "procedure call db.labels()")
+
+    def test_rejected(self):
+        self.assertRaises(ParseException, result_key, "MATCH (p) DELETE p")
+
+
+if __name__ == "__main__":
+    unittest.main()
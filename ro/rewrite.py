@@ -0,0 +1,288 @@
+"""
+Compiled query transformations.
+
+A ``Rewriter`` describes its output as a list of segments: ``(start, end)``
+spans copied from the source query, or new text. The first rewrite of a query
+shape (see ``canonical.shape``) compiles those segments into a template in
+which every literal is a reference to the n-th literal of the query. Later
+queries with the same shape are only checked with ``check``, a plain parse
+by default, and rewritten by filling the template with their own literals,
+without the analysis of ``segments``. The shape does not tell a valid
+literal from an invalid one (``LIMIT 5`` from ``LIMIT 5.5``), so a cached
+shape never spares the check.
+
+``LegacyIndexRewriter`` turns labelled node lookups into legacy index START
+clauses for Neo4j 1.x era databases:
+
+    MATCH (p:Person {name: 'dave'})-->(f) RETURN f
+    START p=node:people(name='dave') MATCH (p)-->(f) RETURN f
+
+"""
+import collections
+import re
+import threading
+
+from .canonical import LITERAL, shape
+from .grammar import IDENTIFIER, QUOTED_IDENTIFIER, STRING, name, parse
+from .hooks import listening
+
+
+Suggestion = collections.namedtuple("Suggestion", "kind message")
+
+
+class Rewriter(object):
+    """Base class for shape cached rewrites, see the module docstring."""
+
+    def __init__(self, cache_size=4096):
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def segments(self, q):
+        """Output segments for ``q``. Raises ``ParseException`` if invalid."""
+        raise NotImplementedError
+
+    def check(self, q, rewritten):
+        """
+        Raise ``ParseException`` if ``q``, rewritten from a cached template
+        to ``rewritten``, is invalid. ``segments`` checks uncached ones.
+        """
+        parse(q)
+
+    def cache_key(self, q, key, spans):
+        """
+        Key of the compiled template for ``q``, the shape ``key`` by default.
+        Rewriters whose segments depend on literal values add them here.
+        """
+        return key
+
+    def rewrite(self, q):
+        key, spans = shape(q)
+        key = self.cache_key(q, key, spans)
+        with self._lock:
+            template = self._cache.get(key)
+            if template is not None:
+                self._cache.move_to_end(key)
+        if template is not None:
+            rewritten = _fill(template, q, spans)
+            self.check(q, rewritten)
+            return rewritten
+        template = _compile(q, self.segments(q), spans)
+        if template is None:
+            return _fill(_compile(q, self.segments(q), []), q, spans)
+        with self._lock:
+            self._cache[key] = template
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return _fill(template, q, spans)
+
+
+def _compile(q, segments, spans):
+    # Text pieces stay strings, literals inside copied spans become indexes
+    # into ``spans``. Returns None if a segment cuts a literal in two.
+    template = []
+    i = 0
+    for segment in segments:
+        if not isinstance(segment, tuple):
+            template.append(segment)
+            continue
+        start, end = segment
+        while i < len(spans) and spans[i][1] <= start:
+            i += 1
+        while start < end:
+            if i < len(spans) and spans[i][0] < end:
+                literal_start, literal_end = spans[i]
+                if literal_start < start or literal_end > end:
+                    return None
+                if literal_start > start:
+                    template.append(q[start:literal_start])
+                template.append(i)
+                start = literal_end
+                i += 1
+            else:
+                template.append(q[start:end])
+                start = end
+    return template
+
+
+def _fill(template, q, spans):
+    parts = []
+    for part in template:
+        if isinstance(part, int):
+            start, end = spans[part]
+            parts.append(q[start:end])
+        else:
+            parts.append(part)
+    return "".join(parts)
+
+
+IndexRule = collections.namedtuple("IndexRule", "index keys")
+
+_VALUE = re.compile(r"(?:%s)(?:\.(?:%s))?" % (IDENTIFIER, IDENTIFIER))
+_QUOTED = re.compile(r"%s|%s" % (STRING, QUOTED_IDENTIFIER))
+
+
+def _skip_space(s, pos):
+    while pos < len(s) and s[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _value_span(s, loc, key):
+    pos = _skip_space(s, loc + len(key))
+    pos = _skip_space(s, pos + 1)
+    found = LITERAL.match(s, pos) or _VALUE.match(s, pos)
+    return found.span()
+
+
+def _node_end(s, loc):
+    pos = loc + 1
+    while s[pos] != ")":
+        found = s[pos] in "'\"`" and _QUOTED.match(s, pos)
+        pos = found.end() if found else pos + 1
+    return pos + 1
+
+
+class _MatchNodes(object):
+    """Listener collecting the nodes of non optional MATCH clauses."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.keyvals = {}
+        self.clause = None
+        self.pending_optional = False
+
+    def optional(self, s, loc, toks):
+        self.pending_optional = True
+
+    def match(self, s, loc, toks):
+        self.clause = "optional" if self.pending_optional else "match"
+        self.pending_optional = False
+
+    def _other(self, s, loc, toks):
+        self.clause = None
+
+    where = with_kwrd = return_kwrd = union_stmt = _other
+
+    def keyval(self, s, loc, toks):
+        self.keyvals[loc] = toks[0]
+
+    def node(self, s, loc, toks):
+        if self.clause == "match":
+            self.nodes[loc] = toks.asList()
+
+
+class LegacyIndexRewriter(Rewriter):
+    """
+    Rewrites MATCH nodes to legacy index lookups. ``rules`` maps a label to
+    an ``IndexRule(index, keys)``: a node with that label and a literal value
+    for one of ``keys`` becomes ``alias=node:index(key=value)`` in a START
+    clause, and loses the label and that property in the MATCH.
+
+    Only the MATCH clauses before the first WITH or CALL of a UNION part are
+    rewritten. A START binds its nodes for the whole part, so a node from
+    after a WITH would be dropped by it, and one from a subquery would leave
+    the subquery's scope.
+    """
+
+    def __init__(self, rules, cache_size=4096):
+        super(LegacyIndexRewriter, self).__init__(cache_size)
+        self.rules = dict((label, IndexRule(*rule))
+                          for label, rule in rules.items())
+
+    def _lookup(self, q, loc, toks, keyvals):
+        # Returns (alias, other labels, index, key, value span, entries) for a
+        # node that has an index rule, otherwise None.
+        alias = toks[1] if toks[1] not in ("(", ":", "{", ")") and \
+            toks[1].strip() else None
+        labels = []
+        for i, token in enumerate(toks):
+            if token == "{":
+                break
+            if token == ":":
+                labels.append(toks[i + 1])
+        end = _node_end(q, loc)
+        entries = [(at, key) for at, key in sorted(keyvals.items())
+                   if loc < at < end]
+        for label in labels:
+            rule = self.rules.get(name(label))
+            if rule is None:
+                continue
+            for key in rule.keys:
+                for at, entry_key in entries:
+                    value = _value_span(q, at, entry_key)
+                    if name(entry_key) == key and LITERAL.match(q, value[0]):
+                        others = [l for l in labels if l != label]
+                        rest = [(other_at, _value_span(q, other_at, k)[1])
+                                for other_at, k in entries if other_at != at]
+                        return (alias, others, rule.index, key, value, rest,
+                                end)
+        return None
+
+    def segments(self, q):
+        nodes = _MatchNodes()
+        with listening(nodes):
+            tokens = parse(q)
+        parts = [[]]
+        for kind, start, end in tokens["clauses"]:
+            if kind == "union":
+                parts.append([])
+            parts[-1].append((kind, start, end))
+        segments = []
+        last = 0
+        anonymous = 0
+        for clauses in parts:
+            first = clauses[1 if clauses[0][0] == "union" else 0][1]
+            part_end = clauses[-1][2]
+            for kind, start, end in clauses:
+                if kind in ("with", "call"):
+                    part_end = start
+                    break
+            starts = []
+            replaced = []
+            seen = set()
+            for loc in sorted(nodes.nodes):
+                if not first <= loc < part_end:
+                    continue
+                lookup = self._lookup(q, loc, nodes.nodes[loc],
+                                      nodes.keyvals)
+                if lookup is None:
+                    continue
+                alias, others, index, key, value, rest, end = lookup
+                if alias in seen:
+                    continue
+                while alias is None or alias in seen:
+                    # Generated aliases skip names the query already uses.
+                    alias = "_n%d" % anonymous
+                    anonymous += 1
+                    if re.search(r"\b%s\b" % alias, q):
+                        alias = None
+                seen.add(alias)
+                starts.append([alias + "=node:" + index + "(" + key + "=",
+                               value, ")"])
+                node = ["(" + alias + "".join(":" + l for l in others)]
+                if rest:
+                    node.append(" {")
+                    for i, entry in enumerate(rest):
+                        if i:
+                            node.append(", ")
+                        node.append(entry)
+                    node.append("}")
+                node.append(")")
+                replaced.append((loc, end, node))
+            if not starts:
+                continue
+            segments.append((last, first))
+            segments.append("START ")
+            for i, start in enumerate(starts):
+                if i:
+                    segments.append(", ")
+                segments.extend(start)
+            segments.append(" ")
+            last = first
+            for loc, end, node in replaced:
+                segments.append((last, loc))
+                segments.extend(node)
+                last = end
+        segments.append((last, len(q)))
+        return segments
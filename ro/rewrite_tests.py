@@ -0,0 +1,69 @@
+import unittest
+from pyparsing import ParseException
+from ro.rewrite import IndexRule, LegacyIndexRewriter
+
+
+class LegacyIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.rewriter = LegacyIndexRewriter({
+            "Person": IndexRule("people", ("name", "ssn"))})
+
+    def test_rewrite(self):
+        self.assertEqual(
+            self.rewriter.rewrite("MATCH (p:Person {name: 'dave'})-->(f) "
+                                  "RETURN f"),
+            "START p=node:people(name='dave') MATCH (p)-->(f) RETURN f")
+
+    def test_keeps_other_labels_and_properties(self):
+        self.assertEqual(
+            self.rewriter.rewrite('MATCH (p:Person:Admin {age: 3, name: "x"})'
+                                  '-->(:Person {ssn: 12}) RETURN p'),
+            'START p=node:people(name="x"), _n0=node:people(ssn=12) '
+            'MATCH (p:Admin {age: 3})-->(_n0) RETURN p')
+
+    def test_union(self):
+        self.assertEqual(
+            self.rewriter.rewrite("MATCH (p:Person {name: 'a'}) RETURN p "
+                                  "UNION MATCH (p:Person {name: 'b'}) RETURN p"),
+            "START p=node:people(name='a') MATCH (p) RETURN p "
+            "UNION START p=node:people(name='b') MATCH (p) RETURN p")
+
+    def test_unchanged(self):
+        for q in ["MATCH (p) OPTIONAL MATCH (p)-->(q:Person {name: 'z'}) "
+                  "RETURN q",
+                  "MATCH (p:Person {name: a.name}) RETURN p",
+                  "MATCH (p:Place {name: 'x'}) RETURN p"]:
+            self.assertEqual(self.rewriter.rewrite(q), q)
+
+    def test_before_with_or_call(self):
+        for q in ["MATCH (n) WITH n MATCH (p:Person {name: 'x'})-->(n) "
+                  "RETURN p",
+                  "CALL { MATCH (p:Person {name: 'x'}) RETURN p } RETURN p"]:
+            self.assertEqual(self.rewriter.rewrite(q), q)
+        self.assertEqual(
+            self.rewriter.rewrite("MATCH (p:Person {name: 'x'}) WITH p "
+                                  "MATCH (q:Person {name: 'y'}) RETURN q"),
+            "START p=node:people(name='x') MATCH (p) WITH p "
+            "MATCH (q:Person {name: 'y'}) RETURN q")
+
+    def test_cached_shape(self):
+        rewrite = self.rewriter.rewrite
+        rewrite("MATCH (p:Person {name: 'dave'}) RETURN p LIMIT 5")
+        self.rewriter.segments = None
+        self.assertEqual(
+            rewrite("MATCH  (p:Person {name: 'it''s'})  RETURN p LIMIT 10"),
+            "START p=node:people(name='it''s') MATCH (p) RETURN p LIMIT 10")
+
+    def test_invalid(self):
+        self.assertRaises(ParseException, self.rewriter.rewrite,
+                          "MATCH (p:Person {name: 'x'}) DELETE p")
+
+    def test_invalid_cached_shape(self):
+        self.rewriter.rewrite("MATCH (n) RETURN n LIMIT 5")
+        self.assertRaises(ParseException, self.rewriter.rewrite,
+                          "MATCH (n) RETURN n LIMIT 5.5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Variable scope analysis run during the parse.
+
+Variables are bound by node and relationship aliases and path assignments in
+MATCH and OPTIONAL MATCH, and by ``AS`` aliases. WITH narrows the scope to the
+names it projects. Any other use of a variable, in WHERE, WITH, ORDER BY,
+RETURN, property maps or pattern predicates, must refer to a bound name,
+otherwise the parse stops with a ``ScopeError`` instead of failing later at
+Neo4j. Each part of a UNION starts with an empty scope. A WITH or RETURN
+alias is only bound after the projection list it is part of, for ORDER BY
+and the clauses that follow.
+
+A procedure CALL binds the names it YIELDs. A ``CALL {}`` subquery starts
+with a copy of the outer scope, which an importing WITH may narrow, and binds
+only the names its RETURN projects in the outer scope once it ends.
+
+The symbol table is a single set of names, replaced wholesale at each WITH,
+with a stack of the outer tables of the CALLs being parsed.
+"""
+import re
+
+from pyparsing import ParseFatalException
+
+from .grammar import QUOTED_IDENTIFIER, IDENTIFIER, name, parse
+from .hooks import listening
+
+
+_VARIABLE = re.compile(r"(?:%s|%s)$" % (IDENTIFIER, QUOTED_IDENTIFIER))
+
+
+class ScopeError(ParseFatalException):
+    """Raised from inside the parse when an unbound variable is referenced."""
+
+
+class ScopeCheck(object):
+    """Listener tracking the bound variables over the course of one parse."""
+
+    def __init__(self):
+        self.scope = set()
+        self.projected = set()
+        self.clause = None
+        self.returned = set()
+        self.yielded = set()
+        self.outer = []
+
+    def _ref(self, s, loc, token):
+        # Comparisons are tried on function calls before the fns alternative,
+        # a function name is not a variable.
+        if name(token) in self.scope:
+            return
+        end = loc + len(token)
+        while end < len(s) and s[end].isspace():
+            end += 1
+        if s.startswith("(", end):
+            return
+        raise ScopeError(s, loc, "variable %r is not defined" % name(token))
+
+    def _alias(self, s, loc, toks):
+        if toks and toks[0] != ":":
+            if self.clause == "match":
+                self.scope.add(name(toks[0]))
+            else:
+                self._ref(s, loc, toks[0])
+
+    def match(self, s, loc, toks):
+        self.clause = "match"
+
+    def where(self, s, loc, toks):
+        self.clause = "where"
+
+    def with_kwrd(self, s, loc, toks):
+        self.clause = "with"
+        self.projected = set()
+
+    def order_by(self, s, loc, toks):
+        if self.clause == "return":
+            # ORDER BY may use the aliases the RETURN list bound.
+            self.scope |= self.returned
+        self.clause = "order"
+
+    def return_kwrd(self, s, loc, toks):
+        self.clause = "return"
+        self.returned = set()
+
+    alias_label = _alias
+    alias_rel_label = _alias
+
+    def match_stmt(self, s, loc, toks):
+        if "path" in toks:
+            self.scope.add(name(toks["path"]))
+
+    def ref(self, s, loc, toks):
+        self._ref(s, loc, toks[0])
+
+    def gettr(self, s, loc, toks):
+        self._ref(s, loc, toks[0])
+
+    def as_stmt(self, s, loc, toks):
+        # WITH and RETURN aliases are not in scope within their own list.
+        if self.clause == "with":
+            self.projected.add(name(toks[-1]))
+        elif self.clause == "return":
+            self.returned.add(name(toks[-1]))
+        else:
+            self.scope.add(name(toks[-1]))
+
+    def return_obj(self, s, loc, toks):
+        if len(toks) == 1 and _VARIABLE.match(toks[0]):
+            self.returned.add(name(toks[0]))
+
+    def with_obj(self, s, loc, toks):
+        if len(toks) == 1:
+            self.projected.add(name(toks[0]))
+
+    def with_stmt(self, s, loc, toks):
+        self.scope = self.projected
+
+    def union_stmt(self, s, loc, toks):
+        self.scope = set()
+        self.clause = None
+
+    def call(self, s, loc, toks):
+        self.outer.append((self.scope, self.projected, self.returned))
+        self.scope = set(self.scope)
+        self.clause = None
+        self.yielded = set()
+
+    def yield_obj(self, s, loc, toks):
+        self.yielded.add(name(toks[-1]))
+
+    def _end_call(self, bound):
+        self.scope, self.projected, self.returned = self.outer.pop()
+        self.scope |= bound
+        self.clause = None
+
+    def procedure_call(self, s, loc, toks):
+        self._end_call(self.yielded)
+
+    def subquery(self, s, loc, toks):
+        self._end_call(self.returned)
+
+
+def check(element, query):
+    """
+    Parse ``query`` with ``element`` while checking variable scope. Returns the
+    parsed tokens and raises ``ScopeError`` on the first unbound reference.
+    """
+    with listening(ScopeCheck()):
+        return parse(query, element)
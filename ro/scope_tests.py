@@ -0,0 +1,77 @@
+import unittest
+from ro.grammar import query
+from ro.scope import ScopeError, check
+
+
+class ScopeTests(unittest.TestCase):
+
+    def assertBound(self, q):
+        check(query, q)
+
+    def assertUnbound(self, q):
+        self.assertRaises(ScopeError, check, query, q)
+
+    def test_match(self):
+        self.assertBound("MATCH (n)-[r:KNOWS]->(m) RETURN n, r, m")
+        self.assertBound("OPTIONAL MATCH (n:Person) RETURN n")
+        self.assertBound("MATCH p=(n)-->(m) RETURN p")
+        self.assertUnbound("MATCH (n) RETURN m")
+        self.assertUnbound("MATCH (n)-->() RETURN r")
+
+    def test_where(self):
+        self.assertBound("MATCH (n), (m) WHERE n.age > 30 AND m:Person "
+                         "RETURN n")
+        self.assertBound("MATCH (n), (m) WHERE (n)-->(m) RETURN n")
+        self.assertUnbound("MATCH (n) WHERE m.age > 30 RETURN n")
+        self.assertUnbound("MATCH (n) WHERE (n)-->(m) RETURN n")
+
+    def test_with(self):
+        self.assertBound("MATCH (n)-->(m) WITH n, count(m) AS c RETURN n, c")
+        self.assertBound("MATCH (n) WITH n MATCH (n)-->(m) RETURN m")
+        self.assertUnbound("MATCH (n)-->(m) WITH n RETURN m")
+        self.assertUnbound("MATCH (n) WITH m RETURN n")
+
+    def test_return(self):
+        self.assertBound("MATCH (n) RETURN n.name AS name ORDER BY name")
+        self.assertBound("MATCH (n)-[r]->() RETURN type(r), count(*), 5.5")
+        self.assertBound("MATCH (n) RETURN n LIMIT 10")
+        self.assertUnbound("MATCH (n) RETURN count(m)")
+        self.assertUnbound("MATCH (n) RETURN n ORDER BY m.name")
+        self.assertBound("MATCH (a) RETURN a AS b ORDER BY b, a")
+        self.assertUnbound("MATCH (a) RETURN a AS b, b AS c")
+        self.assertUnbound("MATCH (a) WITH a AS b, b AS c RETURN c")
+
+    def test_properties(self):
+        self.assertBound("MATCH (n), (m {name: n.name}) RETURN m")
+        self.assertUnbound("MATCH (m {name: n.name}) RETURN m")
+
+    def test_quoted(self):
+        self.assertBound("MATCH (`first name`) RETURN `first name`")
+        self.assertBound("MATCH (`n`) RETURN n.name AS `the name`")
+        self.assertUnbound("MATCH (`n m`) RETURN n")
+
+    def test_union(self):
+        self.assertBound("MATCH (n:A) RETURN n UNION MATCH (n:B) RETURN n")
+        self.assertUnbound("MATCH (n:A) RETURN n UNION MATCH (m:B) RETURN n")
+
+    def test_procedure(self):
+        self.assertBound("CALL db.labels() YIELD label RETURN label")
+        self.assertBound("CALL db.labels() YIELD label AS l RETURN l")
+        self.assertBound("MATCH (n) CALL db.labels() YIELD label "
+                         "RETURN n, label")
+        self.assertUnbound("CALL db.labels() YIELD label AS l RETURN label")
+
+    def test_subquery(self):
+        self.assertBound("MATCH (n), (k) CALL { MATCH (m) WITH m RETURN m } "
+                         "RETURN k, m")
+        self.assertBound("MATCH (n) CALL { WITH n MATCH (n)-->(m) "
+                         "RETURN m AS friend } RETURN n, friend")
+        self.assertUnbound("CALL { MATCH (m)-->(x) RETURN m } RETURN x")
+        self.assertUnbound("MATCH (n) CALL { WITH n MATCH (m) RETURN m } "
+                           "RETURN k")
+        self.assertBound("CALL { MATCH (m:A) RETURN m UNION MATCH (m:B) "
+                         "RETURN m } RETURN m")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,370 @@
+"""
+Batch pre-screening of stored query corpora.
+
+``screen`` looks at a whole batch of queries at once, as bytes, and picks
+out queries that the grammar is certain to reject. Only the rest go on to a
+full parse. A query is screened out when:
+
+* ``length``: it is longer than ``max_length`` bytes of UTF-8.
+
+* ``start``: its first word is not a clause a query may start with, such as
+``CREATE`` or ``CALL``. The word itself is reported as ``write`` if it is
+one of ``WRITE_KEYWORDS``.
+
+* ``quote``: a string or quoted identifier is never closed.
+
+* ``bracket``: its ``[]`` or ``{}`` brackets do not balance. Parentheses
+are not checked: the grammar lets a WHERE comparison open or close one on
+its own.
+
+* ``write``: one of ``WRITE_KEYWORDS`` follows a closing bracket, a string,
+a number or a name, where the grammar has no place for another name. After
+a keyword or other punctuation these words may be names, as in
+``MATCH (n:SET)``, and are left to the parse.
+
+The screen never rejects a query the grammar accepts, so ``validate_batch``
+returns the same verdicts as ``validate``, only faster. The error message
+of a screened query says why it was screened out, not what the parser
+would have expected. Every reason except ``length`` has an error offset.
+
+The quote, bracket and write checks need to know what is inside a quote.
+With a single kind of quote and no backslash, that is the parity of the
+quotes so far. Queries that mix quote kinds, use backslash escapes or
+contain NUL bytes only get the length and start checks.
+
+With NumPy installed, the batch is packed into one byte array and every
+check is a handful of array operations over it. Without NumPy the same
+checks run query by query with regular expressions.
+
+    python -m ro.screen --bench 20000
+"""
+import argparse
+import collections
+import re
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import automaton_tables, grammar
+from .fuzz import QueryGenerator
+from .validator import Verdict, validate
+
+
+MAX_LENGTH = 1 << 16
+
+LENGTH, START, WRITE, QUOTE, BRACKET = ("length", "start", "write", "quote",
+                                        "bracket")
+
+WRITE_KEYWORDS = ("CREATE", "MERGE", "DELETE", "DETACH", "SET", "REMOVE",
+                  "DROP", "FOREACH", "LOAD")
+
+# Leading words of the clauses a query may start with.
+READ_KEYWORDS = tuple(sorted(word for word, kind
+                             in grammar.CLAUSE_KINDS.items()
+                             if kind in grammar.TRANSITIONS["start"]))
+
+# Words of the grammar's keywords, which may stand for names as well.
+KEYWORD_WORDS = frozenset(word for text in automaton_tables.KEYWORDS
+                          for word in text.split())
+
+Screened = collections.namedtuple("Screened", "reason offset")
+
+_NOTHING = frozenset()
+
+_SPACE = re.compile(rb"[ \t\r\n]*")
+_WORD = re.compile(rb"[A-Za-z0-9_\x80-\xff]+")
+_TOKEN = re.compile(rb"[A-Za-z0-9_\x80-\xff]+|[^ \t\r\n]")
+# What ends a string, a quoted name or a bracket, \1 standing for the end
+# of a masked out quote.
+_CLOSING = frozenset(b")]}'\"`\1")
+_BRACKETS = re.compile(rb"[\[\]{}]")
+_QUOTES = (b"'", b'"', b"`")
+
+
+def screen(queries, max_length=MAX_LENGTH):
+    """
+    ``Screened(reason, offset)`` for every query of ``queries`` the grammar
+    is certain to reject, None for the others. ``offset`` is a character
+    offset into the query, None for ``length``.
+    """
+    queries = list(queries)
+    encoded = [q.encode("utf-8") for q in queries]
+    if numpy is not None:
+        found = _screen_arrays(encoded, max_length)
+    else:
+        found = [_screen_bytes(data, max_length) for data in encoded]
+    results = []
+    for q, data, screened in zip(queries, encoded, found):
+        if screened is not None and screened.offset is not None and \
+                len(data) != len(q):
+            offset = len(data[:screened.offset].decode("utf-8", "ignore"))
+            screened = Screened(screened.reason, offset)
+        results.append(screened)
+    return results
+
+
+def message(q, screened):
+    """The error message for a query that was screened out."""
+    if screened.reason == LENGTH:
+        return "query is longer than the screen allows"
+    offset = screened.offset
+    if screened.reason in (START, WRITE):
+        found = _WORD.match(q[offset:].encode("utf-8"))
+        word = found.group().decode("utf-8") if found else q[offset:offset + 1]
+        what = "write clause" if screened.reason == WRITE else \
+            "not a read clause"
+        return "%s %r (at char %d)" % (what, word, offset)
+    what = "unterminated quote" if screened.reason == QUOTE else \
+        "unbalanced brackets"
+    return "%s (at char %d)" % (what, offset)
+
+
+def validate_batch(queries, policy=None, max_length=MAX_LENGTH):
+    """``validate`` every query of ``queries``, parsing only the ones the
+    screen lets through."""
+    queries = list(queries)
+    verdicts = []
+    for q, screened in zip(queries, screen(queries, max_length)):
+        if screened is None:
+            verdicts.append(validate(q, policy))
+        else:
+            verdicts.append(Verdict(False, message(q, screened), _NOTHING,
+                                    _NOTHING, _NOTHING, _NOTHING))
+    return verdicts
+
+
+def _first(candidates):
+    # The earliest (offset, reason), reasons in order of precedence on ties.
+    candidates = [c for c in candidates if c[0] is not None]
+    if not candidates:
+        return None
+    offset, reason = min(candidates, key=lambda c: c[0])
+    return Screened(reason, offset)
+
+
+def _screen_bytes(data, max_length):
+    # One query, UTF-8 encoded. Offsets are byte offsets.
+    if len(data) > max_length:
+        return Screened(LENGTH, None)
+    if b"\0" in data:
+        return None
+    start = _SPACE.match(data).end()
+    found = _WORD.match(data, start)
+    word = found.group().upper().decode("latin-1") if found else ""
+    first = None
+    if word in WRITE_KEYWORDS:
+        first = (start, WRITE)
+    elif word not in READ_KEYWORDS:
+        first = (start, START)
+    kinds = [quote for quote in _QUOTES if quote in data]
+    if len(kinds) > 1 or b"\\" in data:
+        return _first([first or (None, None)])
+    masked = data
+    if kinds:
+        quote = kinds[0]
+        if data.count(quote) % 2:
+            return _first([first or (None, None),
+                           (data.rindex(quote), QUOTE)])
+        masked = re.sub(re.escape(quote) + b"[^" + quote + b"]*" +
+                        re.escape(quote), lambda m: b"\1" * len(m.group()),
+                        data)
+    depth = {b"[": 0, b"{": 0}
+    unbalanced = None
+    for found in _BRACKETS.finditer(masked):
+        char = found.group()
+        if char in depth:
+            depth[char] += 1
+            continue
+        opening = b"[" if char == b"]" else b"{"
+        depth[opening] -= 1
+        if depth[opening] < 0:
+            unbalanced = found.start()
+            break
+    if unbalanced is None and any(depth.values()):
+        unbalanced = len(data)
+    write = None
+    previous = None
+    for found in _TOKEN.finditer(masked):
+        text = found.group()
+        if previous is not None and \
+                text.upper().decode("latin-1") in WRITE_KEYWORDS and \
+                (previous[0] in _CLOSING or _WORD.match(previous) and
+                 previous.upper().decode("latin-1") not in KEYWORD_WORDS):
+            write = found.start()
+            break
+        previous = text
+    return _first([first or (None, None), (unbalanced, BRACKET),
+                   (write, WRITE)])
+
+
+def _screen_arrays(encoded, max_length):
+    # The whole batch with NumPy. Queries are packed back to back, each
+    # followed by a NUL, then padding so that keyword comparisons never
+    # read past the end. Offsets are byte offsets.
+    np = numpy
+    results = [None] * len(encoded)
+    kept = []
+    for i, data in enumerate(encoded):
+        if len(data) > max_length:
+            results[i] = Screened(LENGTH, None)
+        else:
+            kept.append(i)
+    if not kept:
+        return results
+    width = max(len(word) for word in
+                KEYWORD_WORDS.union(WRITE_KEYWORDS, READ_KEYWORDS)) + 1
+    packed = [encoded[i] for i in kept]
+    n = len(packed)
+    lengths = np.fromiter(map(len, packed), dtype=np.int64, count=n)
+    starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+    ends = starts + lengths
+    size = int(ends[-1]) + 1
+    full = np.frombuffer(b"\0".join(packed) + b"\0" * width, dtype=np.uint8)
+    body = full[:size]
+    ids = np.repeat(np.arange(n), lengths + 1)
+
+    def count(mask):
+        return np.bincount(ids[mask], minlength=n)
+
+    lower = (full >= 97) & (full <= 122)
+    upper = np.where(lower, full - 32, full).astype(np.uint8)
+    word = lower | ((full >= 65) & (full <= 90)) | \
+        ((full >= 48) & (full <= 57)) | (full == 95) | (full >= 128)
+    space = (body == 32) | (body == 9) | (body == 10) | (body == 13)
+
+    def keyword_at(positions, words):
+        # Whether one of words starts at each of positions, as a word.
+        matched = np.zeros(len(positions), dtype=bool)
+        for text in words:
+            pattern = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+            window = upper[positions[:, None] + np.arange(len(pattern))]
+            matched |= (window == pattern).all(axis=1) & \
+                ~word[positions + len(pattern)]
+        return matched
+
+    clean = count(body == 0) == 1
+    none = np.iinfo(np.int64).max
+    # The first word. previous[p] is the last non-space byte before p, a
+    # NUL separator (or -1) when p starts its query.
+    index = np.arange(size)
+    previous = np.maximum.accumulate(np.where(space, -1, index))
+    previous = np.concatenate(([-1], previous[:-1]))
+    at_start = (previous < 0) | (body[np.maximum(previous, 0)] == 0)
+    firsts = np.flatnonzero(at_start & ~space & (body != 0))
+    first_offset = np.full(n, none)
+    first_reason = np.zeros(n, dtype=np.int8)
+    owners = ids[firsts]
+    writes = keyword_at(firsts, WRITE_KEYWORDS)
+    reads = keyword_at(firsts, READ_KEYWORDS)
+    first_offset[owners] = np.where(reads, none, firsts - starts[owners])
+    first_reason[owners] = np.where(writes, 1, 0)
+    blank = np.ones(n, dtype=bool)
+    blank[owners] = False
+    first_offset[blank] = lengths[blank]
+
+    # Quotes. With one kind of quote and no backslash, a byte is inside a
+    # quote if an odd number of quotes come before it in its query.
+    single, double, back = body == 39, body == 34, body == 96
+    simple = clean & ((count(single) > 0).astype(int) +
+                      (count(double) > 0) + (count(back) > 0) <= 1) & \
+        (count(body == 92) == 0)
+    quote = single | double | back
+    seen = np.cumsum(quote)
+    before = seen[starts] - quote[starts]
+    inside = ((seen - before[ids]) & 1).astype(bool)
+    outside = ~inside & ~quote
+    unterminated = simple & (count(quote) % 2 == 1)
+    positions = np.flatnonzero(quote)
+    last_quote = np.full(n, -1)
+    np.maximum.at(last_quote, ids[positions], positions)
+    quote_offset = np.where(unterminated, last_quote - starts, none)
+
+    # Brackets outside quotes, [] and {} counted apart.
+    bracket_offset = np.full(n, none)
+    unclosed = np.zeros(n, dtype=bool)
+    for opening, closing in ((91, 93), (123, 125)):
+        delta = np.where(outside, (body == opening).astype(np.int64) -
+                         (body == closing), 0)
+        depth = np.cumsum(delta)
+        depth -= (depth[starts] - delta[starts])[ids]
+        unclosed |= depth[ends] != 0
+        negative = np.flatnonzero(depth < 0)
+        np.minimum.at(bracket_offset, ids[negative],
+                      negative - starts[ids[negative]])
+    bracket_offset = np.where(bracket_offset == none,
+                              np.where(unclosed, lengths, none),
+                              bracket_offset)
+    bracket_offset[~simple | unterminated] = none
+
+    # Write keywords outside quotes right after a closing bracket, a quote
+    # or a word that is not a keyword. A word is a name or a number there.
+    starts_word = word[:size] & ~np.concatenate(([False], word[:size - 1]))
+    closing = (body == 41) | (body == 93) | (body == 125) | quote
+    candidates = np.flatnonzero(starts_word & outside & ~at_start)
+    candidates = candidates[keyword_at(candidates, WRITE_KEYWORDS)]
+    behind = previous[candidates]
+    run = np.maximum.accumulate(np.where(starts_word, index, 0))[behind]
+    candidates = candidates[closing[behind] | word[behind] &
+                            ~keyword_at(run, KEYWORD_WORDS)]
+    write_offset = np.full(n, none)
+    np.minimum.at(write_offset, ids[candidates],
+                  candidates - starts[ids[candidates]])
+    write_offset[~simple | unterminated] = none
+
+    first_offset[~clean] = none
+    reasons = (START, WRITE, QUOTE, BRACKET, WRITE)
+    offsets = np.stack([np.where(first_reason == 0, first_offset, none),
+                        np.where(first_reason == 1, first_offset, none),
+                        quote_offset, bracket_offset, write_offset])
+    best = offsets.argmin(axis=0)
+    lowest = offsets.min(axis=0)
+    for j in np.flatnonzero(lowest != none):
+        results[kept[j]] = Screened(reasons[best[j]], int(lowest[j]))
+    return results
+
+
+def benchmark(count=10000, invalid=0.3, seed=0):
+    """
+    Seconds to validate ``count`` generated queries, an ``invalid`` fraction
+    of them write queries, one by one with ``validate`` and as a batch with
+    ``validate_batch``, and how many the screen answered.
+    """
+    corpus = list(QueryGenerator(seed).corpus(count, invalid))
+    queries = [q for q, expected in corpus]
+    start = time.perf_counter()
+    single = [validate(q) for q in queries]
+    parsed = time.perf_counter() - start
+    start = time.perf_counter()
+    screened = screen(queries)
+    screening = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = validate_batch(queries)
+    batched = time.perf_counter() - start
+    if [v.accepted for v in single] != [v.accepted for v in batch]:
+        raise AssertionError("the screen changed a verdict")
+    return {"queries": count, "screened": sum(s is not None
+                                              for s in screened),
+            "numpy": numpy is not None, "parse_s": parsed,
+            "screen_s": screening, "batch_s": batched,
+            "speedup": parsed / batched if batched else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ro.screen",
+        description="Benchmark the batch pre-screen.")
+    parser.add_argument("--bench", type=int, default=10000,
+                        metavar="QUERIES")
+    parser.add_argument("--invalid", type=float, default=0.3,
+        help="fraction of write queries")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = benchmark(args.bench, args.invalid, args.seed)
+    for name in sorted(report):
+        print("%s\t%s" % (name, report[name]))
+
+
+if __name__ == "__main__":
+    main()
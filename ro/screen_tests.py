@@ -0,0 +1,83 @@
+import unittest
+from ro import grammar, screen
+from ro.fuzz import QueryGenerator, parses
+from ro.screen import (BRACKET, LENGTH, QUOTE, START, WRITE, Screened,
+                       validate_batch)
+from ro.validator import validate
+
+
+def corpus(count, seed):
+    return [q for q, _ in QueryGenerator(seed).corpus(count, invalid=0.5)]
+
+
+def by_bytes(queries, max_length=screen.MAX_LENGTH):
+    # The pure Python path, whether or not NumPy is installed.
+    numpy, screen.numpy = screen.numpy, None
+    try:
+        return screen.screen(queries, max_length)
+    finally:
+        screen.numpy = numpy
+
+
+class ScreenTests(unittest.TestCase):
+
+    cases = [
+        ("MATCH (n:SET) RETURN n", None),
+        ("MATCH (n) WHERE n.name = 'DELETE' RETURN n", None),
+        ("MATCH (n) SET n.x = 1", Screened(WRITE, 10)),
+        ("MATCH (n) WHERE n.x = 1 DELETE n", Screened(WRITE, 24)),
+        ("MATCH (n) WHERE n.x = 'a' REMOVE n.x", Screened(WRITE, 26)),
+        ("CREATE (n)", Screened(WRITE, 0)),
+        ("  FOO (n)", Screened(START, 2)),
+        ("", Screened(START, 0)),
+        ("RETURN 'a", Screened(QUOTE, 7)),
+        ("MATCH (n {a: 1) RETURN n", Screened(BRACKET, 24)),
+        ("MATCH (n) RETURN [1]]", Screened(BRACKET, 20)),
+        ("MATCH (é) SET é.x = 1", Screened(WRITE, 10)),
+        ("MATCH (n) RETURN \"it's\" SET", None),
+        ("MATCH (n) RETURN \"a\\\"\" SET", None),
+    ]
+
+    def test_cases(self):
+        for q, expected in self.cases:
+            self.assertEqual(screen.screen([q]), [expected], q)
+            self.assertEqual(by_bytes([q]), [expected], q)
+
+    def test_length(self):
+        q = "MATCH (n) RETURN n"
+        self.assertEqual(screen.screen([q], max_length=10),
+                         [Screened(LENGTH, None)])
+        self.assertEqual(by_bytes([q], max_length=10),
+                         [Screened(LENGTH, None)])
+
+    @unittest.skipIf(screen.numpy is None, "NumPy is not installed")
+    def test_arrays(self):
+        queries = corpus(500, seed=5)
+        queries += [q[:len(q) // 2] for q in queries]
+        self.assertEqual(screen.screen(queries), by_bytes(queries))
+
+    def test_sound(self):
+        verdict = parses(grammar.query)
+        queries = corpus(300, seed=6)
+        queries += [q[:len(q) // 2] for q in queries]
+        for q, screened in zip(queries, screen.screen(queries)):
+            if screened is not None:
+                self.assertFalse(verdict(q), q)
+
+    def test_validate_batch(self):
+        queries = corpus(100, seed=7)
+        batch = validate_batch(queries)
+        for q, verdict in zip(queries, batch):
+            self.assertEqual(verdict.accepted, validate(q).accepted, q)
+        screened = validate_batch(["MATCH (n) DELETE n"])[0]
+        self.assertFalse(screened.accepted)
+        self.assertEqual(screened.error, "write clause 'DELETE' (at char 10)")
+
+    def test_benchmark(self):
+        report = screen.benchmark(20)
+        self.assertEqual(report["queries"], 20)
+        self.assertLessEqual(report["screened"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,462 @@
+"""
+HTTP validation sidecar for services that cannot import the parser.
+
+A small asyncio HTTP/1.1 server, on TCP or a Unix socket, with persistent
+connections and pipelining:
+
+* ``POST /validate`` with ``{"query": "..."}`` answers with the verdict as
+``validator.summary`` renders it.
+
+* ``POST /batch`` with ``{"queries": [...]}`` answers with ``{"results":
+[...]}`` in the same order. Anything but a list of strings is a 400.
+
+* ``GET /metrics`` answers with latency histograms per endpoint and a
+histogram of micro-batch sizes.
+
+* ``GET /health`` answers with ``{"ok": true}``.
+
+Requests are not validated one by one. Concurrent requests are coalesced for
+up to ``window`` seconds, or until ``max_batch`` queries are waiting, and
+then handed to the worker pool as a single batch, so one round trip to a
+worker process serves many connections. A query that fails to validate
+is rejected on its own, without failing the rest of its batch.
+
+A body over ``MAX_BODY`` bytes is answered with a 413, and any unexpected
+failure with a 500, before the connection is closed.
+
+    python -m ro.server --port 7475 -j 4
+    python -m ro.server --unix /run/ro.sock
+    python -m ro.server --port 7475 --load 10000     # load generator
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import time
+from http.client import responses
+
+from .fuzz import QueryGenerator
+from .policy import Policy
+from .validator import summary, validate
+
+
+class Histogram(object):
+    """Counts of values in power of two buckets, ``le`` being the bucket's
+    upper bound."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+
+    def record(self, value):
+        value = int(value)
+        le = 1
+        while le < value:
+            le <<= 1
+        self.buckets[le] = self.buckets.get(le, 0) + 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the ``p`` quantile."""
+        seen = 0
+        for le in sorted(self.buckets):
+            seen += self.buckets[le]
+            if seen >= p * self.count:
+                return le
+        return 0
+
+    def snapshot(self):
+        return {"count": self.count,
+                "mean": self.total / self.count if self.count else 0.0,
+                "p50": self.percentile(0.50), "p99": self.percentile(0.99),
+                "buckets": dict((str(le), n) for le, n in
+                                sorted(self.buckets.items()))}
+
+
+# Largest request body read_request accepts, in bytes.
+MAX_BODY = 1 << 22
+
+_policy = None
+
+
+def _init(policy):
+    global _policy
+    _policy = policy
+
+
+def validate_many(queries):
+    """
+    ``validator.summary`` of every query, run inside a worker. A query that
+    makes ``validate`` fail is rejected on its own, the rest of the batch
+    still gets its verdicts.
+    """
+    results = []
+    for q in queries:
+        try:
+            results.append(summary(validate(q, _policy)))
+        except Exception as e:
+            results.append({"accepted": False,
+                            "error": "cannot validate: %s" % e})
+    return results
+
+
+class MicroBatcher(object):
+    """Coalesces concurrent ``submit`` calls into batches for ``executor``."""
+
+    def __init__(self, executor, window=0.002, max_batch=256):
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.sizes = Histogram()
+        self._pending = []
+        self._queued = 0
+        self._timer = None
+
+    async def submit(self, queries):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((queries, future))
+        self._queued += len(queries)
+        if self._queued >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._queued = self._pending, [], 0
+        if pending:
+            asyncio.ensure_future(self._run(pending))
+
+    async def _run(self, pending):
+        queries = []
+        for batch, future in pending:
+            queries.extend(batch)
+        self.sizes.record(len(queries))
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor,
+                                                 validate_many, queries)
+        except Exception as e:
+            for batch, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for batch, future in pending:
+            if not future.done():
+                future.set_result(results[start:start + len(batch)])
+            start += len(batch)
+
+
+class Sidecar(object):
+    """
+    The server. ``processes`` worker processes validate the batches, or a
+    single worker thread when it is 1.
+    """
+
+    def __init__(self, policy=None, processes=1, window=0.002,
+                 max_batch=256):
+        if processes > 1:
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                processes, initializer=_init, initargs=(policy,))
+        else:
+            _init(policy)
+            self.executor = concurrent.futures.ThreadPoolExecutor(1)
+        self.batcher = MicroBatcher(self.executor, window, max_batch)
+        self.latency = {}
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=7475, path=None):
+        """Listen on ``host:port``, or on the Unix socket ``path``."""
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                start = time.perf_counter()
+                status, extra, data = await self.respond(method, target,
+                                                         headers, body)
+                endpoint = self.endpoint(target, status)
+                if endpoint is not None:
+                    histogram = self.latency.get(endpoint)
+                    if histogram is None:
+                        histogram = self.latency[endpoint] = Histogram()
+                    histogram.record((time.perf_counter() - start) * 1e6)
+                keep_alive = keep_alive and status != 400
+                write_response(writer, status, extra, data, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except RequestTooLarge:
+            write_response(writer, 413, JSON, _encode(
+                {"error": "request body too large"}), False)
+        except (ValueError, asyncio.IncompleteReadError):
+            write_response(writer, 400, JSON, _encode(
+                {"error": "malformed request"}), False)
+        except ConnectionError:
+            pass
+        except Exception as e:
+            write_response(writer, 500, JSON, _encode(
+                {"error": "internal error: %s" % e}), False)
+        finally:
+            writer.close()
+
+    def endpoint(self, target, status):
+        """Name the latency of a request is recorded under, or None."""
+        return None if status == 404 else target
+
+    async def respond(self, method, target, headers, body):
+        """Return ``(status, headers, data)`` for a request."""
+        status, payload = await self.route(method, target, body)
+        return status, JSON, _encode(payload)
+
+    async def route(self, method, target, body):
+        if target in ("/validate", "/batch"):
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                document = json.loads(body.decode("utf-8"))
+                if target == "/validate":
+                    queries = [document["query"]]
+                else:
+                    queries = document["queries"]
+                if not isinstance(queries, list) or \
+                        not all(isinstance(q, str) for q in queries):
+                    raise TypeError("queries must be a list of strings")
+            except (ValueError, KeyError, TypeError) as e:
+                return 400, {"error": "bad request body: %s" % e}
+            results = await self.batcher.submit(queries)
+            if target == "/validate":
+                return 200, results[0]
+            return 200, {"results": results}
+        if target == "/metrics" and method == "GET":
+            return 200, {"latency_us": dict(
+                             (name, histogram.snapshot())
+                             for name, histogram in self.latency.items()),
+                         "batch_size": self.batcher.sizes.snapshot()}
+        if target == "/health" and method == "GET":
+            return 200, {"ok": True}
+        return 404, {"error": "no such endpoint"}
+
+
+class RequestTooLarge(ValueError):
+    """A request body longer than ``read_request`` accepts."""
+
+
+async def read_request(reader, max_body=MAX_BODY):
+    """
+    Read one request and return ``(method, target, headers, body,
+    keep_alive)``, or None at the end of the connection. Raises
+    ``RequestTooLarge`` for a body over ``max_body`` bytes.
+    """
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, version = line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length < 0:
+        raise ValueError("negative content length")
+    if length > max_body:
+        raise RequestTooLarge("body of %d bytes" % length)
+    body = await reader.readexactly(length) if length else b""
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        keep_alive = connection == "keep-alive"
+    else:
+        keep_alive = connection != "close"
+    return method, target, headers, body, keep_alive
+
+
+JSON = [("Content-Type", "application/json")]
+
+
+def _encode(payload):
+    return json.dumps(payload, sort_keys=True).encode("utf-8")
+
+
+def write_response(writer, status, headers, data, keep_alive):
+    """Write a response with a body of ``data`` bytes, ``headers`` being
+    ``(name, value)`` pairs."""
+    head = ["HTTP/1.1 %d %s" % (status, responses.get(status, "Unknown"))]
+    head.extend("%s: %s" % header for header in headers)
+    head.append("Content-Length: %d" % len(data))
+    head.append("Connection: %s" % ("keep-alive" if keep_alive else "close"))
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+
+
+async def read_response(reader, method=None):
+    """
+    Read one response to a ``method`` request and return ``(status,
+    headers, data, keep_alive)``, ``headers`` mapping lower cased names to
+    values. Chunked bodies are joined. Responses to HEAD and 1xx, 204 and
+    304 responses have no body, whatever their headers say.
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("connection closed")
+    version, status = line.decode("latin-1").split()[:2]
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    keep_alive = headers.get("connection", "").lower() != "close"
+    if method == "HEAD" or status[0] == "1" or status in ("204", "304"):
+        data = b""
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if not size:
+                while (await reader.readline()).strip():
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        data = b"".join(chunks)
+    elif "content-length" in headers:
+        data = await reader.readexactly(int(headers["content-length"]))
+    else:
+        data = await reader.read()
+        keep_alive = False
+    return int(status), headers, data, keep_alive
+
+
+async def request(reader, writer, method, target, document=None):
+    """Send one request on a persistent connection, return ``(status,
+    document)``, the document None if the response has no body."""
+    data = b"" if document is None else json.dumps(document).encode("utf-8")
+    writer.write(("%s %s HTTP/1.1\r\nHost: ro\r\nContent-Length: %d\r\n\r\n"
+                  % (method, target, len(data))).encode("latin-1") + data)
+    await writer.drain()
+    status, headers, data, keep_alive = await read_response(reader, method)
+    return status, json.loads(data.decode("utf-8")) if data else None
+
+
+async def load(connect, queries, connections=8, batch=0):
+    """
+    Send every query in ``queries`` over ``connections`` persistent
+    connections opened by the coroutine function ``connect``, one per
+    ``/validate`` request, or ``batch`` per ``/batch`` request. Returns
+    throughput and client side latency percentiles.
+    """
+    queries = list(queries)
+    size = batch or 1
+    requests = [queries[i:i + size] for i in range(0, len(queries), size)]
+    latencies = []
+    timer = time.perf_counter
+
+    async def client(mine):
+        reader, writer = await connect()
+        try:
+            for chunk in mine:
+                start = timer()
+                if batch:
+                    await request(reader, writer, "POST", "/batch",
+                                  {"queries": chunk})
+                else:
+                    await request(reader, writer, "POST", "/validate",
+                                  {"query": chunk[0]})
+                latencies.append(timer() - start)
+        finally:
+            writer.close()
+
+    start = timer()
+    await asyncio.gather(*[client(requests[i::connections])
+                           for i in range(connections)])
+    seconds = timer() - start
+    latencies.sort()
+    count = len(latencies)
+
+    def percentile(p):
+        return latencies[min(count - 1, int(count * p))] * 1e6
+
+    return {"queries": len(queries), "requests": count, "seconds": seconds,
+            "queries_per_second": len(queries) / seconds if seconds else 0.0,
+            "p50_us": percentile(0.50) if count else 0.0,
+            "p99_us": percentile(0.99) if count else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ro.server",
+        description="Serve the read only validator over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7475)
+    parser.add_argument("--unix", metavar="PATH",
+        help="listen on a Unix socket instead of TCP")
+    parser.add_argument("-j", "--processes", type=int, default=1)
+    parser.add_argument("--policy", metavar="FILE",
+        help="JSON read policy to enforce")
+    parser.add_argument("--window-ms", type=float, default=2.0,
+        help="how long to wait for a micro-batch to fill")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--load", type=int, metavar="QUERIES",
+        help="run the load generator against a running server instead")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=0,
+        help="queries per /batch request for the load generator")
+    args = parser.parse_args(argv)
+
+    if args.load:
+        async def connect():
+            if args.unix:
+                return await asyncio.open_unix_connection(args.unix)
+            return await asyncio.open_connection(args.host, args.port)
+        corpus = QueryGenerator().corpus(args.load, invalid=0.1)
+        stats = asyncio.run(load(connect, [q for q, _ in corpus],
+                                 args.connections, args.batch))
+        for name in sorted(stats):
+            print("%s\t%s" % (name, stats[name]))
+        return
+
+    policy = None
+    if args.policy:
+        with open(args.policy) as f:
+            policy = Policy.from_dict(json.load(f))
+
+    async def serve():
+        sidecar = Sidecar(policy, args.processes, args.window_ms / 1000.0,
+                          args.max_batch)
+        server = await sidecar.start(args.host, args.port, args.unix)
+        try:
+            await server.serve_forever()
+        finally:
+            await sidecar.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
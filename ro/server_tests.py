@@ -0,0 +1,164 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from ro.policy import Policy
+from ro.server import (MAX_BODY, Histogram, Sidecar, load, read_response,
+    request)
+
+
+class HistogramTests(unittest.TestCase):
+
+    def test_buckets(self):
+        histogram = Histogram()
+        for value in (1, 3, 4, 5, 1000):
+            histogram.record(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["buckets"],
+                         {"1": 1, "4": 2, "8": 1, "1024": 1})
+        self.assertEqual(snapshot["p50"], 4)
+        self.assertEqual(snapshot["p99"], 1024)
+
+
+class SidecarTests(unittest.TestCase):
+
+    def serve(self, test, factory=Sidecar, **options):
+        async def run():
+            sidecar = factory(**options)
+            server = await sidecar.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+
+            async def connect():
+                return await asyncio.open_connection("127.0.0.1", port)
+            try:
+                return await test(connect)
+            finally:
+                await sidecar.close()
+        return asyncio.run(run())
+
+    def test_keep_alive(self):
+        async def test(connect):
+            reader, writer = await connect()
+            first = await request(reader, writer, "POST", "/validate",
+                                  {"query": "MATCH (n:A) RETURN n"})
+            second = await request(reader, writer, "POST", "/validate",
+                                   {"query": "MATCH (n) DELETE n"})
+            missing = await request(reader, writer, "GET", "/nope")
+            metrics = await request(reader, writer, "GET", "/metrics")
+            writer.close()
+            return first, second, missing, metrics
+        first, second, missing, metrics = self.serve(test)
+        self.assertEqual(first, (200, {"accepted": True, "labels": ["A"],
+            "rel_types": [], "properties": [], "functions": []}))
+        self.assertEqual(second[0], 200)
+        self.assertFalse(second[1]["accepted"])
+        self.assertEqual(missing[0], 404)
+        self.assertEqual(metrics[1]["latency_us"]["/validate"]["count"], 2)
+
+    def test_batch(self):
+        async def test(connect):
+            reader, writer = await connect()
+            response = await request(reader, writer, "POST", "/batch",
+                {"queries": ["MATCH (n) RETURN n", "CREATE (n)"]})
+            writer.close()
+            bad = []
+            for queries in ([1], "MATCH (n) RETURN n", {"q": "x"}, None):
+                # A 400 closes the connection.
+                reader, writer = await connect()
+                bad.append(await request(reader, writer, "POST", "/batch",
+                                         {"queries": queries}))
+                writer.close()
+            return response, bad
+        response, bad = self.serve(test)
+        self.assertEqual([r["accepted"] for r in response[1]["results"]],
+                         [True, False])
+        self.assertEqual([status for status, _ in bad], [400] * 4)
+
+    def test_failing_query(self):
+        # validate() used to raise RecursionError on a chain this long,
+        # failing every request batched with it.
+        deep = "MATCH (n) WHERE %s RETURN n" % " AND ".join(["n.a = 1"] * 300)
+
+        async def test(connect):
+            async def one(q):
+                reader, writer = await connect()
+                try:
+                    return await request(reader, writer, "POST",
+                                         "/validate", {"query": q})
+                finally:
+                    writer.close()
+            return await asyncio.gather(one("MATCH (n) RETURN n"), one(deep),
+                                        one("MATCH (m) RETURN m"))
+        first, failing, last = self.serve(test, window=0.05)
+        self.assertEqual((first[0], first[1]["accepted"]), (200, True))
+        self.assertEqual((failing[0], failing[1]["accepted"]), (200, False))
+        self.assertEqual((last[0], last[1]["accepted"]), (200, True))
+
+    def test_internal_error(self):
+        class Broken(Sidecar):
+            async def route(self, method, target, body):
+                raise KeyError("route")
+
+        async def test(connect):
+            reader, writer = await connect()
+            response = await request(reader, writer, "GET", "/health")
+            writer.close()
+            return response
+        status, document = self.serve(test, factory=Broken)
+        self.assertEqual(status, 500)
+        self.assertIn("route", document["error"])
+
+    def test_body_limit(self):
+        async def test(connect):
+            reader, writer = await connect()
+            writer.write(b"POST /batch HTTP/1.1\r\nContent-Length: %d\r\n"
+                         b"\r\n" % (MAX_BODY + 1))
+            await writer.drain()
+            response = await read_response(reader)
+            writer.close()
+            return response
+        status, headers, data, keep_alive = self.serve(test)
+        self.assertEqual(status, 413)
+        self.assertFalse(keep_alive)
+
+    def test_micro_batching(self):
+        async def test(connect):
+            stats = await load(connect, ["MATCH (n) RETURN n"] * 40,
+                               connections=20)
+            reader, writer = await connect()
+            metrics = await request(reader, writer, "GET", "/metrics")
+            writer.close()
+            return stats, metrics[1]
+        stats, metrics = self.serve(test, window=0.05)
+        self.assertEqual(stats["requests"], 40)
+        self.assertEqual(metrics["latency_us"]["/validate"]["count"], 40)
+        self.assertLess(metrics["batch_size"]["count"], 40)
+
+    def test_policy_processes(self):
+        async def test(connect):
+            return await load(connect, ["MATCH (n:A) RETURN n"] * 20,
+                              connections=4, batch=5)
+        stats = self.serve(test, policy=Policy(labels=["A"]), processes=2)
+        self.assertEqual((stats["queries"], stats["requests"]), (20, 4))
+
+    def test_unix_socket(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "ro.sock")
+
+        async def run():
+            sidecar = Sidecar()
+            await sidecar.start(path=path)
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                response = await request(reader, writer, "GET", "/health")
+                writer.close()
+                return response
+            finally:
+                await sidecar.close()
+        self.assertEqual(asyncio.run(run()), (200, {"ok": True}))
+
+
+if __name__ == "__main__":
+    unittest.main()
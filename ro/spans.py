@@ -0,0 +1,103 @@
+"""
+Compact, zero-copy token buffers over a query.
+
+``scan`` splits a query into lexical tokens without slicing it. A token is a
+kind and a start offset kept in two ``array`` columns, one byte and four
+bytes per token; its end is the start of the next token, since every
+character of the query belongs to exactly one token. Text is only copied out
+when ``text`` is asked for it.
+
+The source may be a ``str`` or any bytes-like object such as a
+``memoryview`` over a read buffer. Bytes are treated as UTF-8, and any
+non-ASCII byte is taken to be an identifier character.
+
+    buf = scan(q)
+    for kind, start, end in buf:
+        if kind == IDENTIFIER:
+            ...
+    buf.text(3)
+
+The lexical rules are the grammar's, this is not a second parser: a buffer
+says little about whether the query is valid. Only an ``ERROR`` token is
+certain to be rejected, which ``validator`` uses to turn such queries away
+before parsing. A query that lexes cleanly is still parsed by pyparsing, and
+its tokens are still allocated; the buffer is a cheaper token source for
+callers that only need the lexical structure, such as the rewriters.
+"""
+import array
+import re
+
+from . import grammar
+
+
+SPACE, STRING, NUMBER, IDENTIFIER, SYMBOL, ERROR = range(6)
+KIND_NAMES = ("space", "string", "number", "identifier", "symbol", "error")
+
+SYMBOLS = r"<>|>=|<=|=~|->|<-|\.\.|[-<>=(){}\[\],.:*|+/%^]"
+
+# One group per kind, in kind order.
+TOKEN = r"(\s+)|(%s)|(%s)|(%s)|(%s)|(.)"
+
+_TEXT = re.compile(TOKEN % (grammar.STRING, grammar.NUMBER,
+                            grammar.IDENTIFIER, SYMBOLS), re.S)
+_BYTES = re.compile((TOKEN % (grammar.STRING, grammar.NUMBER,
+    r"[A-Za-z_\x80-\xff][\w\x80-\xff]*|" + grammar.QUOTED_IDENTIFIER,
+    SYMBOLS)).encode("latin-1"), re.S)
+
+
+class TokenBuffer(object):
+    """Tokens of ``source`` as ``(kind, start, end)`` spans."""
+
+    __slots__ = ("source", "kinds", "starts")
+
+    def __init__(self, source):
+        self.source = source
+        self.kinds = array.array("B")
+        self.starts = array.array("I")
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def end(self, i):
+        if i + 1 < len(self.starts):
+            return self.starts[i + 1]
+        return len(self.source)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.kinds)
+        return self.kinds[i], self.starts[i], self.end(i)
+
+    def __iter__(self):
+        kinds = self.kinds
+        starts = self.starts
+        for i in range(len(kinds) - 1):
+            yield kinds[i], starts[i], starts[i + 1]
+        if kinds:
+            yield kinds[-1], starts[-1], len(self.source)
+
+    def text(self, i):
+        """The text of token ``i``, copied out of the source."""
+        kind, start, end = self[i]
+        text = self.source[start:end]
+        if not isinstance(text, str):
+            text = bytes(text).decode("utf-8")
+        return text
+
+    def significant(self):
+        """``(kind, start, end)`` for every token that is not whitespace."""
+        for token in self:
+            if token[0] != SPACE:
+                yield token
+
+
+def scan(source):
+    """Return the ``TokenBuffer`` for ``source``."""
+    pattern = _TEXT if isinstance(source, str) else _BYTES
+    buf = TokenBuffer(source)
+    kinds = buf.kinds.append
+    starts = buf.starts.append
+    for found in pattern.finditer(source):
+        kinds(found.lastindex - 1)
+        starts(found.start())
+    return buf
@@ -0,0 +1,55 @@
+import unittest
+from ro.bench import footprint, large_query, memory
+from ro.grammar import parse
+from ro.spans import (IDENTIFIER, NUMBER, SPACE, STRING, SYMBOL, ERROR,
+                      scan)
+
+
+class TokenBufferTests(unittest.TestCase):
+
+    def test_lossless(self):
+        q = "MATCH (p:`a b` {x: -1.5e3})-[*1..3]->(é)\nWHERE p.n <> 'it''s' " \
+            "RETURN p"
+        buf = scan(q)
+        self.assertEqual("".join(buf.text(i) for i in range(len(buf))), q)
+        self.assertEqual(buf[-1], (IDENTIFIER, len(q) - 1, len(q)))
+
+    def test_kinds(self):
+        buf = scan("(n {k: 'v', x: -2})-->(é) ;")
+        self.assertEqual([(kind, buf.source[start:end])
+                          for kind, start, end in buf.significant()],
+                         [(SYMBOL, "("), (IDENTIFIER, "n"), (SYMBOL, "{"),
+                          (IDENTIFIER, "k"), (SYMBOL, ":"), (STRING, "'v'"),
+                          (SYMBOL, ","), (IDENTIFIER, "x"), (SYMBOL, ":"),
+                          (NUMBER, "-2"), (SYMBOL, "}"), (SYMBOL, ")"),
+                          (SYMBOL, "-"), (SYMBOL, "->"), (SYMBOL, "("),
+                          (IDENTIFIER, "é"), (SYMBOL, ")"), (ERROR, ";")])
+
+    def test_memoryview(self):
+        q = "MATCH (é {name: 'ü'}) RETURN é"
+        text = scan(q)
+        view = scan(memoryview(q.encode("utf-8")))
+        self.assertEqual(list(text.kinds), list(view.kinds))
+        self.assertEqual([text.text(i) for i in range(len(text))],
+                         [view.text(i) for i in range(len(view))])
+
+    def test_empty(self):
+        self.assertEqual(list(scan("")), [])
+
+    def test_footprint(self):
+        q = large_query(200)
+        buf = footprint(scan, q)
+        tokens = footprint(parse, q)
+        self.assertLess(buf[0] * 5, tokens[0])
+        self.assertLess(buf[1], 100)
+        self.assertGreater(tokens[1], 1000)
+
+    def test_validation_memory(self):
+        report = memory(large_query(100))
+        # Only a query the lexer rejects is spared the parse.
+        self.assertLess(report["validate;"][2] * 5, report["unlexed;"][2])
+        self.assertGreater(report["validate"][2] * 5, report["unlexed"][2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Persistent verdict index used to warm a validator after a restart.
+
+Verdicts are appended to a sqlite3 database together with the query
+fingerprint, the grammar version (see ``grammar_version``) and the policy
+digest they were computed under. Opening the store drops rows written by any
+other grammar version and loads the rows for the current policy into memory,
+reading the file through sqlite's memory mapped I/O. Rows written under an older policy carry a
+different digest and are never loaded again.
+"""
+import hashlib
+import os
+import sqlite3
+
+from . import procedures
+from .cache import query_key
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    fingerprint TEXT NOT NULL,
+    grammar TEXT NOT NULL,
+    policy TEXT NOT NULL,
+    accepted INTEGER NOT NULL,
+    PRIMARY KEY (fingerprint, grammar, policy)
+) WITHOUT ROWID
+"""
+
+
+# Sources a verdict depends on: the grammar, the lexer that rejects queries
+# before the parse, the hooks and listeners that run during it, and the
+# procedure catalogue.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+VERSIONED = [os.path.join(_HERE, source) for source in (
+    "grammar.py", "spans.py", "hooks.py", "validator.py", "policy.py",
+    "procedures.py")]
+VERSIONED.append(procedures.CATALOGUE_PATH)
+
+
+def grammar_version():
+    """Digest of the sources in ``VERSIONED``, so any edit to the grammar,
+    the lexer, the hooks or the procedure catalogue invalidates stored
+    verdicts."""
+    digest = hashlib.sha1()
+    for path in VERSIONED:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def fingerprint(query):
+    return "%016x" % query_key(query)
+
+
+class VerdictStore(object):
+    """Append-only verdict index at ``path`` for a single ``policy``."""
+
+    def __init__(self, path, policy=None, mmap_size=1 << 28, batch=256):
+        self.grammar = grammar_version()
+        self.policy = policy.digest if policy is not None else ""
+        self.batch = batch
+        self._pending = []
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA mmap_size = %d" % mmap_size)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(SCHEMA)
+        with self._db:
+            self._db.execute("DELETE FROM verdicts WHERE grammar != ?",
+                             (self.grammar,))
+        rows = self._db.execute(
+            "SELECT fingerprint, accepted FROM verdicts WHERE policy = ?",
+            (self.policy,))
+        self._verdicts = dict((fp, bool(accepted)) for fp, accepted in rows)
+
+    def __len__(self):
+        return len(self._verdicts)
+
+    def get(self, query):
+        """Return the stored verdict for ``query``, ``None`` if there is none."""
+        return self._verdicts.get(fingerprint(query))
+
+    def put(self, query, accepted):
+        fp = fingerprint(query)
+        if fp in self._verdicts:
+            return
+        self._verdicts[fp] = bool(accepted)
+        self._pending.append((fp, self.grammar, self.policy, int(accepted)))
+        if len(self._pending) >= self.batch:
+            self.flush()
+
+    def verdict(self, query, compute):
+        """Return the stored verdict, computing and appending it on a miss."""
+        accepted = self.get(query)
+        if accepted is None:
+            accepted = bool(compute(query))
+            self.put(query, accepted)
+        return accepted
+
+    def flush(self):
+        if self._pending:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO verdicts VALUES (?, ?, ?, ?)",
+                    self._pending)
+            self._pending = []
+
+    def close(self):
+        self.flush()
+        self._db.close()
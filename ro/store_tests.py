@@ -0,0 +1,87 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from ro.policy import Policy
+from ro import procedures, spans, store
+from ro.store import VerdictStore, grammar_version
+
+
+class VerdictStoreTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "verdicts.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_warm_restart(self):
+        store = VerdictStore(self.path)
+        store.put("MATCH (n)", True)
+        store.put("MATCH (n", False)
+        store.close()
+
+        store = VerdictStore(self.path)
+        self.assertEqual(len(store), 2)
+        self.assertTrue(store.get("MATCH (n)"))
+        self.assertFalse(store.get("MATCH (n"))
+        self.assertIsNone(store.get("MATCH (m)"))
+        store.close()
+
+    def test_verdict(self):
+        calls = []
+
+        def compute(query):
+            calls.append(query)
+            return True
+
+        store = VerdictStore(self.path)
+        self.assertTrue(store.verdict("MATCH (n)", compute))
+        self.assertTrue(store.verdict("MATCH (n)", compute))
+        self.assertEqual(calls, ["MATCH (n)"])
+        store.close()
+
+    def test_policy_change(self):
+        store = VerdictStore(self.path, Policy(max_limit=10))
+        store.put("MATCH (n)", False)
+        store.close()
+        store = VerdictStore(self.path, Policy())
+        self.assertIsNone(store.get("MATCH (n)"))
+        store.close()
+        store = VerdictStore(self.path, Policy(max_limit=10))
+        self.assertFalse(store.get("MATCH (n)"))
+        store.close()
+
+    def test_grammar_change(self):
+        store = VerdictStore(self.path)
+        store.put("MATCH (n)", True)
+        store.close()
+        db = sqlite3.connect(self.path)
+        with db:
+            db.execute("UPDATE verdicts SET grammar = 'old'")
+        db.close()
+        store = VerdictStore(self.path)
+        self.assertEqual(len(store), 0)
+        store.close()
+
+    def test_catalogue_version(self):
+        catalogue = os.path.join(self.tmp, "procedures.txt")
+        shutil.copy(procedures.CATALOGUE_PATH, catalogue)
+        versioned = store.VERSIONED[:]
+        store.VERSIONED[-1] = catalogue
+        try:
+            before = grammar_version()
+            with open(catalogue, "a") as f:
+                f.write("db.info\n")
+            self.assertNotEqual(grammar_version(), before)
+        finally:
+            store.VERSIONED[:] = versioned
+        self.assertIn(procedures.CATALOGUE_PATH, store.VERSIONED)
+        # validate() rejects some queries in the lexer alone.
+        self.assertIn(os.path.abspath(spans.__file__), store.VERSIONED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Validation that also reports what a query touches.
+
+``validate`` parses a query once and returns a ``Verdict`` carrying the
+node labels, relationship types, property keys and functions it uses, so
+routers and result caches do not need a second pass over the text:
+
+    verdict = validate("MATCH (p:Person)-[:KNOWS]->(f) RETURN f.name AS n")
+    verdict.labels      # frozenset(['Person'])
+    verdict.rel_types   # frozenset(['KNOWS'])
+    verdict.properties  # frozenset(['name'])
+
+A rejected query comes back with ``accepted`` false, the parse error message
+in ``error`` and empty sets. That includes queries too deeply nested for the
+parser, such as hundreds of chained ``AND``, hops or ``CALL {}``
+subqueries.
+
+A whole query is lexed into a ``spans`` buffer first. A character that
+starts no token, such as ``;`` or ``$``, is one the grammar never accepts,
+so such a query is rejected there without allocating any parse tokens. The
+buffer does not feed the parse: a query that lexes cleanly is parsed as
+before, and the lexing, a few percent of the parse, comes on top.
+"""
+import collections
+
+from pyparsing import ParseBaseException, ParseException
+
+from . import spans
+from .grammar import name, parse, query
+from .hooks import listening
+from .policy import PolicyCheck
+
+
+Verdict = collections.namedtuple("Verdict",
+    "accepted error labels rel_types properties functions")
+
+_NOTHING = frozenset()
+
+
+class TooDeep(ParseException):
+    """A query nesting deeper than the parser can recurse. There is no
+    offset to point at, so the message stands alone."""
+
+    def __str__(self):
+        return self.msg
+
+
+class Collector(object):
+    """Listener collecting the names a query touches."""
+
+    def __init__(self):
+        self.labels = set()
+        self.rel_types = set()
+        self.properties = set()
+        self.functions = set()
+
+    def label(self, s, loc, toks):
+        self.labels.add(name(toks[1]))
+
+    def edge_content(self, s, loc, toks):
+        self.rel_types.update(map(name, toks.get("rel_type", ())))
+
+    def keyval(self, s, loc, toks):
+        self.properties.add(name(toks[0]))
+
+    def gettr(self, s, loc, toks):
+        self.properties.add(name(toks[2]))
+
+    def fns(self, s, loc, toks):
+        self.functions.add(toks[0])
+
+    type_fn = fns
+
+
+def _lex(q):
+    # Rejects q at the first character no token starts with.
+    buf = spans.scan(q)
+    try:
+        i = buf.kinds.index(spans.ERROR)
+    except ValueError:
+        return
+    raise ParseException(q, buf.starts[i], "unexpected character")
+
+
+def collect(q, policy=None, element=query, extra=()):
+    """
+    Parse ``q`` with ``element``, enforcing ``policy`` if one is given, with
+    the ``extra`` listeners also active. Returns ``(tokens, collector)`` and
+    raises ``ParseException`` or ``PolicyViolation`` on rejection. A query
+    nesting deeper than the interpreter's recursion limit lets the parser
+    recurse is rejected as well.
+    """
+    if element is query:
+        _lex(q)
+    collector = Collector()
+    check = PolicyCheck(policy) if policy is not None else None
+    active = (collector,) + tuple(extra)
+    if check is not None:
+        active += (check,)
+    with listening(*active):
+        try:
+            tokens = parse(q, element)
+        except RecursionError:
+            raise TooDeep(q, 0, "query nests too deeply") from None
+    if check is not None:
+        check.finish(q)
+    return tokens, collector
+
+
+def validate(q, policy=None, element=query):
+    """
+    Parse ``q`` with ``element``, enforcing ``policy`` if one is given, and
+    return a ``Verdict``.
+    """
+    try:
+        _, collector = collect(q, policy, element)
+    except ParseBaseException as e:
+        return Verdict(False, str(e), _NOTHING, _NOTHING, _NOTHING, _NOTHING)
+    return Verdict(True, None, frozenset(collector.labels),
+                   frozenset(collector.rel_types),
+                   frozenset(collector.properties),
+                   frozenset(collector.functions))
+
+
+def summary(verdict):
+    """JSON ready dict for a ``Verdict``: the error if it was rejected, the
+    sorted names it touches if it was accepted."""
+    if not verdict.accepted:
+        return {"accepted": False, "error": verdict.error}
+    return {"accepted": True, "labels": sorted(verdict.labels),
+            "rel_types": sorted(verdict.rel_types),
+            "properties": sorted(verdict.properties),
+            "functions": sorted(verdict.functions)}
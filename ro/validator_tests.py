@@ -0,0 +1,111 @@
+import threading
+import unittest
+from ro import bench
+from ro.fuzz import QueryGenerator
+from ro.policy import Policy
+from ro.validator import validate
+
+
+class ValidatorTests(unittest.TestCase):
+
+    def test_collects(self):
+        verdict = validate("MATCH (p:Person:Admin {name: 'x'})"
+                           "-[r:KNOWS:LIKES]->(f) "
+                           "WHERE type(r) = 'KNOWS' AND f.age > 3 "
+                           "RETURN count(f.email) AS c")
+        self.assertTrue(verdict.accepted)
+        self.assertIsNone(verdict.error)
+        self.assertEqual(verdict.labels, frozenset(["Person", "Admin"]))
+        self.assertEqual(verdict.rel_types, frozenset(["KNOWS", "LIKES"]))
+        self.assertEqual(verdict.properties,
+                         frozenset(["name", "age", "email"]))
+        self.assertEqual(verdict.functions, frozenset(["type", "count"]))
+
+    def test_where_label(self):
+        verdict = validate("MATCH (p) WHERE p:Secret RETURN p")
+        self.assertEqual(verdict.labels, frozenset(["Secret"]))
+
+    def test_rejected(self):
+        verdict = validate("MATCH (p:Person) DELETE p")
+        self.assertFalse(verdict.accepted)
+        self.assertTrue(verdict.error)
+        self.assertEqual(verdict.labels, frozenset())
+
+    def test_too_deep(self):
+        for q in ("MATCH (n) WHERE %s RETURN n" %
+                  " AND ".join(["n.a = 1"] * 300),
+                  "MATCH (n)%s RETURN n" % ("-->()" * 200),
+                  "%sMATCH (n) RETURN n%s RETURN 1" % ("CALL { " * 200,
+                                                       " }" * 200)):
+            verdict = validate(q)
+            self.assertFalse(verdict.accepted)
+            self.assertEqual(verdict.error, "query nests too deeply")
+        self.assertTrue(validate("MATCH (n) RETURN n").accepted)
+
+    def test_lexical(self):
+        verdict = validate("MATCH (p) WHERE p.age > $age RETURN p")
+        self.assertFalse(verdict.accepted)
+        self.assertIn("unexpected character", verdict.error)
+        self.assertIn("(at char 24)", verdict.error)
+        # Quoted, the same characters are part of a token.
+        self.assertTrue(validate("MATCH (p) WHERE p.n = '$;' RETURN p")
+                        .accepted)
+        # Nothing the grammar accepts lexes to an error token.
+        for q, expected in QueryGenerator(seed=5).corpus(300):
+            self.assertTrue(validate(q).accepted, q)
+
+    def test_subquery(self):
+        q = ("MATCH (a:Account) CALL { MATCH (p:Person)-[:OWNS]->(c) "
+             "RETURN count(c) AS n } RETURN a")
+        for _ in range(2):
+            # The second parse replays the memoized subquery.
+            verdict = validate(q)
+            self.assertTrue(verdict.accepted)
+            self.assertEqual(verdict.labels,
+                             frozenset(["Account", "Person"]))
+            self.assertEqual(verdict.rel_types, frozenset(["OWNS"]))
+            self.assertEqual(verdict.functions, frozenset(["count"]))
+        verdict = validate(q, Policy(labels=["Account"]))
+        self.assertFalse(verdict.accepted)
+        self.assertIn("Person", verdict.error)
+
+    def test_policy(self):
+        policy = Policy(labels=["Person"])
+        self.assertTrue(validate("MATCH (p:Person) RETURN p", policy).accepted)
+        verdict = validate("MATCH (p:Secret) RETURN p", policy)
+        self.assertFalse(verdict.accepted)
+        self.assertIn("Secret", verdict.error)
+
+    def test_threads(self):
+        queries = [q for q, _ in QueryGenerator(seed=4).corpus(60,
+                                                              invalid=0.3)]
+        queries.append("MATCH (n:Person) CALL { MATCH (m:Movie) RETURN m } "
+                       "RETURN n")
+        expected = [validate(q) for q in queries]
+        barrier = threading.Barrier(4)
+        results = []
+
+        def work(i):
+            barrier.wait()
+            # Each thread walks the corpus from another place.
+            order = queries[i:] + queries[:i]
+            results.append(([validate(q) for q in order],
+                             expected[i:] + expected[:i]))
+
+        workers = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(len(results), 4)
+        for verdicts, wanted in results:
+            self.assertEqual(verdicts, wanted)
+
+    def test_stress(self):
+        report = bench.stress(2, count=20)
+        self.assertEqual(sorted(report), [1, 2])
+        self.assertEqual(report[1][1], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()